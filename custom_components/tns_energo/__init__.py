@@ -2,16 +2,31 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
+from datetime import date
+from functools import partial
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID, CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
-from .const import DOMAIN, PLATFORMS
+from .analytics import ConsumptionStats
+from .bills import BillCache, async_fetch_bill, async_get_bill_cache, bill_month
+from .const import ATTR_ANOMALIES, BILL_RETENTION_INTERVAL, DOMAIN, PLATFORMS
 from .coordinator import TNSECoordinator
+from .helpers import async_invalidate_device_targets
+from .models import TNSEAccountData
+from .payments import async_remove_payment_ledger
+from .readings_queue import async_remove_readings_queue
+from .readings_store import async_remove_readings_store
 from .services import async_setup_services
+from .statistics import ReadingsStatistics
+from .views import async_get_signed_bill_url, async_register_views
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,51 +68,322 @@ async def async_setup_entry(hass: HomeAssistant, entry: TNSEConfigEntry) -> bool
 
     coordinator = TNSECoordinator(hass, config_entry=entry)
 
+    await coordinator.readings_queue.async_load()
+    await coordinator.payment_ledger.async_load()
+    entry.async_on_unload(coordinator.payment_ledger.async_flush)
+    await coordinator.readings_store.async_load()
+    bill_cache = await async_get_bill_cache(hass)
     await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = coordinator
 
-    _async_remove_stale_devices(hass, entry, coordinator)
+    _async_setup_device_reconciler(hass, entry, coordinator)
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            partial(async_invalidate_device_targets, hass)
+        )
+    )
+    entry.async_on_unload(partial(async_invalidate_device_targets, hass))
+    _async_register_devices(hass, entry, coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     await async_setup_services(hass)
+    async_register_views(hass)
+    _async_setup_bill_prefetch(hass, entry, coordinator, bill_cache)
+    _async_setup_statistics_import(hass, entry, coordinator)
+    _async_setup_anomaly_events(hass, entry, coordinator)
+
+    entry.async_on_unload(coordinator.readings_queue.async_start())
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            coordinator.async_apply_bill_retention,
+            BILL_RETENTION_INTERVAL,
+            name=f"{DOMAIN} bill retention",
+        )
+    )
+    entry.async_create_background_task(
+        hass, coordinator.async_apply_bill_retention(), f"{DOMAIN} bill retention"
+    )
 
     _LOGGER.debug("Config entry %s setup complete", entry.entry_id)
     return True
 
 
-def _async_remove_stale_devices(
+def _async_register_devices(
     hass: HomeAssistant,
     entry: TNSEConfigEntry,
     coordinator: TNSECoordinator,
 ) -> None:
-    """Remove device entries for accounts/counters that no longer exist."""
+    """Register all account and counter devices before entities are added.
+
+    Accounts are registered before their counters so via_device resolves;
+    entities then reference the already registered devices unchanged.
+    """
     device_registry = dr.async_get(hass)
+    for device_info in coordinator.device_infos.values():
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, **device_info
+        )
+
+
+def _async_setup_device_reconciler(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    coordinator: TNSECoordinator,
+) -> None:
+    """Remove stale devices now and after every refresh.
+
+    The full pass over the registry runs once at setup; after that only the
+    identifiers that disappeared since the previous refresh are resolved.
+    """
+    known_identifiers = set(coordinator.device_infos)
+    _async_remove_stale_devices(hass, entry, known_identifiers)
+
+    @callback
+    def _async_reconcile_devices() -> None:
+        nonlocal known_identifiers
+        if not coordinator.last_update_success:
+            return
+        current_identifiers = coordinator.device_infos.keys()
+        if current_identifiers == known_identifiers:
+            return
+        _async_remove_devices(
+            hass, entry, known_identifiers - current_identifiers
+        )
+        known_identifiers = set(current_identifiers)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_reconcile_devices))
+
 
-    current_identifiers: set[str] = set()
-    if coordinator.data:
-        for account in coordinator.data:
-            current_identifiers.add(account.number)
-            for counter in account.counters:
-                current_identifiers.add(counter["counterId"])
+def _async_remove_stale_devices(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    current_identifiers: set[str],
+) -> None:
+    """Remove device entries for accounts/counters that no longer exist."""
+    device_registry = dr.async_get(hass)
 
     for device_entry in dr.async_entries_for_config_entry(
         device_registry, entry.entry_id
     ):
-        if not any(
-            ident[0] == DOMAIN and ident[1] in current_identifiers
-            for ident in device_entry.identifiers
+        if {
+            identifier
+            for domain, identifier in device_entry.identifiers
+            if domain == DOMAIN
+        }.isdisjoint(current_identifiers):
+            _async_remove_device(device_registry, entry, device_entry)
+
+
+def _async_remove_devices(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    identifiers: set[str],
+) -> None:
+    """Remove the devices of identifiers that disappeared from the data."""
+    device_registry = dr.async_get(hass)
+
+    for identifier in identifiers:
+        device_entry = device_registry.async_get_device(
+            identifiers={(DOMAIN, identifier)}
+        )
+        if device_entry is not None and entry.entry_id in (
+            device_entry.config_entries
         ):
-            _LOGGER.info(
-                "Removing stale device %s (%s)",
-                device_entry.name,
-                device_entry.id,
+            _async_remove_device(device_registry, entry, device_entry)
+
+
+def _async_remove_device(
+    device_registry: dr.DeviceRegistry,
+    entry: TNSEConfigEntry,
+    device_entry: dr.DeviceEntry,
+) -> None:
+    """Detach a device from the entry, removing it if no entries are left."""
+    _LOGGER.info(
+        "Removing stale device %s (%s)",
+        device_entry.name,
+        device_entry.id,
+    )
+    device_registry.async_update_device(
+        device_entry.id, remove_config_entry_id=entry.entry_id
+    )
+
+
+def _async_setup_bill_prefetch(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    coordinator: TNSECoordinator,
+    bill_cache: BillCache,
+) -> None:
+    """Download the bill of a newly closed billing month in the background.
+
+    The first closed month seen for an account is only recorded, so the bill
+    is requested once, when the month advances, even across restarts. A new
+    month is recorded only after its bill was fetched, so a failed download
+    is retried on the next refresh.
+    """
+    pending: set[str] = set()
+
+    async def _async_prefetch_bill(
+        account: TNSEAccountData, closed_month: date
+    ) -> None:
+        month = bill_month(closed_month)
+        previous = bill_cache.closed_months.get(account.number)
+        if previous is None or previous >= month:
+            await bill_cache.async_set_closed_month(account.number, month)
+            return
+
+        try:
+            bill, cached = await async_fetch_bill(
+                coordinator, bill_cache, account, closed_month
+            )
+        except (UpdateFailed, ConfigEntryAuthFailed) as exc:
+            _LOGGER.warning(
+                "Failed to get the bill of account %s: %s", account.number, exc
+            )
+            return
+        await bill_cache.async_set_closed_month(account.number, month)
+        if bill is None or cached:
+            return
+
+        device_entry = dr.async_get(hass).async_get_device(
+            identifiers={(DOMAIN, account.number)}
+        )
+        hass.bus.async_fire(
+            f"{DOMAIN}_new_bill",
+            {
+                ATTR_DEVICE_ID: device_entry.id if device_entry else None,
+                ATTR_DATE: closed_month,
+                "file_path": str(bill_cache.get_path(bill)),
+                "url": async_get_signed_bill_url(hass, bill),
+            },
+        )
+
+    async def _async_prefetch_pending(
+        account: TNSEAccountData, closed_month: date
+    ) -> None:
+        try:
+            await _async_prefetch_bill(account, closed_month)
+        finally:
+            pending.discard(account.number)
+
+    @callback
+    def _async_check_closed_months() -> None:
+        for account in coordinator.data or ():
+            if account.balance is None or account.balance.closed_month is None:
+                continue
+            closed_month = account.balance.closed_month
+            if account.number in pending or bill_cache.closed_months.get(
+                account.number
+            ) == bill_month(closed_month):
+                continue
+            pending.add(account.number)
+            entry.async_create_background_task(
+                hass,
+                _async_prefetch_pending(account, closed_month),
+                f"{DOMAIN} bill prefetch {account.number}",
             )
-            device_registry.async_remove_device(device_entry.id)
+
+    _async_check_closed_months()
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_closed_months))
+
+
+def _async_setup_statistics_import(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    coordinator: TNSECoordinator,
+) -> None:
+    """Import the readings history into long-term statistics.
+
+    The import runs in the background at setup and whenever the data
+    changes; it is skipped when the recorder is not loaded.
+    """
+    if "recorder" not in hass.config.components:
+        return
+    statistics = ReadingsStatistics(hass)
+
+    @callback
+    def _async_import_statistics() -> None:
+        if not coordinator.last_update_success:
+            return
+        entry.async_create_background_task(
+            hass,
+            statistics.async_import(list(coordinator.counters.values())),
+            f"{DOMAIN} statistics import",
+        )
+
+    _async_import_statistics()
+    entry.async_on_unload(coordinator.async_add_listener(_async_import_statistics))
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: TNSEConfigEntry) -> None:
+    """Remove the local storage of a removed entry."""
+    await async_remove_readings_queue(hass, entry.entry_id)
+    await async_remove_payment_ledger(hass, entry.entry_id)
+    await async_remove_readings_store(hass, entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: TNSEConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Unloading config entry %s", entry.entry_id)
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+def _async_setup_anomaly_events(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    coordinator: TNSECoordinator,
+) -> None:
+    """Fire one event listing the consumption anomalies of new readings.
+
+    Each anomaly is reported once per counter and latest reading month; the
+    anomalies present at setup are only recorded, so a restart fires nothing.
+    """
+
+    def _get_anomalies(
+        stats: Mapping[str, ConsumptionStats],
+    ) -> dict[tuple[str, date | None], ConsumptionStats]:
+        return {
+            (counter_id, counter_stats.latest_month): counter_stats
+            for counter_id, counter_stats in stats.items()
+            if counter_stats.is_anomaly
+        }
+
+    checked = coordinator.consumption_stats
+    reported = set(_get_anomalies(checked))
+
+    @callback
+    def _async_check_anomalies() -> None:
+        nonlocal checked
+        stats = coordinator.consumption_stats
+        if stats is checked:
+            return
+        checked = stats
+
+        device_registry = dr.async_get(hass)
+        anomalies: list[dict[str, Any]] = []
+        for key, counter_stats in _get_anomalies(stats).items():
+            if key in reported:
+                continue
+            reported.add(key)
+            counter_id, month = key
+            device_entry = device_registry.async_get_device(
+                identifiers={(DOMAIN, counter_id)}
+            )
+            anomalies.append(
+                {
+                    ATTR_DEVICE_ID: device_entry.id if device_entry else None,
+                    "counter_id": counter_id,
+                    ATTR_DATE: month,
+                    "consumption": counter_stats.latest_consumption,
+                    "median_consumption": counter_stats.median_consumption,
+                    "score": counter_stats.anomaly_score,
+                }
+            )
+        if anomalies:
+            hass.bus.async_fire(
+                f"{DOMAIN}_consumption_anomaly", {ATTR_ANOMALIES: anomalies}
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_anomalies))
@@ -0,0 +1,226 @@
+"""Consumption analytics over the TNS-Energo readings history."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .const import (
+    ANOMALY_HISTORY_MONTHS,
+    ANOMALY_MIN_DEVIATION,
+    ANOMALY_MIN_MONTHS,
+    ANOMALY_SCORE_THRESHOLD,
+)
+from .models import Counter
+from .readings_store import ReadingsSeries, ReadingsStore
+
+# Ordinal of the numpy datetime64 epoch
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass(frozen=True, slots=True)
+class ConsumptionStats:
+    """Monthly consumption statistics of a counter, all tariff zones summed.
+
+    The seasonal baseline is the average consumption of the month after the
+    latest reading in previous years, that is the expected consumption of
+    the current billing period. The anomaly score is the robust z-score of
+    the latest month against the median of the previous months.
+    """
+
+    latest_month: date | None = None
+    average_3_months: float | None = None
+    average_12_months: float | None = None
+    year_over_year: float | None = None
+    seasonal_baseline: float | None = None
+    latest_consumption: float | None = None
+    median_consumption: float | None = None
+    anomaly_score: float | None = None
+
+    @property
+    def is_anomaly(self) -> bool:
+        """Return True if the latest month is far from the usual consumption."""
+        return (
+            self.anomaly_score is not None
+            and abs(self.anomaly_score) >= ANOMALY_SCORE_THRESHOLD
+        )
+
+    @property
+    def projected_consumption(self) -> float | None:
+        """Return the expected consumption of the current billing period."""
+        if self.seasonal_baseline is not None:
+            return self.seasonal_baseline
+        return self.average_3_months
+
+
+def _to_month(days: np.ndarray) -> np.ndarray:
+    """Return months since 1970-01 of ordinal days."""
+    return (
+        (days - _EPOCH_ORDINAL)
+        .astype("datetime64[D]")
+        .astype("datetime64[M]")
+        .astype(np.int64)
+    )
+
+
+def _nanmean(values: np.ndarray) -> np.ndarray:
+    """Return the row means ignoring NaN, NaN for rows without values."""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1)
+    total = np.where(valid, values, 0.0).sum(axis=1)
+    return np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0)
+
+
+def _nanmedian(values: np.ndarray) -> np.ndarray:
+    """Return the row medians ignoring NaN, NaN for rows without values."""
+    if not values.shape[1]:
+        return np.full(len(values), np.nan)
+    count = (~np.isnan(values)).sum(axis=1)
+    # NaN is sorted last, so the values of a row come first
+    ordered = np.sort(values, axis=1)
+    lower = np.take_along_axis(ordered, np.maximum((count - 1) // 2, 0)[:, None], 1)
+    upper = np.take_along_axis(ordered, (count // 2)[:, None], 1)
+    return np.where(count > 0, (lower[:, 0] + upper[:, 0]) / 2, np.nan)
+
+
+def _anomaly_scores(monthly: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the median of the previous months and the latest month score.
+
+    The score is the deviation of the latest month from the median in units
+    of the scaled median absolute deviation; rows with too short a history
+    are not scored.
+    """
+    history = monthly[:, 1 : ANOMALY_HISTORY_MONTHS + 1]
+    count = (~np.isnan(history)).sum(axis=1)
+    median = _nanmedian(history)
+    deviation = np.abs(history - median[:, None])
+    # The deviation floor keeps a flat history from flagging tiny changes
+    scale = np.maximum(_nanmedian(deviation) * 1.4826, ANOMALY_MIN_DEVIATION)
+    score = np.full(len(monthly), np.nan)
+    np.divide(
+        monthly[:, 0] - median,
+        scale,
+        out=score,
+        where=count >= ANOMALY_MIN_MONTHS,
+    )
+    return median, score
+
+
+def _month_start(month: int) -> date:
+    """Return the first day of a month counted from 1970-01."""
+    return date(1970 + month // 12, month % 12 + 1, 1)
+
+
+def _optional(value: float, digits: int) -> float | None:
+    """Return a rounded value, or None if it is NaN."""
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def compute_consumption_stats(
+    series: Mapping[str, Sequence[ReadingsSeries]],
+) -> dict[str, ConsumptionStats]:
+    """Return consumption statistics of counters by counter ID.
+
+    The tariff zone series of all counters are combined into one matrix of
+    monthly consumption, a row per counter, with the latest month of each
+    counter in column 0 and older months to the right. All statistics are
+    then computed for every counter at once.
+    """
+    counter_ids = list(series)
+    rows: list[np.ndarray] = []
+    months: list[np.ndarray] = []
+    values: list[np.ndarray] = []
+    for row, counter_id in enumerate(counter_ids):
+        for zone in series[counter_id]:
+            if not len(zone):
+                continue
+            # Zero-copy views of the store columns
+            days = np.frombuffer(zone.days, dtype=np.intc).astype(np.int64)
+            rows.append(np.full(len(days), row))
+            months.append(_to_month(days))
+            values.append(np.frombuffer(zone.consumption, dtype=np.float64))
+    if not rows:
+        return {counter_id: ConsumptionStats() for counter_id in counter_ids}
+
+    row_index = np.concatenate(rows)
+    month = np.concatenate(months)
+    value = np.concatenate(values)
+
+    no_month = np.iinfo(np.int64).min
+    latest = np.full(len(counter_ids), no_month)
+    np.maximum.at(latest, row_index, month)
+    offset = latest[row_index] - month
+    valid = ~np.isnan(value)
+
+    shape = (len(counter_ids), int(offset.max()) + 1)
+    total = np.zeros(shape)
+    count = np.zeros(shape, dtype=np.int64)
+    np.add.at(total, (row_index[valid], offset[valid]), value[valid])
+    np.add.at(count, (row_index[valid], offset[valid]), 1)
+    monthly = np.where(count > 0, total, np.nan)
+
+    average_3 = _nanmean(monthly[:, :3])
+    average_12 = _nanmean(monthly[:, :12])
+    year_over_year = np.full(len(counter_ids), np.nan)
+    if shape[1] > 12:
+        previous = monthly[:, 12]
+        np.divide(
+            (monthly[:, 0] - previous) * 100,
+            previous,
+            out=year_over_year,
+            where=previous > 0,
+        )
+    # The month after the latest one, 1, 2, ... years earlier
+    baseline = _nanmean(monthly[:, 11::12])
+    median, score = _anomaly_scores(monthly)
+
+    return {
+        counter_id: ConsumptionStats(
+            latest_month=(
+                _month_start(int(latest[row])) if latest[row] != no_month else None
+            ),
+            average_3_months=_optional(average_3[row], 1),
+            average_12_months=_optional(average_12[row], 1),
+            year_over_year=_optional(year_over_year[row], 1),
+            seasonal_baseline=_optional(baseline[row], 1),
+            latest_consumption=_optional(monthly[row, 0], 1),
+            median_consumption=_optional(median[row], 1),
+            anomaly_score=_optional(score[row], 2),
+        )
+        for row, counter_id in enumerate(counter_ids)
+    }
+
+
+class ConsumptionAnalytics:
+    """Consumption statistics memoized until the readings store changes."""
+
+    def __init__(self, store: ReadingsStore) -> None:
+        """Initialize the analytics."""
+        self._store = store
+        self._key: tuple[int, tuple[tuple[str, int], ...]] | None = None
+        self._stats: dict[str, ConsumptionStats] = {}
+
+    def get_stats(self, counters: Iterable[Counter]) -> dict[str, ConsumptionStats]:
+        """Return the statistics of counters, computing them on new readings."""
+        zones = tuple(
+            (counter.counter_id, counter.tariff_count) for counter in counters
+        )
+        key = (self._store.version, zones)
+        if key != self._key:
+            self._stats = compute_consumption_stats(
+                {
+                    counter_id: self._get_series(counter_id, tariff_count)
+                    for counter_id, tariff_count in zones
+                }
+            )
+            self._key = key
+        return self._stats
+
+    def _get_series(self, counter_id: str, tariff_count: int) -> list[ReadingsSeries]:
+        """Return the stored series of the tariff zones of a counter."""
+        series = (
+            self._store.get_series(counter_id, index) for index in range(tariff_count)
+        )
+        return [zone for zone in series if zone is not None]
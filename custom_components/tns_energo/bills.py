@@ -0,0 +1,411 @@
+"""TNS-Energo invoice file storage."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    BILL_ACCESS_SAVE_DELAY,
+    BILL_DECODE_CHUNK_SIZE,
+    BILL_STORAGE_KEY,
+    BILL_STORAGE_VERSION,
+    DOMAIN,
+)
+from .helpers import get_closed_month
+
+if TYPE_CHECKING:
+    from .coordinator import TNSECoordinator
+    from .models import TNSEAccountData
+
+DATA_BILL_CACHE: HassKey[BillCache] = HassKey(f"{DOMAIN}_bill_cache")
+
+
+def save_base64_file(file_path: Path, file_data: str) -> tuple[int, str]:
+    """Decode base64 data to a file in chunks, return its size and SHA-256.
+
+    The file is written to a temporary file next to the target and renamed
+    over it, so readers never see a partially written bill. Whitespace is
+    removed from each chunk and characters past the last full 4-character
+    group are carried into the next one. Run in executor.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as file:
+            carry = ""
+            for start in range(0, len(file_data), BILL_DECODE_CHUNK_SIZE):
+                text = carry + "".join(
+                    file_data[start : start + BILL_DECODE_CHUNK_SIZE].split()
+                )
+                end = len(text) - len(text) % 4
+                carry = text[end:]
+                chunk = base64.b64decode(text[:end])
+                digest.update(chunk)
+                size += file.write(chunk)
+            if carry:
+                base64.b64decode(carry)  # raises on the incomplete group
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def bill_month(bill_date: date) -> str:
+    """Return the manifest month of a bill date."""
+    return bill_date.strftime("%Y-%m")
+
+
+@dataclass(frozen=True, slots=True)
+class BillRetention:
+    """Limits of the stored bills of a config entry, 0 means unlimited."""
+
+    max_bytes: int = 0
+    max_age: int = 0  # months
+    max_files: int = 0  # per account
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if any limit is set."""
+        return bool(self.max_bytes or self.max_age or self.max_files)
+
+    def get_oldest_month(self, today: date) -> date | None:
+        """Return the first day of the oldest month kept by the age limit."""
+        if not self.max_age:
+            return None
+        index = today.year * 12 + today.month - 1 - self.max_age
+        return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class BillEntry:
+    """A downloaded bill in the cache manifest."""
+
+    account_number: str
+    month: str
+    file: str
+    size: int
+    sha256: str
+    fetched: datetime
+    accessed: datetime
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {
+            "account_number": self.account_number,
+            "month": self.month,
+            "file": self.file,
+            "size": self.size,
+            "sha256": self.sha256,
+            "fetched": self.fetched.isoformat(),
+            "accessed": self.accessed.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BillEntry:
+        """Restore a manifest entry from storage."""
+        return cls(
+            account_number=data["account_number"],
+            month=data["month"],
+            file=data["file"],
+            size=data["size"],
+            sha256=data["sha256"],
+            fetched=datetime.fromisoformat(data["fetched"]),
+            accessed=datetime.fromisoformat(data.get("accessed", data["fetched"])),
+        )
+
+
+def evict_bills(
+    directory: Path,
+    entries: list[BillEntry],
+    retention: BillRetention,
+    today: date,
+    keep: BillEntry | None = None,
+) -> list[BillEntry]:
+    """Remove bills over the retention limits, return the removed entries.
+
+    Bills older than the age limit are removed first, then the least
+    recently used bills until the file count and size limits are met. The
+    ``keep`` bill, the one just requested, is never removed. Run in executor.
+    """
+    evicted: list[BillEntry] = []
+    if (oldest_month := retention.get_oldest_month(today)) is not None:
+        oldest = bill_month(oldest_month)
+        evicted = [
+            entry for entry in entries if entry.month < oldest and entry is not keep
+        ]
+        entries = [
+            entry for entry in entries if entry.month >= oldest or entry is keep
+        ]
+
+    entries.sort(key=lambda entry: entry.accessed)
+    if retention.max_files:
+        counts: dict[str, int] = {}
+        for entry in entries:
+            counts[entry.account_number] = counts.get(entry.account_number, 0) + 1
+        kept: list[BillEntry] = []
+        for entry in entries:
+            if entry is not keep and counts[entry.account_number] > retention.max_files:
+                counts[entry.account_number] -= 1
+                evicted.append(entry)
+            else:
+                kept.append(entry)
+        entries = kept
+
+    if retention.max_bytes:
+        total = sum(entry.size for entry in entries)
+        for entry in entries:
+            if total <= retention.max_bytes:
+                break
+            if entry is keep:
+                continue
+            total -= entry.size
+            evicted.append(entry)
+
+    for entry in evicted:
+        (directory / entry.file).unlink(missing_ok=True)
+    return evicted
+
+
+class BillCache:
+    """Downloaded bills with a manifest of their size, hash and fetch time.
+
+    Closed months the API returned no invoice for are remembered as missing,
+    so a resumed backfill does not request them again. The last closed
+    billing month of each account is kept to detect when a new one closes.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.directory = directory
+        self.entries: dict[tuple[str, str], BillEntry] = {}
+        self.missing: set[tuple[str, str]] = set()
+        self.closed_months: dict[str, str] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._store: Store[dict[str, Any]] = Store(
+            hass, BILL_STORAGE_VERSION, BILL_STORAGE_KEY
+        )
+        self._load_task: asyncio.Task[None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the manifest once, concurrent callers wait for the same load."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(
+                self._async_load(), eager_start=True
+            )
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Load the manifest from storage."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for entry in map(BillEntry.from_dict, data.get("bills", [])):
+            self.entries[entry.account_number, entry.month] = entry
+        self.missing.update(
+            (account_number, month)
+            for account_number, months in data.get("missing", {}).items()
+            for month in months
+        )
+        self.closed_months.update(data.get("closed_months", {}))
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the manifest to store."""
+        missing: dict[str, list[str]] = {}
+        for account_number, month in sorted(self.missing):
+            missing.setdefault(account_number, []).append(month)
+        return {
+            "bills": [entry.as_dict() for entry in self.entries.values()],
+            "missing": missing,
+            "closed_months": self.closed_months,
+        }
+
+    async def _async_save(self) -> None:
+        """Persist the manifest and notify listeners."""
+        await self._store.async_save(self._data_to_save())
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for manifest changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    def get_account_entries(self, account_number: str) -> list[BillEntry]:
+        """Return the cached bills of an account."""
+        return [
+            entry
+            for entry in self.entries.values()
+            if entry.account_number == account_number
+        ]
+
+    def get_path(self, entry: BillEntry) -> Path:
+        """Return the file path of a cached bill."""
+        return self.directory / entry.file
+
+    async def async_get(self, account_number: str, month: str) -> BillEntry | None:
+        """Return a cached bill if its file is still intact on disk.
+
+        The access time of a hit is saved with a delay and does not notify
+        listeners, since the cached bills did not change.
+        """
+        if (entry := self.entries.get((account_number, month))) is None:
+            return None
+
+        def _is_intact() -> bool:
+            path = self.get_path(entry)
+            return path.is_file() and path.stat().st_size == entry.size
+
+        if await self.hass.async_add_executor_job(_is_intact):
+            entry = self.entries[account_number, month] = replace(
+                entry, accessed=dt_util.utcnow()
+            )
+            self._store.async_delay_save(self._data_to_save, BILL_ACCESS_SAVE_DELAY)
+            return entry
+        del self.entries[account_number, month]
+        await self._async_save()
+        return None
+
+    def is_missing(self, account_number: str, month: str) -> bool:
+        """Return True if the API had no invoice for a closed month."""
+        return (account_number, month) in self.missing
+
+    async def async_mark_missing(self, account_number: str, month: str) -> None:
+        """Remember that the API has no invoice for a closed month."""
+        if (account_number, month) not in self.missing:
+            self.missing.add((account_number, month))
+            await self._async_save()
+
+    async def async_set_closed_month(
+        self, account_number: str, month: str
+    ) -> str | None:
+        """Record the last closed billing month, return the previous one."""
+        previous = self.closed_months.get(account_number)
+        if previous != month:
+            self.closed_months[account_number] = month
+            await self._async_save()
+        return previous
+
+    async def async_store(
+        self, account_number: str, month: str, file_data: str
+    ) -> BillEntry:
+        """Write a downloaded bill to disk and record it in the manifest."""
+        filename = f"{account_number}_{month}.pdf"
+        size, sha256 = await self.hass.async_add_executor_job(
+            save_base64_file, self.directory / filename, file_data
+        )
+        now = dt_util.utcnow()
+        entry = self.entries[account_number, month] = BillEntry(
+            account_number=account_number,
+            month=month,
+            file=filename,
+            size=size,
+            sha256=sha256,
+            fetched=now,
+            accessed=now,
+        )
+        self.missing.discard((account_number, month))
+        await self._async_save()
+        return entry
+
+    async def async_apply_retention(
+        self,
+        account_numbers: Iterable[str],
+        retention: BillRetention,
+        keep: BillEntry | None = None,
+    ) -> int:
+        """Evict bills of the accounts over the limits, return their number."""
+        if not retention.enabled:
+            return 0
+        account_numbers = set(account_numbers)
+        entries = [
+            entry
+            for entry in self.entries.values()
+            if entry.account_number in account_numbers
+        ]
+        evicted = await self.hass.async_add_executor_job(
+            evict_bills,
+            self.directory,
+            entries,
+            retention,
+            dt_util.now().date(),
+            keep,
+        )
+        removed = 0
+        for entry in evicted:
+            key = entry.account_number, entry.month
+            # An entry replaced meanwhile is kept, async_get notices its file
+            # is gone and the bill is downloaded again
+            if self.entries.get(key) is entry:
+                del self.entries[key]
+                removed += 1
+        if removed:
+            await self._async_save()
+        return removed
+
+
+def is_closed_month(account: TNSEAccountData, bill_date: date) -> bool:
+    """Return True if the bill month is closed and its invoice is final."""
+    closed_month = get_closed_month(account.balance)
+    return (bill_date.year, bill_date.month) <= (closed_month.year, closed_month.month)
+
+
+async def async_fetch_bill(
+    coordinator: TNSECoordinator,
+    cache: BillCache,
+    account: TNSEAccountData,
+    bill_date: date,
+    force: bool = False,
+) -> tuple[BillEntry | None, bool]:
+    """Return a bill and whether it came from the cache.
+
+    Invoices of closed months never change, so they are served from disk.
+    Return None if the API has no invoice for the month.
+    """
+    month = bill_month(bill_date)
+    if not force and is_closed_month(account, bill_date):
+        if (entry := await cache.async_get(account.number, month)) is not None:
+            return entry, True
+
+    date_str = bill_date.strftime("%d.%m.%Y")
+    result = await coordinator.async_get_invoice_file(account.number, date_str)
+
+    if (file_data := result.get("file")) is None:
+        return None, False
+    entry = await cache.async_store(account.number, month, file_data)
+    await coordinator.async_apply_bill_retention(keep=entry)
+    return entry, False
+
+
+async def async_get_bill_cache(hass: HomeAssistant) -> BillCache:
+    """Return the loaded bill cache shared by all config entries."""
+    if (cache := hass.data.get(DATA_BILL_CACHE)) is None:
+        cache = hass.data[DATA_BILL_CACHE] = BillCache(
+            hass, Path(hass.config.path(DOMAIN, "bills"))
+        )
+    await cache.async_load()
+    return cache
@@ -0,0 +1,97 @@
+"""TNS-Energo Binary Sensor definitions."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import TNSEConfigEntry
+from .analytics import ConsumptionStats
+from .entity import TNSECounterEntity, TNSERowEntity
+from .models import UNAVAILABLE_ROW, EntityRow, TNSEAccountData
+
+PARALLEL_UPDATES: Final = 1
+
+
+@dataclass(frozen=True, kw_only=True)
+class TNSECounterBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes TNS-Energo counter binary sensor entity."""
+
+    is_on_fn: Callable[[ConsumptionStats], bool]
+    attr_fn: Callable[[ConsumptionStats], dict[str, Any]] = lambda stats: {}
+    available_fn: Callable[[ConsumptionStats], bool] = lambda stats: True
+
+
+COUNTER_BINARY_SENSOR_TYPES: tuple[TNSECounterBinarySensorEntityDescription, ...] = (
+    TNSECounterBinarySensorEntityDescription(
+        key="consumption_anomaly",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=lambda stats: stats.is_anomaly,
+        available_fn=lambda stats: stats.anomaly_score is not None,
+        attr_fn=lambda stats: {
+            "Потребление за месяц": stats.latest_consumption,
+            "Медиана потребления": stats.median_consumption,
+            "Оценка отклонения": stats.anomaly_score,
+        },
+        translation_key="consumption_anomaly",
+    ),
+)
+
+
+class TNSECounterBinarySensor(TNSECounterEntity, TNSERowEntity, BinarySensorEntity):
+    """TNS-Energo Counter Binary Sensor computed from consumption statistics."""
+
+    entity_description: TNSECounterBinarySensorEntityDescription
+
+    def _render_row(self, accounts: Mapping[str, TNSEAccountData]) -> EntityRow:
+        """Render the binary sensor row from the counter statistics."""
+        account = accounts.get(self._account_number)
+        counter = account.get_counter(self._counter_id) if account else None
+        stats = (
+            self.coordinator.consumption_stats.get(counter.counter_id)
+            if counter is not None
+            else None
+        )
+        description = self.entity_description
+        if stats is None or not description.available_fn(stats):
+            return UNAVAILABLE_ROW
+        return EntityRow(
+            available=True,
+            value=description.is_on_fn(stats),
+            attributes=self._row_attributes(description.attr_fn(stats)),
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if the binary sensor is on."""
+        return self._row.value
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: TNSEConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up binary sensor entities."""
+    coordinator = entry.runtime_data
+
+    entities: list[BinarySensorEntity] = []
+
+    for account in coordinator.data:
+        for counter in account.counters:
+            for description in COUNTER_BINARY_SENSOR_TYPES:
+                entities.append(
+                    TNSECounterBinarySensor(
+                        coordinator, description, account.number, counter.counter_id
+                    )
+                )
+
+    async_add_entities(entities, True)
@@ -22,11 +22,25 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import (
     CONF_ACCESS_TOKEN,
     CONF_ACCESS_TOKEN_EXPIRES,
+    CONF_BILLS_MAX_AGE,
+    CONF_BILLS_MAX_FILES,
+    CONF_BILLS_MAX_SIZE,
+    CONF_LEAN_ATTRIBUTES,
+    CONF_QUEUE_DEADLINE,
     CONF_REFRESH_TOKEN,
     CONF_REFRESH_TOKEN_EXPIRES,
     CONF_REGION,
     CONF_SCAN_INTERVAL,
+    CONF_TARIFF_T1,
+    CONF_TARIFF_T2,
+    CONF_TARIFF_T3,
+    DEFAULT_BILLS_MAX_AGE,
+    DEFAULT_BILLS_MAX_FILES,
+    DEFAULT_BILLS_MAX_SIZE,
+    DEFAULT_LEAN_ATTRIBUTES,
+    DEFAULT_QUEUE_DEADLINE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TARIFF_RATE,
     DOMAIN,
 )
 from .decorators import async_retry
@@ -298,6 +312,28 @@ OPTIONS_SCHEMA = vol.Schema(
         vol.Required(CONF_SCAN_INTERVAL): vol.All(
             vol.Coerce(int), vol.Range(min=1, max=168)
         ),
+        vol.Optional(CONF_LEAN_ATTRIBUTES): bool,
+        vol.Optional(CONF_QUEUE_DEADLINE): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=720)
+        ),
+        vol.Optional(CONF_BILLS_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=10240)
+        ),
+        vol.Optional(CONF_BILLS_MAX_AGE): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=240)
+        ),
+        vol.Optional(CONF_BILLS_MAX_FILES): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(CONF_TARIFF_T1): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(CONF_TARIFF_T2): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(CONF_TARIFF_T3): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
     }
 )
 
@@ -320,6 +356,30 @@ class TNSEOptionsFlowHandler(OptionsFlowWithReload):
                     CONF_SCAN_INTERVAL: self.config_entry.options.get(
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
+                    CONF_LEAN_ATTRIBUTES: self.config_entry.options.get(
+                        CONF_LEAN_ATTRIBUTES, DEFAULT_LEAN_ATTRIBUTES
+                    ),
+                    CONF_QUEUE_DEADLINE: self.config_entry.options.get(
+                        CONF_QUEUE_DEADLINE, DEFAULT_QUEUE_DEADLINE
+                    ),
+                    CONF_BILLS_MAX_SIZE: self.config_entry.options.get(
+                        CONF_BILLS_MAX_SIZE, DEFAULT_BILLS_MAX_SIZE
+                    ),
+                    CONF_BILLS_MAX_AGE: self.config_entry.options.get(
+                        CONF_BILLS_MAX_AGE, DEFAULT_BILLS_MAX_AGE
+                    ),
+                    CONF_BILLS_MAX_FILES: self.config_entry.options.get(
+                        CONF_BILLS_MAX_FILES, DEFAULT_BILLS_MAX_FILES
+                    ),
+                    CONF_TARIFF_T1: self.config_entry.options.get(
+                        CONF_TARIFF_T1, DEFAULT_TARIFF_RATE
+                    ),
+                    CONF_TARIFF_T2: self.config_entry.options.get(
+                        CONF_TARIFF_T2, DEFAULT_TARIFF_RATE
+                    ),
+                    CONF_TARIFF_T3: self.config_entry.options.get(
+                        CONF_TARIFF_T3, DEFAULT_TARIFF_RATE
+                    ),
                 },
             ),
         )
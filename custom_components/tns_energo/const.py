@@ -1,6 +1,7 @@
 """Constants for the TNS-Energo integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Final
 
 from homeassistant.const import Platform
@@ -13,14 +14,62 @@ MANUFACTURER: Final = "ТНС Энерго"
 API_TIMEOUT: Final = 30
 API_MAX_TRIES: Final = 3
 API_RETRY_DELAY: Final = 10  # seconds
+API_MAX_CONCURRENT_REQUESTS: Final = 2
 DEFAULT_SCAN_INTERVAL: Final = 24  # hours
+DEFAULT_LEAN_ATTRIBUTES: Final = False
+DEFAULT_QUEUE_DEADLINE: Final = 72  # hours
+DEFAULT_BILLS_MAX_SIZE: Final = 100  # MiB
+DEFAULT_BILLS_MAX_AGE: Final = 0  # months, unlimited
+DEFAULT_BILLS_MAX_FILES: Final = 0  # per account, unlimited
+DEFAULT_TARIFF_RATE: Final = 0.0  # RUB per kWh, not set
 
-PLATFORMS: Final[list[Platform]] = [Platform.SENSOR, Platform.BUTTON]
+READINGS_MIN_DAILY_LIMIT: Final = 50  # kWh per day
+READINGS_RATE_FACTOR: Final = 5
+READINGS_DEFAULT_PERIOD: Final = 31  # days
+
+BILL_DECODE_CHUNK_SIZE: Final = 64 * 1024  # base64 characters, multiple of 4
+BILL_STORAGE_VERSION: Final = 1
+BILL_STORAGE_KEY: Final = f"{DOMAIN}.bills"
+BILL_ACCESS_SAVE_DELAY: Final = 60  # seconds
+BILL_RETENTION_INTERVAL: Final = timedelta(hours=24)
+BILL_URL: Final = f"/api/{DOMAIN}/bills/{{account_number}}/{{month}}"
+BILL_URL_EXPIRATION: Final = timedelta(days=7)
+
+QUEUE_STORAGE_VERSION: Final = 1
+QUEUE_STORAGE_KEY: Final = DOMAIN + ".{entry_id}.readings_queue"
+QUEUE_CHECK_INTERVAL: Final = timedelta(minutes=5)
+QUEUE_RETRY_DELAY: Final = timedelta(minutes=5)
+QUEUE_RETRY_MAX_DELAY: Final = timedelta(hours=6)
+QUEUE_SENT_RETENTION: Final = timedelta(days=45)
+LEDGER_STORAGE_VERSION: Final = 1
+LEDGER_STORAGE_KEY: Final = DOMAIN + ".{entry_id}.payments"
+LEDGER_SYNC_MONTHS: Final = 12  # closed months fetched per update
+LEDGER_AVERAGE_MONTHS: Final = 12
+LEDGER_SAVE_DELAY: Final = 60  # seconds
+ANOMALY_HISTORY_MONTHS: Final = 24  # months compared with the latest one
+ANOMALY_MIN_MONTHS: Final = 6
+ANOMALY_MIN_DEVIATION: Final = 1.0  # kWh
+ANOMALY_SCORE_THRESHOLD: Final = 3.5
+
+PLATFORMS: Final[list[Platform]] = [
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+    Platform.BUTTON,
+]
 
 CONFIGURATION_URL: Final = "https://lk.{region}.tns-e.ru/"
 
 CONF_REGION: Final = "region"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_LEAN_ATTRIBUTES: Final = "lean_attributes"
+CONF_QUEUE_DEADLINE: Final = "queue_deadline"
+CONF_BILLS_MAX_SIZE: Final = "bills_max_size"
+CONF_BILLS_MAX_AGE: Final = "bills_max_age"
+CONF_BILLS_MAX_FILES: Final = "bills_max_files"
+CONF_TARIFF_T1: Final = "tariff_t1"
+CONF_TARIFF_T2: Final = "tariff_t2"
+CONF_TARIFF_T3: Final = "tariff_t3"
+CONF_TARIFF_RATES: Final = (CONF_TARIFF_T1, CONF_TARIFF_T2, CONF_TARIFF_T3)
 CONF_ACCESS_TOKEN: Final = "access_token"
 CONF_REFRESH_TOKEN: Final = "refresh_token"
 CONF_ACCESS_TOKEN_EXPIRES: Final = "access_token_expires"
@@ -35,6 +84,16 @@ ATTR_T1: Final = "t1"
 ATTR_T2: Final = "t2"
 ATTR_T3: Final = "t3"
 ATTR_READINGS: Final = "readings"
+ATTR_ITEMS: Final = "items"
+ATTR_ERROR: Final = "error"
+ATTR_QUEUED: Final = "queued"
+ATTR_FIRE_EVENT: Final = "fire_event"
+ATTR_FORCE: Final = "force"
+ATTR_CACHED: Final = "cached"
+ATTR_START_DATE: Final = "start_date"
+ATTR_END_DATE: Final = "end_date"
 ATTR_BALANCE: Final = "balance"
+ATTR_PAYMENTS: Final = "payments"
+ATTR_ANOMALIES: Final = "anomalies"
 
 FORMAT_DATE_SHORT_YEAR: Final = "%d.%m.%y"
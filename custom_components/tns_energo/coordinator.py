@@ -1,136 +1,77 @@
 """TNS-Energo Account Coordinator."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import aiohttp
+import aiotnse
 from aiotnse import SimpleTNSEAuth, TNSEApi
 from aiotnse.exceptions import TNSEApiError, TNSEAuthError
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    API_MAX_CONCURRENT_REQUESTS,
     CONF_ACCESS_TOKEN,
     CONF_ACCESS_TOKEN_EXPIRES,
+    CONF_BILLS_MAX_AGE,
+    CONF_BILLS_MAX_FILES,
+    CONF_BILLS_MAX_SIZE,
+    CONF_LEAN_ATTRIBUTES,
+    CONF_QUEUE_DEADLINE,
     CONF_REFRESH_TOKEN,
     CONF_REFRESH_TOKEN_EXPIRES,
     CONF_REGION,
     CONF_SCAN_INTERVAL,
+    CONF_TARIFF_RATES,
+    CONFIGURATION_URL,
+    COUNTER_MODEL,
+    COUNTER_NAME_FORMAT,
+    DEFAULT_BILLS_MAX_AGE,
+    DEFAULT_BILLS_MAX_FILES,
+    DEFAULT_BILLS_MAX_SIZE,
+    DEFAULT_LEAN_ATTRIBUTES,
+    DEFAULT_QUEUE_DEADLINE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TARIFF_RATE,
+    DEVICE_MODEL,
+    DEVICE_NAME_FORMAT,
     DOMAIN,
+    LEDGER_SYNC_MONTHS,
+    MANUFACTURER,
 )
+from .analytics import ConsumptionAnalytics, ConsumptionStats
+from .bills import BillEntry, BillRetention, async_get_bill_cache
+from .cost import TariffCostEngine
 from .decorators import async_api_request_handler
+from .models import (
+    Balance,
+    Counter,
+    EntityRow,
+    TNSEAccountData,
+    parse_account_info,
+    parse_balance,
+    parse_counter,
+    parse_counter_places,
+)
+from .helpers import get_closed_month
+from .payments import PaymentLedger, iter_months
+from .readings_queue import ReadingsQueue
+from .readings_store import ReadingsStore
 
 _LOGGER = logging.getLogger(__name__)
 
-
-@dataclass
-class TNSEAccountData:
-    """Parsed data for a single TNS-Energo account."""
-
-    id: int
-    number: str
-    name: str
-    address: str
-    isue_available: bool = False
-    initial_year: int | None = None
-    info: dict[str, Any] = field(default_factory=dict)
-    balance: dict[str, Any] = field(default_factory=dict)
-    counters: list[dict[str, Any]] = field(default_factory=list)
-    counter_consumption: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
-    last_payment_amount: float | None = None
-    last_payment_date: str | None = None
-
-    @property
-    def has_balance(self) -> bool:
-        """Return True if balance data is present."""
-        return bool(self.balance)
-
-    @property
-    def has_last_payment(self) -> bool:
-        """Return True if last payment data is present."""
-        return self.last_payment_amount is not None
-
-    def get_counter(self, index: int) -> dict[str, Any] | None:
-        """Return a counter by index, or None."""
-        return self.counters[index] if index < len(self.counters) else None
-
-    def get_counter_id(self, index: int) -> str | None:
-        """Return a counter's ID by index."""
-        c = self.get_counter(index)
-        return c.get("counterId") if c else None
-
-    def get_counter_row_id(self, index: int) -> str | None:
-        """Return a counter's row ID by index."""
-        c = self.get_counter(index)
-        return c.get("rowId") if c else None
-
-    def get_counter_readings(self, index: int) -> list[dict[str, Any]]:
-        """Return the list of last readings for a counter by index."""
-        c = self.get_counter(index)
-        return c.get("lastReadings", []) if c else []
-
-    def get_counter_tariff_count(self, index: int) -> int:
-        """Return the number of tariff readings for a counter by index."""
-        return len(self.get_counter_readings(index))
-
-    def get_counter_reading(
-        self, counter_index: int, reading_index: int
-    ) -> dict[str, Any] | None:
-        """Return a single reading by counter and reading index."""
-        readings = self.get_counter_readings(counter_index)
-        return readings[reading_index] if reading_index < len(readings) else None
-
-    def get_counter_place(self, index: int) -> str | None:
-        """Return installation place from account info for a counter."""
-        counter_id = self.get_counter_id(index)
-        if counter_id is None:
-            return None
-        for ci in self.info.get("countersInfo", []):
-            if ci.get("number") == counter_id:
-                return ci.get("place") or None
-        return None
-
-    def get_counter_consumption(
-        self, counter_index: int, reading_index: int
-    ) -> float | None:
-        """Return consumption for a counter tariff from counter_consumption data."""
-        counter_id = self.get_counter_id(counter_index)
-        if counter_id is None:
-            return None
-        readings = self.counter_consumption.get(counter_id, [])
-        if reading_index >= len(readings):
-            return None
-        consumption = readings[reading_index].get("consumption")
-        if consumption is None:
-            return None
-        try:
-            return float(consumption)
-        except (TypeError, ValueError):
-            return None
-
-    @property
-    def sum_to_pay(self) -> float | None:
-        """Return the sum to pay from balance."""
-        return self.balance.get("sumToPay")
-
-    @property
-    def debt(self) -> float | None:
-        """Return the debt from balance."""
-        return self.balance.get("debt")
-
-    @property
-    def closed_month(self) -> str | None:
-        """Return the closed month from balance."""
-        return self.balance.get("closedMonth")
+type RowBuilder = Callable[[Mapping[str, TNSEAccountData]], EntityRow]
 
 
 class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
@@ -138,8 +79,22 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
 
     config_entry: ConfigEntry
     api: TNSEApi
+    request_limiter: asyncio.Semaphore
+    readings_queue: ReadingsQueue
+    payment_ledger: PaymentLedger
+    readings_store: ReadingsStore
+    consumption_analytics: ConsumptionAnalytics
+    consumption_stats: dict[str, ConsumptionStats]
+    cost_engine: TariffCostEngine
+    bill_retention: BillRetention
     region: str
+    lean_attributes: bool
     last_update_time: datetime | None
+    accounts: dict[str, TNSEAccountData]
+    counters: dict[str, Counter]
+    counter_accounts: dict[str, str]
+    rows: dict[str, EntityRow]
+    device_infos: dict[str, DeviceInfo]
 
     def __init__(
         self,
@@ -149,7 +104,18 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
     ) -> None:
         """Initialize the coordinator."""
         self.region = config_entry.data.get(CONF_REGION, "")
+        self.lean_attributes = config_entry.options.get(
+            CONF_LEAN_ATTRIBUTES, DEFAULT_LEAN_ATTRIBUTES
+        )
         self.last_update_time = None
+        self.accounts = {}
+        self.counters = {}
+        self.counter_accounts = {}
+        self.rows = {}
+        self.device_infos = {}
+        self._row_builders: dict[
+            str, tuple[str, str | None, bool, RowBuilder]
+        ] = {}
 
         session = async_get_clientsession(hass)
         self._auth = SimpleTNSEAuth(
@@ -172,6 +138,32 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
             token_update_callback=self._on_token_update,
         )
         self.api = TNSEApi(self._auth)
+        self.request_limiter = asyncio.Semaphore(API_MAX_CONCURRENT_REQUESTS)
+        self.readings_queue = ReadingsQueue(
+            hass,
+            self,
+            config_entry.entry_id,
+            timedelta(
+                hours=config_entry.options.get(
+                    CONF_QUEUE_DEADLINE, DEFAULT_QUEUE_DEADLINE
+                )
+            ),
+        )
+        self.payment_ledger = PaymentLedger(hass, config_entry.entry_id)
+        self.readings_store = ReadingsStore(hass, config_entry.entry_id)
+        self.consumption_analytics = ConsumptionAnalytics(self.readings_store)
+        self.consumption_stats = {}
+        options = config_entry.options
+        self.cost_engine = TariffCostEngine(
+            [options.get(key, DEFAULT_TARIFF_RATE) for key in CONF_TARIFF_RATES]
+        )
+        self.bill_retention = BillRetention(
+            max_bytes=options.get(CONF_BILLS_MAX_SIZE, DEFAULT_BILLS_MAX_SIZE)
+            * 1024
+            * 1024,
+            max_age=options.get(CONF_BILLS_MAX_AGE, DEFAULT_BILLS_MAX_AGE),
+            max_files=options.get(CONF_BILLS_MAX_FILES, DEFAULT_BILLS_MAX_FILES),
+        )
 
         scan_interval: int = config_entry.options.get(
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
@@ -201,8 +193,148 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
             raise UpdateFailed(str(exc)) from exc
 
     async def _async_update_data(self) -> list[TNSEAccountData]:
-        """Fetch data from TNS-Energo."""
-        return await self._fetch_all_data()
+        """Fetch data from TNS-Energo and render entity rows."""
+        data = await self._fetch_all_data()
+        previous_accounts = self.accounts
+        previous_counters = self.counters
+        self.accounts = {account.number: account for account in data}
+        self.counters = {
+            counter.counter_id: counter
+            for account in data
+            for counter in account.counters
+        }
+        self.counter_accounts = {
+            counter.counter_id: account.number
+            for account in data
+            for counter in account.counters
+        }
+        try:
+            appends = await self.readings_store.async_update(self.counters.values())
+        except OSError as exc:
+            _LOGGER.warning("Failed to store the readings history: %s", exc)
+            appends = {}
+        if self.cost_engine.enabled:
+            self.cost_engine.update(
+                self.readings_store, self.counters.values(), appends
+            )
+        self.consumption_stats = self.consumption_analytics.get_stats(
+            self.counters.values()
+        )
+        self.device_infos = self._build_device_infos(data)
+        self.rows = self._render_rows(previous_accounts, previous_counters)
+        return data
+
+    def _build_device_infos(
+        self, data: list[TNSEAccountData]
+    ) -> dict[str, DeviceInfo]:
+        """Build device info by identifier, accounts before their counters.
+
+        Device info objects of known devices are reused, so all entities of
+        a device share the same object.
+        """
+        device_infos: dict[str, DeviceInfo] = {}
+        for account in data:
+            device_infos[account.number] = self.device_infos.get(
+                account.number
+            ) or DeviceInfo(
+                identifiers={(DOMAIN, account.number)},
+                manufacturer=MANUFACTURER,
+                model=DEVICE_MODEL,
+                name=DEVICE_NAME_FORMAT.format(account.number),
+                serial_number=account.number,
+                sw_version=aiotnse.__version__,
+                configuration_url=CONFIGURATION_URL.format(region=self.region),
+            )
+            for counter in account.counters:
+                device_infos[counter.counter_id] = self.device_infos.get(
+                    counter.counter_id
+                ) or DeviceInfo(
+                    identifiers={(DOMAIN, counter.counter_id)},
+                    name=COUNTER_NAME_FORMAT.format(counter.counter_id),
+                    manufacturer=MANUFACTURER,
+                    model=COUNTER_MODEL,
+                    serial_number=counter.counter_id,
+                    via_device=(DOMAIN, account.number),
+                )
+        return device_infos
+
+    def _render_rows(
+        self,
+        previous_accounts: Mapping[str, TNSEAccountData],
+        previous_counters: Mapping[str, Counter],
+    ) -> dict[str, EntityRow]:
+        """Render the rows of all registered entities.
+
+        Rows whose account or counter is unchanged since the previous refresh
+        are reused as is, unless their builder renders on every refresh, and
+        re-rendered rows equal to the previous ones keep the previous object,
+        so entities detect changes by identity.
+        """
+        accounts = self.accounts
+        counters = self.counters
+        changed_accounts = {
+            number
+            for number, account in accounts.items()
+            if previous_accounts.get(number) != account
+        }
+        rows: dict[str, EntityRow] = {}
+        for unique_id, (account_number, counter_id, always_render, build) in (
+            self._row_builders.items()
+        ):
+            old_row = self.rows.get(unique_id)
+            if old_row is not None and not always_render and (
+                account_number not in changed_accounts
+                or (
+                    counter_id is not None
+                    and counter_id in counters
+                    and previous_counters.get(counter_id) == counters[counter_id]
+                )
+            ):
+                rows[unique_id] = old_row
+                continue
+            row = build(accounts)
+            rows[unique_id] = old_row if row == old_row else row
+        return rows
+
+    @callback
+    def async_add_row_builder(
+        self,
+        unique_id: str,
+        builder: RowBuilder,
+        account_number: str,
+        counter_id: str | None = None,
+        always_render: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Register an entity row builder and render its row immediately.
+
+        The row only depends on the given account, or on the given counter
+        if one is set, unless always_render is set to render it on every
+        refresh.
+        """
+        self._row_builders[unique_id] = (
+            account_number,
+            counter_id,
+            always_render,
+            builder,
+        )
+        self.rows[unique_id] = builder(self.accounts)
+
+        @callback
+        def _async_remove_row_builder() -> None:
+            self._row_builders.pop(unique_id, None)
+            self.rows.pop(unique_id, None)
+
+        return _async_remove_row_builder
+
+    async def async_apply_bill_retention(
+        self, _now: datetime | None = None, *, keep: BillEntry | None = None
+    ) -> None:
+        """Remove stored bills of the entry accounts over the retention limits."""
+        cache = await async_get_bill_cache(self.hass)
+        if removed := await cache.async_apply_retention(
+            self.accounts, self.bill_retention, keep
+        ):
+            _LOGGER.debug("Removed %d stored bill(s)", removed)
 
     def _on_token_update(self, token_data: dict[str, Any]) -> None:
         """Persist updated tokens to config entry."""
@@ -261,7 +393,7 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
         return await self.api.async_get_invoice_file(account_number, date_str)
 
     async def _fetch_all_data(self) -> list[TNSEAccountData]:
-        """Fetch all account data from API."""
+        """Fetch all account data from API and parse it."""
         accounts_resp = await self._async_get_accounts()
 
         raw_accounts: list[dict[str, Any]] = accounts_resp
@@ -269,58 +401,87 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
         result: list[TNSEAccountData] = []
 
         for raw in raw_accounts:
-            account = TNSEAccountData(
-                id=raw["id"],
-                number=raw["number"],
-                name=raw.get("name", ""),
-                address=raw.get("address", ""),
-                isue_available=raw.get("isueAvaliable", False),
-                initial_year=raw.get("initial_year"),
-            )
-            _LOGGER.debug("Fetching data for account %s", account.number)
-
-            info_resp = await self._async_get_account_info(account.id)
-            account.info = info_resp
+            number: str = raw["number"]
+            _LOGGER.debug("Fetching data for account %s", number)
 
-            balance_resp = await self._async_get_balance(account.number)
-            account.balance = balance_resp
-
-            counters_resp = await self._async_get_counters(account.number)
-            account.counters = counters_resp
+            info_resp = await self._async_get_account_info(raw["id"])
+            balance_resp = await self._async_get_balance(number)
+            counters_resp = await self._async_get_counters(number)
 
             # Fetch counter consumption (non-critical)
-            for counter in account.counters:
-                counter_id = counter.get("counterId")
+            counter_consumption: dict[str, list[dict[str, Any]]] = {}
+            counter_history: dict[str, list[dict[str, Any]]] = {}
+            for raw_counter in counters_resp:
+                counter_id = raw_counter.get("counterId")
                 if not counter_id:
                     continue
                 try:
                     readings_resp = await self._async_get_counter_readings(
-                        counter_id, account.number
+                        counter_id, number
                     )
                     data_list = readings_resp
                     if data_list:
-                        account.counter_consumption[counter_id] = (
+                        counter_consumption[counter_id] = (
                             data_list[0].get("readings", [])
                         )
+                        counter_history[counter_id] = data_list
                 except UpdateFailed as exc:
                     _LOGGER.warning(
                         "Account %s: failed to fetch counter %s readings: %s",
-                        account.number,
+                        number,
                         counter_id,
                         exc,
                     )
 
-            # Fetch last payment from history (non-critical)
-            await self._fetch_last_payment(account)
+            # Sync payment history into the ledger (non-critical)
+            balance = parse_balance(balance_resp)
+            await self._async_sync_payment_history(
+                number, balance, raw.get("initial_year")
+            )
+
+            places = parse_counter_places(info_resp)
+            counters: list[Counter] = []
+            for raw_counter in counters_resp:
+                counter_id = raw_counter.get("counterId", "")
+                counter = parse_counter(
+                    raw_counter,
+                    places.get(counter_id),
+                    counter_consumption.get(counter_id),
+                    counter_history.get(counter_id),
+                )
+                if counter is not None:
+                    counters.append(counter)
+
+            account = TNSEAccountData(
+                id=raw["id"],
+                number=number,
+                name=raw.get("name", ""),
+                address=raw.get("address", ""),
+                isue_available=raw.get("isueAvaliable", False),
+                initial_year=raw.get("initial_year"),
+                info=parse_account_info(info_resp),
+                balance=balance,
+                counters=tuple(counters),
+                last_payment=self.payment_ledger.get_last_payment(number),
+                payment_summary=self.payment_ledger.get_summary(
+                    number, dt_util.now().year
+                ),
+                raw={
+                    "info": info_resp,
+                    "balance": balance_resp,
+                    "counters": counters_resp,
+                    "counter_consumption": counter_consumption,
+                },
+            )
 
             _LOGGER.debug(
                 "Account %s: balance=%s, counters=%d, "
                 "consumption=%d, last_payment=%s",
                 account.number,
-                account.sum_to_pay,
+                account.balance.sum_to_pay if account.balance else None,
                 len(account.counters),
-                len(account.counter_consumption),
-                account.last_payment_amount,
+                len(counter_consumption),
+                account.last_payment,
             )
 
             result.append(account)
@@ -328,28 +489,60 @@ class TNSECoordinator(DataUpdateCoordinator[list[TNSEAccountData]]):
         self.last_update_time = dt_util.now()
         return result
 
-    async def _fetch_last_payment(self, account: TNSEAccountData) -> None:
-        """Fetch last payment from history API for current/previous month."""
-        now = dt_util.now()
-        for offset in (0, -1):
-            dt = now.replace(day=1)
-            if offset == -1:
-                dt = (dt - timedelta(days=1)).replace(day=1)
+    async def _async_sync_payment_history(
+        self,
+        account_number: str,
+        balance: Balance | None,
+        initial_year: int | None,
+    ) -> None:
+        """Sync the payment history of an account into the ledger.
+
+        The current and previous months are fetched until their billing
+        period closes. Older months back to the initial year are backfilled
+        newest first, at most LEDGER_SYNC_MONTHS per update, and are then
+        served from the ledger.
+        """
+        closed_month = get_closed_month(balance)
+        current = dt_util.now().date().replace(day=1)
+        previous = (current - timedelta(days=1)).replace(day=1)
+        backfill = [
+            dt
+            for dt in iter_months(
+                date(initial_year or previous.year, 1, 1),
+                (previous - timedelta(days=1)).replace(day=1),
+            )
+            if not self.payment_ledger.is_closed(
+                account_number, f"{dt.year}-{dt.month:02d}"
+            )
+        ][:LEDGER_SYNC_MONTHS]
+
+        changed = False
+        for dt in (current, previous, *backfill):
+            month = f"{dt.year}-{dt.month:02d}"
+            if self.payment_ledger.is_closed(account_number, month):
+                continue
             try:
                 history_resp = await self._async_get_history(
-                    account.number, dt.year, dt.month
+                    account_number, dt.year, dt.month
                 )
-                items = history_resp.get("items", [])
-                for item in items:
-                    if item.get("type") == 1:
-                        account.last_payment_amount = item.get("amount")
-                        account.last_payment_date = item.get("date")
-                        return
             except UpdateFailed as exc:
                 _LOGGER.warning(
                     "Account %s: failed to fetch history %d-%02d: %s",
-                    account.number,
+                    account_number,
                     dt.year,
                     dt.month,
                     exc,
                 )
+                if dt < previous:
+                    # Retry the backfill on the next update
+                    break
+                continue
+            if self.payment_ledger.set_month(
+                account_number,
+                month,
+                history_resp.get("items", []),
+                (dt.year, dt.month) <= (closed_month.year, closed_month.month),
+            ):
+                changed = True
+        if changed:
+            self.payment_ledger.async_delay_save()
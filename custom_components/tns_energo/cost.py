@@ -0,0 +1,130 @@
+"""Local cost estimate of the TNS-Energo counter readings."""
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from .models import Counter
+from .readings_store import ReadingsSeries, ReadingsStore
+
+
+def _month_index(day: int) -> int:
+    """Return the month number of an ordinal day."""
+    value = date.fromordinal(day)
+    return value.year * 12 + value.month - 1
+
+
+@dataclass(frozen=True, slots=True)
+class CostEstimate:
+    """Consumption and cost of the readings of a counter taken in one month."""
+
+    month: date
+    consumption: float
+    cost: float
+
+
+@dataclass(slots=True)
+class _ZoneTotals:
+    """Running totals of a counter tariff zone in its latest month."""
+
+    month: int = -1
+    last_value: float = math.nan
+    consumption: float = 0.0
+
+
+class TariffCostEngine:
+    """Running cost of the readings taken in the latest month of each counter.
+
+    Every new reading adds its consumption, or the difference to the
+    previous reading, to the totals of its tariff zone, and a reading of a
+    later month starts the zone over, so each reading is an O(1) update.
+    ``rates`` are the prices per kWh of the T1, T2 and T3 zones; a zone
+    without a positive rate has no estimate.
+    """
+
+    def __init__(self, rates: Sequence[float]) -> None:
+        """Initialize the engine."""
+        self.rates = tuple(rates)
+        self._zones: dict[tuple[str, int], _ZoneTotals] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if any tariff rate is set."""
+        return any(rate > 0 for rate in self.rates)
+
+    def update(
+        self,
+        store: ReadingsStore,
+        counters: Iterable[Counter],
+        appends: Mapping[tuple[str, int], ReadingsSeries],
+    ) -> None:
+        """Add the periods just appended to the store.
+
+        Zones seen for the first time are seeded from the store with the
+        periods of their latest month and the reading before it.
+        """
+        for counter in counters:
+            for index in range(counter.tariff_count):
+                key = (counter.counter_id, index)
+                if (zone := self._zones.get(key)) is not None:
+                    if (new := appends.get(key)) is not None:
+                        self._add_periods(zone, new, 0)
+                    continue
+                if (series := store.get_series(*key)) is None or not series:
+                    continue
+                month = _month_index(series.days[-1])
+                start = date(month // 12, month % 12 + 1, 1)
+                zone = self._zones[key] = _ZoneTotals()
+                self._add_periods(
+                    zone, series, max(series.get_slice(start, None).start - 1, 0)
+                )
+
+    @staticmethod
+    def _add_periods(zone: _ZoneTotals, series: ReadingsSeries, start: int) -> None:
+        """Add the periods of a series from an index to the zone totals."""
+        for position in range(start, len(series)):
+            value = series.values[position]
+            consumption = series.consumption[position]
+            if math.isnan(consumption) and not math.isnan(zone.last_value):
+                consumption = max(value - zone.last_value, 0.0)
+            if not math.isnan(value):
+                zone.last_value = value
+
+            month = _month_index(series.days[position])
+            if month < zone.month:
+                continue
+            if month > zone.month:
+                zone.month = month
+                zone.consumption = 0.0
+            if not math.isnan(consumption):
+                zone.consumption += consumption
+
+    def get_estimate(self, counter: Counter) -> CostEstimate | None:
+        """Return the estimate of the latest month of a counter, or None.
+
+        Zones whose latest reading is older than the month add nothing.
+        """
+        if not counter.tariff_count or counter.tariff_count > len(self.rates):
+            return None
+        zones = [
+            (self._zones.get((counter.counter_id, index)), self.rates[index])
+            for index in range(counter.tariff_count)
+        ]
+        if any(rate <= 0 for _, rate in zones):
+            return None
+        month = max((zone.month for zone, _ in zones if zone is not None), default=-1)
+        if month < 0:
+            return None
+
+        consumption = cost = 0.0
+        for zone, rate in zones:
+            if zone is not None and zone.month == month:
+                consumption += zone.consumption
+                cost += zone.consumption * rate
+        return CostEstimate(
+            month=date(month // 12, month % 12 + 1, 1),
+            consumption=round(consumption, 3),
+            cost=round(cost, 2),
+        )
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections.abc import Awaitable, Callable, Coroutine
+from contextlib import AbstractAsyncContextManager, nullcontext
 from functools import wraps
 from random import randint
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
@@ -29,10 +30,13 @@ _LOGGER = logging.getLogger(__name__)
 
 def async_retry(
     func: Callable[_P, Awaitable[_R]],
+    get_limiter: Callable[_P, AbstractAsyncContextManager[Any]] | None = None,
 ) -> Callable[_P, Coroutine[Any, Any, _R]]:
     """Retry async function on transient errors (timeout, API, network).
 
-    TNSEAuthError is never retried — it propagates immediately.
+    TNSEAuthError is never retried — it propagates immediately. The limiter
+    returned by get_limiter is held for each attempt only, not while waiting
+    for the next one.
     """
 
     @wraps(func)
@@ -41,10 +45,11 @@ def async_retry(
         api_timeout = API_TIMEOUT
         api_retry_delay = API_RETRY_DELAY
         last_error: Exception | None = None
+        limiter = get_limiter(*args, **kwargs) if get_limiter else nullcontext()
         while True:
             tries += 1
             try:
-                async with asyncio.timeout(api_timeout):
+                async with limiter, asyncio.timeout(api_timeout):
                     return await func(*args, **kwargs)
 
             except TNSEAuthError:
@@ -88,11 +93,14 @@ def async_api_request_handler(
 ) -> Callable[Concatenate[_TNSECoordinatorT, _P], Coroutine[Any, Any, _R]]:
     """Handle API errors with retries for coordinator methods.
 
-    Wraps async_retry with coordinator-specific exception mapping:
+    Each attempt runs under the coordinator request limiter. Wraps
+    async_retry with coordinator-specific exception mapping:
     - TNSEAuthError → ConfigEntryAuthFailed
     - TNSEApiError → UpdateFailed
     """
-    retried = async_retry(method)
+    retried = async_retry(
+        method, lambda self, *args, **kwargs: self.request_limiter
+    )
 
     @wraps(method)
     async def wrapper(
@@ -1,6 +1,7 @@
 """Diagnostics support for TNS-Energo."""
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
@@ -34,12 +35,17 @@ async def async_get_config_entry_diagnostics(
                         "id": account.id,
                         "number": account.number,
                         "address": account.address,
-                        "info": account.info,
-                        "balance": account.balance,
-                        "counters": account.counters,
-                        "counter_consumption": account.counter_consumption,
-                        "last_payment_amount": account.last_payment_amount,
-                        "last_payment_date": account.last_payment_date,
+                        "info": account.raw.get("info"),
+                        "balance": account.raw.get("balance"),
+                        "counters": account.raw.get("counters"),
+                        "counter_consumption": account.raw.get(
+                            "counter_consumption"
+                        ),
+                        "last_payment": (
+                            asdict(account.last_payment)
+                            if account.last_payment
+                            else None
+                        ),
                     },
                     TO_REDACT_DATA,
                 )
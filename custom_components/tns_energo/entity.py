@@ -1,21 +1,17 @@
 """Base entity for TNS-Energo integration."""
 from __future__ import annotations
 
-import aiotnse
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from abc import abstractmethod
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    ATTRIBUTION,
-    CONFIGURATION_URL,
-    COUNTER_MODEL,
-    COUNTER_NAME_FORMAT,
-    DEVICE_MODEL,
-    DEVICE_NAME_FORMAT,
-    DOMAIN,
-    MANUFACTURER,
-)
-from .coordinator import TNSEAccountData, TNSECoordinator
+from .const import ATTRIBUTION
+from .coordinator import TNSECoordinator
+from .models import UNAVAILABLE_ROW, EntityRow, TNSEAccountData
 
 
 class TNSEBaseCoordinatorEntity(CoordinatorEntity[TNSECoordinator]):
@@ -35,27 +31,80 @@ class TNSEBaseCoordinatorEntity(CoordinatorEntity[TNSECoordinator]):
         self.entity_description = entity_description
         self._account_number = account_number
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, account_number)},
-            manufacturer=MANUFACTURER,
-            model=DEVICE_MODEL,
-            name=DEVICE_NAME_FORMAT.format(account_number),
-            sw_version=aiotnse.__version__,
-            configuration_url=CONFIGURATION_URL.format(
-                region=coordinator.region
-            ),
-        )
+        self._attr_device_info = coordinator.device_infos[account_number]
 
         self._attr_unique_id = f"{account_number}_{entity_description.key}"
 
     def _get_account(self) -> TNSEAccountData | None:
         """Get current account data from coordinator."""
-        if self.coordinator.data is None:
-            return None
-        for acc in self.coordinator.data:
-            if acc.number == self._account_number:
-                return acc
-        return None
+        return self.coordinator.accounts.get(self._account_number)
+
+
+class TNSERowEntity(TNSEBaseCoordinatorEntity):
+    """TNS-Energo entity whose state is a precomputed coordinator row."""
+
+    _counter_id: str | None = None
+    _always_render_row: bool = False
+    _written: tuple[EntityRow, bool] | None = None
+
+    @abstractmethod
+    def _render_row(self, accounts: Mapping[str, TNSEAccountData]) -> EntityRow:
+        """Render the entity row from the accounts of the current refresh."""
+
+    async def async_added_to_hass(self) -> None:
+        """Register the row builder with the coordinator."""
+        await super().async_added_to_hass()
+        assert self.unique_id is not None
+        self.async_on_remove(
+            self.coordinator.async_add_row_builder(
+                self.unique_id,
+                self._render_row,
+                self._account_number,
+                self._counter_id,
+                self._always_render_row,
+            )
+        )
+        self._written = (self._row, self.coordinator.last_update_success)
+
+    def _row_attributes(self, attributes: dict[str, Any]) -> dict[str, Any]:
+        """Drop unrecorded attributes if the lean attribute profile is enabled."""
+        if not self.coordinator.lean_attributes:
+            return attributes
+        return {
+            key: value
+            for key, value in attributes.items()
+            if key not in self._unrecorded_attributes
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the row or coordinator availability changed."""
+        written = (self._row, self.coordinator.last_update_success)
+        if (
+            self._written is not None
+            and written[0] is self._written[0]
+            and written[1] == self._written[1]
+        ):
+            return
+        self._written = written
+        super()._handle_coordinator_update()
+
+    @property
+    def _row(self) -> EntityRow:
+        """Return the entity row of the current refresh."""
+        if self.unique_id is None:
+            return UNAVAILABLE_ROW
+        return self.coordinator.rows.get(self.unique_id, UNAVAILABLE_ROW)
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return super().available and self._row.available
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the state attributes."""
+        return self._row.attributes
 
 
 class TNSECounterEntity(TNSEBaseCoordinatorEntity):
@@ -66,25 +115,11 @@ class TNSECounterEntity(TNSEBaseCoordinatorEntity):
         coordinator: TNSECoordinator,
         entity_description: EntityDescription,
         account_number: str,
-        counter_index: int,
+        counter_id: str,
     ) -> None:
         """Initialize the Entity."""
         super().__init__(coordinator, entity_description, account_number)
-        self._counter_index = counter_index
-
-        counter_id = self._get_counter_id()
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, counter_id)},
-            name=COUNTER_NAME_FORMAT.format(counter_id),
-            manufacturer=MANUFACTURER,
-            model=COUNTER_MODEL,
-            via_device=(DOMAIN, account_number),
-        )
-        self._attr_unique_id = f"{counter_id}_{entity_description.key}"
+        self._counter_id = counter_id
 
-    def _get_counter_id(self) -> str:
-        """Get counter ID from coordinator data."""
-        account = self._get_account()
-        if account is not None:
-            return account.get_counter_id(self._counter_index) or ""
-        return ""
+        self._attr_device_info = coordinator.device_infos[counter_id]
+        self._attr_unique_id = f"{counter_id}_{entity_description.key}"
@@ -1,15 +1,20 @@
 """TNS-Energo helper functions."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
 from .const import DOMAIN
-from .coordinator import TNSEAccountData, TNSECoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import TNSECoordinator
+    from .models import Balance, Counter, TNSEAccountData
 
 
 def get_device_entry_by_device_id(
@@ -35,53 +40,119 @@ def get_identifier_from_device(device_entry: dr.DeviceEntry) -> str | None:
     return None
 
 
-def get_coordinator(
-    hass: HomeAssistant, device_id: str | None
-) -> TNSECoordinator:
-    """Get coordinator for device id."""
+@dataclass(frozen=True, slots=True)
+class DeviceTarget:
+    """Service target resolved from a device ID.
+
+    ``account`` is the account of the device, or the parent account if the
+    device is a counter.
+    """
+
+    coordinator: TNSECoordinator
+    identifier: str | None
+    account: TNSEAccountData | None = None
+    counter: Counter | None = None
+
+
+DATA_DEVICE_TARGETS: HassKey[dict[str, DeviceTarget]] = HassKey(
+    f"{DOMAIN}_device_targets"
+)
+
+
+@callback
+def _async_get_device_targets(hass: HomeAssistant) -> dict[str, DeviceTarget]:
+    """Return the device target cache, cleared on device registry updates."""
+    if (targets := hass.data.get(DATA_DEVICE_TARGETS)) is None:
+        targets = hass.data[DATA_DEVICE_TARGETS] = {}
+
+        @callback
+        def _async_device_registry_updated(
+            event: Event[dr.EventDeviceRegistryUpdatedData],
+        ) -> None:
+            targets.clear()
+
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, _async_device_registry_updated
+        )
+    return targets
+
+
+@callback
+def async_invalidate_device_targets(hass: HomeAssistant) -> None:
+    """Clear the device target cache after coordinator data changed."""
+    if (targets := hass.data.get(DATA_DEVICE_TARGETS)) is not None:
+        targets.clear()
+
+
+def get_device_target(hass: HomeAssistant, device_id: str | None) -> DeviceTarget:
+    """Resolve a device ID to its coordinator, account and counter.
+
+    Resolutions are cached until the device registry or coordinator data
+    changes.
+    """
+    targets = _async_get_device_targets(hass)
+    if device_id is not None and (target := targets.get(device_id)) is not None:
+        return target
+
     device_entry = get_device_entry_by_device_id(hass, device_id)
+    coordinator: TNSECoordinator | None = None
     for entry_id in device_entry.config_entries:
         if (config_entry := hass.config_entries.async_get_entry(entry_id)) is None:
             continue
         if config_entry.domain == DOMAIN:
-            return cast(TNSECoordinator, config_entry.runtime_data)
+            coordinator = cast("TNSECoordinator", config_entry.runtime_data)
+            break
+    if coordinator is None:
+        raise ValueError(f"Config entry for {device_id} not found")
+
+    identifier = get_identifier_from_device(device_entry)
+    account: TNSEAccountData | None = None
+    counter: Counter | None = None
+    if identifier is not None:
+        if (counter := coordinator.counters.get(identifier)) is not None:
+            account = coordinator.accounts.get(
+                coordinator.counter_accounts[identifier]
+            )
+        else:
+            account = coordinator.accounts.get(identifier)
+
+    target = targets[device_entry.id] = DeviceTarget(
+        coordinator, identifier, account, counter
+    )
+    return target
 
-    raise ValueError(f"Config entry for {device_id} not found")
 
+def get_coordinator(
+    hass: HomeAssistant, device_id: str | None
+) -> TNSECoordinator:
+    """Get coordinator for device id."""
+    return get_device_target(hass, device_id).coordinator
 
-def get_account(
-    hass: HomeAssistant, coordinator: TNSECoordinator, device_id: str | None
-) -> TNSEAccountData:
-    """Get account data from coordinator by device ID."""
-    device_entry = get_device_entry_by_device_id(hass, device_id)
-    account_number = get_identifier_from_device(device_entry)
-    if account_number is None:
-        raise ValueError(f"No account number found for device {device_id}")
-
-    if coordinator.data:
-        for account in coordinator.data:
-            if account.number == account_number:
-                return account
 
-    raise ValueError(f"Account {account_number} not found in coordinator data")
+def get_account(hass: HomeAssistant, device_id: str | None) -> TNSEAccountData:
+    """Get account data by account device ID."""
+    target = get_device_target(hass, device_id)
+    if target.identifier is None:
+        raise ValueError(f"No account number found for device {device_id}")
+    if target.account is None or target.counter is not None:
+        raise ValueError(
+            f"Account {target.identifier} not found in coordinator data"
+        )
+    return target.account
 
 
 def get_counter_data(
-    hass: HomeAssistant, coordinator: TNSECoordinator, device_id: str | None
-) -> tuple[TNSEAccountData, dict[str, Any]]:
+    hass: HomeAssistant, device_id: str | None
+) -> tuple[TNSEAccountData, Counter]:
     """Get account and counter data from a counter device ID."""
-    device_entry = get_device_entry_by_device_id(hass, device_id)
-    counter_id = get_identifier_from_device(device_entry)
-    if counter_id is None:
+    target = get_device_target(hass, device_id)
+    if target.identifier is None:
         raise ValueError(f"No identifier found for device {device_id}")
-
-    if coordinator.data:
-        for account in coordinator.data:
-            for counter in account.counters:
-                if counter.get("counterId") == counter_id:
-                    return account, counter
-
-    raise ValueError(f"Counter {counter_id} not found in coordinator data")
+    if target.account is None or target.counter is None:
+        raise ValueError(
+            f"Counter {target.identifier} not found in coordinator data"
+        )
+    return target.account, target.counter
 
 
 def get_float_value(hass: HomeAssistant, entity_id: str | None) -> float | None:
@@ -100,6 +171,17 @@ def get_previous_month() -> date:
     return first_day
 
 
+def get_closed_month(balance: Balance | None) -> date:
+    """Return a date in the last closed billing month.
+
+    Without balance data only months before the previous one are treated as
+    closed.
+    """
+    if balance is not None and balance.closed_month is not None:
+        return balance.closed_month
+    return get_previous_month() - timedelta(days=1)
+
+
 def to_str(value: Any) -> str | None:
     """Value to string."""
     if value is None:
@@ -120,6 +202,16 @@ def to_float(value: Any) -> float | None:
         return None
 
 
+def to_int(value: Any) -> int | None:
+    """Value to int."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def to_date(value: str | None, fmt: str) -> date | None:
     """String to date."""
     if value is None:
@@ -0,0 +1,302 @@
+"""TNS-Energo data models."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Final
+
+from .const import FORMAT_DATE_SHORT_YEAR
+from .helpers import to_date, to_float, to_int, to_str
+
+
+@dataclass(frozen=True, slots=True)
+class AccountInfo:
+    """Static account information."""
+
+    address: str | None = None
+    phone: str | None = None
+    number_persons: int | None = None
+    total_area: float | None = None
+    living_area: float | None = None
+    document: str | None = None
+    tenant_category: str | None = None
+    season_ratio: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Balance:
+    """Account balance for the last closed billing month."""
+
+    sum_to_pay: float | None = None
+    sum_to_pay_raw: float | None = None
+    sum_without_checkbox: float | None = None
+    sum_with_checkbox: float | None = None
+    debt: float | None = None
+    debt_abs: float | None = None
+    penalty: float | None = None
+    penalty_forecast: float | None = None
+    closed_month: date | None = None
+    advance_total: float | None = None
+    advance_type: str | None = None
+    advance_main: float | None = None
+    recalculation: float | None = None
+    common_needs: float | None = None
+    losses: float | None = None
+    other_services_debt: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TariffReading:
+    """Last reading of a single counter tariff zone."""
+
+    name: str | None = None
+    value: float | None = None
+    reading_date: date | None = None
+    reading_date_str: str | None = None
+    consumption: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ReadingsPeriod:
+    """Readings of all tariff zones of a counter taken on one date."""
+
+    reading_date: date
+    readings: tuple[TariffReading, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Counter:
+    """Electricity counter with its last tariff readings.
+
+    ``history`` holds all readings periods returned by the API, oldest first.
+    """
+
+    counter_id: str
+    row_id: str | None = None
+    installation_type: str | None = None
+    tariff: int = 0
+    checking_date: str | None = None
+    place: str | None = None
+    readings: tuple[TariffReading, ...] = ()
+    history: tuple[ReadingsPeriod, ...] = field(default=(), repr=False)
+
+    @property
+    def tariff_count(self) -> int:
+        """Return the number of tariff readings."""
+        return len(self.readings)
+
+    @property
+    def readings_date(self) -> date | None:
+        """Return the date of the last readings."""
+        return self.readings[0].reading_date if self.readings else None
+
+    def get_reading(self, index: int) -> TariffReading | None:
+        """Return a tariff reading by index, or None."""
+        return self.readings[index] if index < len(self.readings) else None
+
+
+@dataclass(frozen=True, slots=True)
+class Payment:
+    """A payment from the account history."""
+
+    amount: float | None = None
+    payment_date: date | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentSummary:
+    """Payment aggregates of an account from the local ledger."""
+
+    year: int
+    paid: float = 0.0
+    payment_count: int = 0
+    average_monthly_bill: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TNSEAccountData:
+    """Parsed data for a single TNS-Energo account.
+
+    ``raw`` keeps the original API payloads for diagnostics only; entities
+    must read the typed fields.
+    """
+
+    id: int
+    number: str
+    name: str
+    address: str
+    isue_available: bool = False
+    initial_year: int | None = None
+    info: AccountInfo = field(default_factory=AccountInfo)
+    balance: Balance | None = None
+    counters: tuple[Counter, ...] = ()
+    last_payment: Payment | None = None
+    payment_summary: PaymentSummary | None = None
+    raw: Mapping[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def has_balance(self) -> bool:
+        """Return True if balance data is present."""
+        return self.balance is not None
+
+    @property
+    def has_last_payment(self) -> bool:
+        """Return True if last payment data is present."""
+        return self.last_payment is not None
+
+    def get_counter(self, counter_id: str) -> Counter | None:
+        """Return a counter by its ID, or None."""
+        for counter in self.counters:
+            if counter.counter_id == counter_id:
+                return counter
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class EntityRow:
+    """Precomputed state of a single entity for the current refresh."""
+
+    available: bool
+    value: Any = None
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+
+
+UNAVAILABLE_ROW: Final = EntityRow(available=False)
+
+
+def parse_account_info(data: Mapping[str, Any] | None) -> AccountInfo:
+    """Parse account info payload."""
+    if not data:
+        return AccountInfo()
+    return AccountInfo(
+        address=to_str(data.get("address")),
+        phone=to_str(data.get("phone")),
+        number_persons=to_int(data.get("numberPersons")),
+        total_area=to_float(data.get("totalArea")),
+        living_area=to_float(data.get("livingArea")),
+        document=to_str(data.get("document")),
+        tenant_category=to_str(data.get("tenantCategory")),
+        season_ratio=to_float(data.get("seasonRatio")),
+    )
+
+
+def parse_balance(data: Mapping[str, Any] | None) -> Balance | None:
+    """Parse balance payload, return None if it is empty."""
+    if not data:
+        return None
+    return Balance(
+        sum_to_pay=to_float(data.get("sumToPay")),
+        sum_to_pay_raw=to_float(data.get("sumToPayRaw")),
+        sum_without_checkbox=to_float(data.get("sumWithoutCheckbox")),
+        sum_with_checkbox=to_float(data.get("sumWithCheckbox")),
+        debt=to_float(data.get("debt")),
+        debt_abs=to_float(data.get("debtAbs")),
+        penalty=to_float(data.get("peniDebt")),
+        penalty_forecast=to_float(data.get("peniForecast")),
+        closed_month=to_date(data.get("closedMonth"), FORMAT_DATE_SHORT_YEAR),
+        advance_total=to_float(data.get("avansTotal")),
+        advance_type=to_str(data.get("avansType")),
+        advance_main=to_float(data.get("avansMain")),
+        recalculation=to_float(data.get("recalc")),
+        common_needs=to_float(data.get("odn")),
+        losses=to_float(data.get("losses")),
+        other_services_debt=to_float(data.get("otherServicesDebt")),
+    )
+
+
+def _parse_tariff_reading(
+    data: Mapping[str, Any], consumption: Any = None
+) -> TariffReading:
+    """Parse a single tariff reading payload."""
+    date_str = to_str(data.get("date"))
+    return TariffReading(
+        name=to_str(data.get("name")),
+        value=to_float(data.get("value")),
+        reading_date=to_date(date_str, FORMAT_DATE_SHORT_YEAR),
+        reading_date_str=date_str,
+        consumption=to_float(consumption),
+    )
+
+
+def parse_readings_history(
+    data: list[Mapping[str, Any]] | None,
+) -> tuple[ReadingsPeriod, ...]:
+    """Parse counter readings payload into periods, oldest first.
+
+    Periods without a valid date are skipped; for a repeated date the first
+    period returned by the API is kept.
+    """
+    periods: dict[date, ReadingsPeriod] = {}
+    for item in data or []:
+        readings = tuple(
+            _parse_tariff_reading(reading, reading.get("consumption"))
+            for reading in item.get("readings") or []
+        )
+        if not readings or (reading_date := readings[0].reading_date) is None:
+            continue
+        periods.setdefault(reading_date, ReadingsPeriod(reading_date, readings))
+    return tuple(periods[key] for key in sorted(periods))
+
+
+def parse_counter(
+    data: Mapping[str, Any],
+    place: str | None = None,
+    consumption: list[Mapping[str, Any]] | None = None,
+    history: list[Mapping[str, Any]] | None = None,
+) -> Counter | None:
+    """Parse counter payload merged with its consumption readings.
+
+    ``history`` is the full counter readings payload. Return None if the
+    counter has no ID.
+    """
+    counter_id = to_str(data.get("counterId"))
+    if not counter_id:
+        return None
+
+    consumption = consumption or []
+    readings: list[TariffReading] = []
+    for index, reading in enumerate(data.get("lastReadings") or []):
+        readings.append(
+            _parse_tariff_reading(
+                reading,
+                (
+                    consumption[index].get("consumption")
+                    if index < len(consumption)
+                    else None
+                ),
+            )
+        )
+
+    return Counter(
+        counter_id=counter_id,
+        row_id=to_str(data.get("rowId")),
+        installation_type=to_str(data.get("installationType")),
+        tariff=to_int(data.get("tariff")) or 0,
+        checking_date=to_str(data.get("checkingDate")),
+        place=place or None,
+        readings=tuple(readings),
+        history=parse_readings_history(history),
+    )
+
+
+def parse_counter_places(info: Mapping[str, Any] | None) -> dict[str, str]:
+    """Return installation places by counter ID from account info payload."""
+    if not info:
+        return {}
+    return {
+        ci["number"]: ci.get("place") or ""
+        for ci in info.get("countersInfo", [])
+        if ci.get("number")
+    }
+
+
+def parse_last_payment(items: list[Mapping[str, Any]]) -> Payment | None:
+    """Return the first payment from history items, or None."""
+    for item in items:
+        if item.get("type") == 1:
+            return Payment(
+                amount=to_float(item.get("amount")),
+                payment_date=to_date(item.get("date"), FORMAT_DATE_SHORT_YEAR),
+            )
+    return None
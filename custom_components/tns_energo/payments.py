@@ -0,0 +1,251 @@
+"""Local ledger of the TNS-Energo payment history."""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    FORMAT_DATE_SHORT_YEAR,
+    LEDGER_AVERAGE_MONTHS,
+    LEDGER_SAVE_DELAY,
+    LEDGER_STORAGE_KEY,
+    LEDGER_STORAGE_VERSION,
+)
+from .helpers import to_date, to_float
+from .models import Payment, PaymentSummary, parse_last_payment
+
+HISTORY_TYPE_PAYMENT = 1
+HISTORY_TYPE_ACCRUAL = 2
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the ledger storage of a config entry."""
+    return Store(
+        hass, LEDGER_STORAGE_VERSION, LEDGER_STORAGE_KEY.format(entry_id=entry_id)
+    )
+
+
+async def async_remove_payment_ledger(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the ledger storage of a removed config entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+def iter_months(start: date, end: date) -> Iterator[date]:
+    """Yield the first day of every month from start to end, newest first."""
+    index = end.year * 12 + end.month - 1
+    first = start.year * 12 + start.month - 1
+    while index >= first:
+        yield date(index // 12, index % 12 + 1, 1)
+        index -= 1
+
+
+@dataclass(slots=True)
+class _Totals:
+    """Running totals of payments and accruals."""
+
+    paid: float = 0.0
+    payments: int = 0
+    billed: float = 0.0
+    bills: int = 0
+
+    def add(self, other: _Totals, sign: int = 1) -> None:
+        """Add or, with a negative sign, subtract other totals."""
+        self.paid += sign * other.paid
+        self.payments += sign * other.payments
+        self.billed += sign * other.billed
+        self.bills += sign * other.bills
+
+
+@dataclass(slots=True)
+class _AccountLedger:
+    """History of a single account with its indexes and aggregates."""
+
+    months: dict[str, list[Mapping[str, Any]]]
+    closed: set[str]
+    # Sorted months and payments by date, for newest-first and range lookups
+    month_index: list[str]
+    payment_index: list[tuple[date, float]]
+    month_payments: dict[str, list[tuple[date, float]]]
+    month_totals: dict[str, _Totals]
+    year_totals: dict[int, _Totals]
+
+
+def _parse_month(
+    items: list[Mapping[str, Any]],
+) -> tuple[list[tuple[date, float]], _Totals]:
+    """Return the dated payments and the totals of a history month."""
+    payments: list[tuple[date, float]] = []
+    totals = _Totals()
+    for item in items:
+        amount = to_float(item.get("amount")) or 0.0
+        if item.get("type") == HISTORY_TYPE_PAYMENT:
+            totals.paid += amount
+            totals.payments += 1
+            if item_date := to_date(item.get("date"), FORMAT_DATE_SHORT_YEAR):
+                payments.append((item_date, amount))
+        elif item.get("type") == HISTORY_TYPE_ACCRUAL:
+            totals.billed += amount
+            totals.bills += 1
+    return payments, totals
+
+
+class PaymentLedger:
+    """History items of each account by month.
+
+    Months of a closed billing period never change, so once stored they are
+    not requested again; open months are replaced on every sync. Storing a
+    month updates the payment date index and the yearly totals incrementally.
+    Changes are saved with a delay, so polling an unchanged open month does
+    not rewrite the storage.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the ledger."""
+        self.hass = hass
+        self._accounts: dict[str, _AccountLedger] = {}
+        self._store = _get_store(hass, entry_id)
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the ledger from storage."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for account_number, months in data.get("accounts", {}).items():
+            for month, month_data in months.items():
+                self.set_month(
+                    account_number, month, month_data["items"], month_data["closed"]
+                )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the ledger to store."""
+        self._save_pending = False
+        return {
+            "accounts": {
+                account_number: {
+                    month: {"items": items, "closed": month in ledger.closed}
+                    for month, items in ledger.months.items()
+                }
+                for account_number, ledger in self._accounts.items()
+            }
+        }
+
+    async def async_save(self) -> None:
+        """Persist the ledger."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_delay_save(self) -> None:
+        """Schedule saving the ledger."""
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, LEDGER_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Persist a scheduled save now, if any."""
+        if self._save_pending:
+            await self.async_save()
+
+    def _get_account(self, account_number: str) -> _AccountLedger:
+        """Return the ledger of an account, creating an empty one."""
+        if (ledger := self._accounts.get(account_number)) is None:
+            ledger = self._accounts[account_number] = _AccountLedger(
+                {}, set(), [], [], {}, {}, {}
+            )
+        return ledger
+
+    def is_closed(self, account_number: str, month: str) -> bool:
+        """Return True if a closed month is stored and need not be fetched."""
+        ledger = self._accounts.get(account_number)
+        return ledger is not None and month in ledger.closed
+
+    def set_month(
+        self,
+        account_number: str,
+        month: str,
+        items: list[Mapping[str, Any]],
+        closed: bool,
+    ) -> bool:
+        """Store the history items of a month and update the aggregates.
+
+        Return False if the month is already stored with the same items.
+        """
+        ledger = self._get_account(account_number)
+        if ledger.months.get(month) == items and (month in ledger.closed) == closed:
+            return False
+        year = int(month[:4])
+        year_totals = ledger.year_totals.setdefault(year, _Totals())
+
+        if month in ledger.months:
+            index = ledger.payment_index
+            for payment in ledger.month_payments[month]:
+                del index[bisect.bisect_left(index, payment)]
+            year_totals.add(ledger.month_totals[month], -1)
+        else:
+            bisect.insort(ledger.month_index, month)
+
+        payments, totals = _parse_month(items)
+        for payment in payments:
+            bisect.insort(ledger.payment_index, payment)
+        year_totals.add(totals)
+        ledger.months[month] = items
+        ledger.month_payments[month] = payments
+        ledger.month_totals[month] = totals
+        if closed:
+            ledger.closed.add(month)
+        else:
+            ledger.closed.discard(month)
+        return True
+
+    def get_last_payment(self, account_number: str) -> Payment | None:
+        """Return the latest payment of an account, or None."""
+        if (ledger := self._accounts.get(account_number)) is None:
+            return None
+        for month in reversed(ledger.month_index):
+            if (payment := parse_last_payment(ledger.months[month])) is not None:
+                return payment
+        return None
+
+    def get_summary(self, account_number: str, year: int) -> PaymentSummary:
+        """Return the payment aggregates of an account for a year.
+
+        The average monthly bill covers the last months with accruals.
+        """
+        if (ledger := self._accounts.get(account_number)) is None:
+            return PaymentSummary(year=year)
+        totals = ledger.year_totals.get(year, _Totals())
+
+        billed: list[float] = []
+        for month in reversed(ledger.month_index):
+            if len(billed) == LEDGER_AVERAGE_MONTHS:
+                break
+            if (month_totals := ledger.month_totals[month]).bills:
+                billed.append(month_totals.billed)
+
+        return PaymentSummary(
+            year=year,
+            paid=round(totals.paid, 2),
+            payment_count=totals.payments,
+            average_monthly_bill=(
+                round(sum(billed) / len(billed), 2) if billed else None
+            ),
+        )
+
+    def get_payments(
+        self, account_number: str, start: date, end: date
+    ) -> list[Payment]:
+        """Return the payments of an account dated from start to end inclusive."""
+        if (ledger := self._accounts.get(account_number)) is None:
+            return []
+        index = ledger.payment_index
+        lo = bisect.bisect_left(index, (start,))
+        hi = bisect.bisect_left(index, (date.fromordinal(end.toordinal() + 1),))
+        return [
+            Payment(amount=amount, payment_date=payment_date)
+            for payment_date, amount in index[lo:hi]
+        ]
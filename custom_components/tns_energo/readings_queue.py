@@ -0,0 +1,347 @@
+"""Persistent queue of meter readings submissions."""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from aiotnse.exceptions import TNSEApiError
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_BALANCE,
+    ATTR_ERROR,
+    ATTR_QUEUED,
+    ATTR_READINGS,
+    DOMAIN,
+    QUEUE_CHECK_INTERVAL,
+    QUEUE_RETRY_DELAY,
+    QUEUE_RETRY_MAX_DELAY,
+    QUEUE_SENT_RETENTION,
+    QUEUE_STORAGE_KEY,
+    QUEUE_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import TNSECoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# aiotnse reports the HTTP status of failed requests as "(<request> -> <status>)"
+_SERVER_ERROR_RE = re.compile(r"-> 5\d\d\)")
+
+
+def readings_key(account_number: str, row_id: str | None, readings: list[str]) -> str:
+    """Return the idempotency key of a readings submission.
+
+    The key includes the current month, so the same readings of the next
+    billing period, e.g. without any consumption, are a new submission.
+    """
+    month = dt_util.now().strftime("%Y-%m")
+    return f"{account_number}:{row_id}:{month}:{','.join(readings)}"
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True if a failed submission may succeed when retried.
+
+    Timeouts, connection errors and server (5xx) responses are transient,
+    readings rejected by the API are not.
+    """
+    error: BaseException | None = exc
+    while error is not None:
+        if isinstance(error, (TimeoutError, aiohttp.ClientError)):
+            return True
+        if isinstance(error, TNSEApiError) and _SERVER_ERROR_RE.search(str(error)):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the queue storage of a config entry."""
+    return Store(
+        hass, QUEUE_STORAGE_VERSION, QUEUE_STORAGE_KEY.format(entry_id=entry_id)
+    )
+
+
+async def async_remove_readings_queue(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the queue storage of a removed config entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+@dataclass(slots=True)
+class QueuedReadings:
+    """A readings submission waiting to be retried."""
+
+    key: str
+    device_id: str | None
+    account_number: str
+    counter_id: str
+    row_id: str | None
+    readings: list[str]
+    created: datetime
+    deadline: datetime
+    next_attempt: datetime
+    attempts: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        return {
+            "key": self.key,
+            "device_id": self.device_id,
+            "account_number": self.account_number,
+            "counter_id": self.counter_id,
+            "row_id": self.row_id,
+            "readings": self.readings,
+            "created": self.created.isoformat(),
+            "deadline": self.deadline.isoformat(),
+            "next_attempt": self.next_attempt.isoformat(),
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> QueuedReadings:
+        """Restore a queued submission from storage."""
+        return cls(
+            key=data["key"],
+            device_id=data.get("device_id"),
+            account_number=data["account_number"],
+            counter_id=data["counter_id"],
+            row_id=data.get("row_id"),
+            readings=list(data["readings"]),
+            created=datetime.fromisoformat(data["created"]),
+            deadline=datetime.fromisoformat(data["deadline"]),
+            next_attempt=datetime.fromisoformat(data["next_attempt"]),
+            attempts=data.get("attempts", 0),
+        )
+
+
+class ReadingsQueue:
+    """Retry failed readings submissions with backoff until a deadline.
+
+    Only transient failures are retried, a rejected submission is dropped.
+    Every submission is identified by its account, counter row and readings;
+    a key that is queued or was sent recently is never submitted again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TNSECoordinator,
+        entry_id: str,
+        deadline: timedelta,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.deadline = deadline
+        self.items: dict[str, QueuedReadings] = {}
+        self._sent: dict[str, datetime] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._processing = False
+        self._store = _get_store(hass, entry_id)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if failed submissions are queued."""
+        return self.deadline > timedelta(0)
+
+    async def async_load(self) -> None:
+        """Load queued submissions from storage."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.items = {
+            item.key: item
+            for item in map(QueuedReadings.from_dict, data.get("items", []))
+        }
+        self._sent = {
+            key: datetime.fromisoformat(sent)
+            for key, sent in data.get("sent", {}).items()
+        }
+
+    async def _async_save(self) -> None:
+        """Persist the queue and notify listeners."""
+        cutoff = dt_util.utcnow() - QUEUE_SENT_RETENTION
+        self._sent = {key: sent for key, sent in self._sent.items() if sent > cutoff}
+        await self._store.async_save(
+            {
+                "items": [item.as_dict() for item in self.items.values()],
+                "sent": {key: sent.isoformat() for key, sent in self._sent.items()},
+            }
+        )
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for queue changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove_listener
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Retry due submissions periodically."""
+        return async_track_time_interval(
+            self.hass,
+            self.async_process,
+            QUEUE_CHECK_INTERVAL,
+            name=f"{DOMAIN} readings queue",
+        )
+
+    def is_queued(self, key: str) -> bool:
+        """Return True if the submission is waiting in the queue."""
+        return key in self.items
+
+    def is_sent(self, key: str) -> bool:
+        """Return True if the submission was sent recently."""
+        return key in self._sent
+
+    def get_account_items(self, account_number: str) -> list[QueuedReadings]:
+        """Return queued submissions of an account, oldest first."""
+        return sorted(
+            (
+                item
+                for item in self.items.values()
+                if item.account_number == account_number
+            ),
+            key=lambda item: item.created,
+        )
+
+    async def async_enqueue(
+        self,
+        device_id: str | None,
+        account_number: str,
+        counter_id: str,
+        row_id: str | None,
+        readings: list[str],
+    ) -> QueuedReadings:
+        """Queue a failed submission, or return the already queued one."""
+        key = readings_key(account_number, row_id, readings)
+        if (item := self.items.get(key)) is not None:
+            return item
+        now = dt_util.utcnow()
+        item = self.items[key] = QueuedReadings(
+            key=key,
+            device_id=device_id,
+            account_number=account_number,
+            counter_id=counter_id,
+            row_id=row_id,
+            readings=readings,
+            created=now,
+            deadline=now + self.deadline,
+            next_attempt=now + QUEUE_RETRY_DELAY,
+        )
+        _LOGGER.info(
+            "Account %s: readings %s of counter %s queued until %s",
+            account_number,
+            readings,
+            counter_id,
+            item.deadline,
+        )
+        await self._async_save()
+        return item
+
+    async def async_mark_sent(self, key: str) -> None:
+        """Record a successful submission and drop it from the queue."""
+        self.items.pop(key, None)
+        self._sent[key] = dt_util.utcnow()
+        await self._async_save()
+
+    async def async_process(self, now: datetime | None = None) -> None:
+        """Send due submissions, dropping those past their deadline."""
+        if self._processing or not self.items:
+            return
+        self._processing = True
+        try:
+            await self._async_process_due(dt_util.utcnow())
+        finally:
+            self._processing = False
+
+    async def _async_process_due(self, now: datetime) -> None:
+        """Send due submissions one by one, oldest first."""
+        changed = False
+        for item in sorted(self.items.values(), key=lambda item: item.created):
+            if item.deadline <= now:
+                _LOGGER.warning(
+                    "Account %s: readings %s of counter %s expired in queue",
+                    item.account_number,
+                    item.readings,
+                    item.counter_id,
+                )
+                self.items.pop(item.key, None)
+                changed = True
+                self._fire(item, "failed", {ATTR_ERROR: "Queue deadline expired"})
+                continue
+            if item.next_attempt > now:
+                continue
+
+            try:
+                result = await self.coordinator.async_send_readings(
+                    item.account_number, item.row_id, item.readings
+                )
+            except ConfigEntryAuthFailed as exc:
+                _LOGGER.warning("Readings queue paused: %s", exc)
+                break
+            except UpdateFailed as exc:
+                if not is_transient_error(exc):
+                    _LOGGER.warning(
+                        "Account %s: queued readings %s of counter %s rejected: %s",
+                        item.account_number,
+                        item.readings,
+                        item.counter_id,
+                        exc,
+                    )
+                    self.items.pop(item.key, None)
+                    changed = True
+                    self._fire(item, "failed", {ATTR_ERROR: str(exc)})
+                    continue
+                item.attempts += 1
+                item.next_attempt = now + min(
+                    QUEUE_RETRY_DELAY * 2**item.attempts, QUEUE_RETRY_MAX_DELAY
+                )
+                changed = True
+                _LOGGER.debug(
+                    "Account %s: queued readings attempt %d failed: %s",
+                    item.account_number,
+                    item.attempts,
+                    exc,
+                )
+                continue
+
+            self.items.pop(item.key, None)
+            self._sent[item.key] = dt_util.utcnow()
+            changed = True
+            self._fire(item, "completed", {ATTR_BALANCE: result})
+
+        if changed:
+            await self._async_save()
+
+    @callback
+    def _fire(
+        self, item: QueuedReadings, outcome: str, data: dict[str, Any]
+    ) -> None:
+        """Fire the send_readings event for a queued submission."""
+        self.hass.bus.async_fire(
+            event_type=f"{DOMAIN}_send_readings_{outcome}",
+            event_data={
+                ATTR_DEVICE_ID: item.device_id,
+                ATTR_READINGS: item.readings,
+                ATTR_QUEUED: True,
+                **data,
+            },
+        )
@@ -0,0 +1,229 @@
+"""Columnar on-disk store of the TNS-Energo counter readings history."""
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import shutil
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .models import Counter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Column name and array type code of each file of a series
+COLUMNS = (("days", "i"), ("values", "d"), ("consumption", "d"))
+
+
+def _get_directory(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the readings store directory of a config entry."""
+    return Path(hass.config.path(DOMAIN, "readings", entry_id))
+
+
+async def async_remove_readings_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the readings store of a removed config entry."""
+    await hass.async_add_executor_job(
+        partial(shutil.rmtree, _get_directory(hass, entry_id), ignore_errors=True)
+    )
+
+
+@dataclass(slots=True)
+class ReadingsSeries:
+    """Readings of a counter tariff zone as columns ordered by day.
+
+    Days are ordinals of the reading dates; a missing value or consumption
+    is stored as NaN.
+    """
+
+    days: array = field(default_factory=lambda: array("i"))
+    values: array = field(default_factory=lambda: array("d"))
+    consumption: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        """Return the number of stored periods."""
+        return len(self.days)
+
+    @property
+    def last_day(self) -> int | None:
+        """Return the ordinal of the latest reading date, or None."""
+        return self.days[-1] if self.days else None
+
+    def get_slice(self, start: date | None, end: date | None) -> slice:
+        """Return the slice of the periods from start to end inclusive."""
+        days = self.days
+        lo = 0 if start is None else bisect.bisect_left(days, start.toordinal())
+        hi = len(days) if end is None else bisect.bisect_right(days, end.toordinal())
+        return slice(lo, hi)
+
+    def get_consumption(self, start: date | None, end: date | None) -> float:
+        """Return the total consumption of the periods from start to end."""
+        return math.fsum(
+            value
+            for value in self.consumption[self.get_slice(start, end)]
+            if not math.isnan(value)
+        )
+
+
+def _nan(value: float | None) -> float:
+    """Return the value, or NaN if it is None."""
+    return math.nan if value is None else value
+
+
+def _optional(value: float) -> float | None:
+    """Return the value, or None if it is NaN."""
+    return None if math.isnan(value) else value
+
+
+class ReadingsStore:
+    """Readings history of the counters of a config entry.
+
+    Every tariff zone has one file per column, named after the counter and
+    the zone, holding the raw array items. Periods newer than the stored
+    ones are appended to the files; stored periods are never rewritten.
+    ``version`` changes whenever periods are loaded or appended.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.directory = _get_directory(hass, entry_id)
+        self.version = 0
+        self._series: dict[tuple[str, int], ReadingsSeries] = {}
+
+    def _get_path(self, counter_id: str, index: int, column: str) -> Path:
+        """Return the file of a series column."""
+        return self.directory / f"{counter_id}.t{index + 1}.{column}"
+
+    async def async_load(self) -> None:
+        """Load all stored series."""
+        self._series = await self.hass.async_add_executor_job(self._load)
+        self.version += 1
+
+    def _load(self) -> dict[tuple[str, int], ReadingsSeries]:
+        """Read all series from disk. Run in executor.
+
+        A series whose columns differ in length after an interrupted append
+        is truncated to its complete periods.
+        """
+        series: dict[tuple[str, int], ReadingsSeries] = {}
+        if not self.directory.is_dir():
+            return series
+        for days_path in self.directory.glob("*.days"):
+            counter_id, zone = days_path.stem.rsplit(".", 1)
+            index = int(zone[1:]) - 1
+            paths = [
+                self._get_path(counter_id, index, column) for column, _ in COLUMNS
+            ]
+            columns = [array(typecode) for _, typecode in COLUMNS]
+            for path, items in zip(paths, columns, strict=True):
+                if path.is_file():
+                    with path.open("rb") as file:
+                        items.fromfile(file, path.stat().st_size // items.itemsize)
+
+            length = min(len(items) for items in columns)
+            for path, items in zip(paths, columns, strict=True):
+                del items[length:]
+                size = length * items.itemsize
+                if path.is_file() and path.stat().st_size != size:
+                    _LOGGER.warning(
+                        "Truncating incomplete readings file %s", path.name
+                    )
+                    with path.open("r+b") as file:
+                        file.truncate(size)
+            series[(counter_id, index)] = ReadingsSeries(*columns)
+        return series
+
+    def get_series(self, counter_id: str, index: int) -> ReadingsSeries | None:
+        """Return the series of a counter tariff zone, or None."""
+        return self._series.get((counter_id, index))
+
+    async def async_update(
+        self, counters: Iterable[Counter]
+    ) -> dict[tuple[str, int], ReadingsSeries]:
+        """Append the periods newer than the stored ones and return them."""
+        appends: dict[tuple[str, int], ReadingsSeries] = {}
+        for counter in counters:
+            for period in counter.history:
+                day = period.reading_date.toordinal()
+                for index, reading in enumerate(period.readings):
+                    key = (counter.counter_id, index)
+                    stored = self._series.get(key)
+                    last_day = stored.last_day if stored is not None else None
+                    if last_day is not None and day <= last_day:
+                        continue
+                    new = appends.setdefault(key, ReadingsSeries())
+                    new.days.append(day)
+                    new.values.append(_nan(reading.value))
+                    new.consumption.append(_nan(reading.consumption))
+        if not appends:
+            return appends
+
+        await self.hass.async_add_executor_job(self._append, appends)
+        for key, new in appends.items():
+            series = self._series.setdefault(key, ReadingsSeries())
+            series.days.extend(new.days)
+            series.values.extend(new.values)
+            series.consumption.extend(new.consumption)
+        self.version += 1
+        return appends
+
+    def _append(self, appends: dict[tuple[str, int], ReadingsSeries]) -> None:
+        """Append new periods to the column files. Run in executor.
+
+        If any write fails, all column files are truncated back to their
+        size before the append, so the stored series stay aligned.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sizes = {
+            path: path.stat().st_size if path.is_file() else 0
+            for counter_id, index in appends
+            for path in (
+                self._get_path(counter_id, index, column) for column, _ in COLUMNS
+            )
+        }
+        try:
+            for (counter_id, index), new in appends.items():
+                for column, _ in COLUMNS:
+                    path = self._get_path(counter_id, index, column)
+                    with path.open("ab") as file:
+                        getattr(new, column).tofile(file)
+        except OSError:
+            for path, size in sizes.items():
+                try:
+                    if path.is_file() and path.stat().st_size != size:
+                        with path.open("r+b") as file:
+                            file.truncate(size)
+                except OSError as exc:
+                    _LOGGER.warning(
+                        "Failed to roll back readings file %s: %s", path.name, exc
+                    )
+            raise
+
+    def get_readings(
+        self,
+        counter_id: str,
+        index: int,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[tuple[date, float | None, float | None]]:
+        """Return the date, value and consumption of periods in a range."""
+        if (series := self.get_series(counter_id, index)) is None:
+            return []
+        part = series.get_slice(start, end)
+        return [
+            (date.fromordinal(day), _optional(value), _optional(consumption))
+            for day, value, consumption in zip(
+                series.days[part],
+                series.values[part],
+                series.consumption[part],
+                strict=True,
+            )
+        ]
@@ -1,9 +1,10 @@
 """TNS-Energo Sensor definitions."""
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
 from typing import Any, Final
 
 from homeassistant.components.sensor import (
@@ -12,25 +13,125 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfEnergy
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfInformation
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import TNSEConfigEntry
-from .const import FORMAT_DATE_SHORT_YEAR
-from .coordinator import TNSEAccountData, TNSECoordinator
-from .entity import TNSEBaseCoordinatorEntity, TNSECounterEntity
-from .helpers import to_date, to_float, to_str
+from .analytics import ConsumptionStats
+from .bills import BillCache, BillEntry, async_get_bill_cache
+from .coordinator import TNSECoordinator
+from .cost import CostEstimate
+from .entity import TNSEBaseCoordinatorEntity, TNSECounterEntity, TNSERowEntity
+from .models import (
+    UNAVAILABLE_ROW,
+    Balance,
+    Counter,
+    EntityRow,
+    Payment,
+    PaymentSummary,
+    TNSEAccountData,
+)
+from .readings_queue import QueuedReadings
 
 PARALLEL_UPDATES: Final = 1
 
 
+# ---------------------------------------------------------------------------
+# Attributes excluded from recorder history
+# ---------------------------------------------------------------------------
+
+# Static account/meter details and values already recorded by other sensors.
+# They are also dropped from the state when the lean attribute profile is on.
+ACCOUNT_UNRECORDED_ATTRIBUTES: Final = frozenset(
+    {
+        "Адрес",
+        "Телефон",
+        "Количество прописанных лиц",
+        "Общая площадь",
+        "Жилая площадь",
+        "Документ на собственность",
+        "Категория жильцов",
+        "Коэффициент сезонности",
+        "Доступность ИСУЭ",
+        "Начальный год",
+        "Сумма без округления",
+        "Абсолютная задолженность",
+        "Тип аванса",
+    }
+)
+COUNTER_UNRECORDED_ATTRIBUTES: Final = frozenset(
+    {
+        "Тип установки",
+        "Место установки",
+        "Тарифность",
+        "Дата поверки",
+        "Название тарифа",
+        "Дата показаний",
+    }
+)
+
+
 # ---------------------------------------------------------------------------
 # Account-level sensor descriptions
 # ---------------------------------------------------------------------------
 
+_NO_BALANCE: Final = Balance()
+_NO_PAYMENT: Final = Payment()
+_NO_PAYMENT_SUMMARY: Final = PaymentSummary(year=0)
+
+
+def _balance(account: TNSEAccountData) -> Balance:
+    """Return the account balance, or an empty one if it is missing."""
+    return account.balance or _NO_BALANCE
+
+
+def _last_payment(account: TNSEAccountData) -> Payment:
+    """Return the last payment, or an empty one if it is missing."""
+    return account.last_payment or _NO_PAYMENT
+
+
+def _payment_summary(account: TNSEAccountData) -> PaymentSummary:
+    """Return the payment summary, or an empty one if it is missing."""
+    return account.payment_summary or _NO_PAYMENT_SUMMARY
+
+
+def _projected_month_cost(
+    account: TNSEAccountData, coordinator: TNSECoordinator
+) -> float | None:
+    """Return the expected bill of the current billing period.
+
+    The projected consumption of the account counters is priced at the
+    effective rate of the last year: the average monthly bill divided by
+    the average monthly consumption.
+    """
+    average_bill = _payment_summary(account).average_monthly_bill
+    stats = [
+        coordinator.consumption_stats.get(counter.counter_id)
+        for counter in account.counters
+    ]
+    if average_bill is None or not stats or None in stats:
+        return None
+    average = sum(item.average_12_months or 0.0 for item in stats)
+    projected = [item.projected_consumption for item in stats]
+    if not average or None in projected:
+        return None
+    return round(sum(projected) * average_bill / average, 2)
+
+
+def _month_cost_estimate(
+    account: TNSEAccountData, coordinator: TNSECoordinator
+) -> float | None:
+    """Return the estimated cost of the latest month readings of all counters."""
+    estimates = [
+        coordinator.cost_engine.get_estimate(counter) for counter in account.counters
+    ]
+    if not estimates or None in estimates:
+        return None
+    return round(sum(estimate.cost for estimate in estimates if estimate), 2)
+
 
 @dataclass(frozen=True, kw_only=True)
 class TNSESensorEntityDescription(SensorEntityDescription):
@@ -39,6 +140,8 @@ class TNSESensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[TNSEAccountData, TNSECoordinator], StateType | datetime | date]
     attr_fn: Callable[[TNSEAccountData], dict[str, Any]] = lambda account: {}
     available_fn: Callable[[TNSEAccountData], bool] = lambda account: True
+    # The value depends on the refresh, not only on the account data
+    always_render: bool = False
 
 
 ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
@@ -48,14 +151,14 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         translation_key="account",
         entity_category=EntityCategory.DIAGNOSTIC,
         attr_fn=lambda account: {
-            "Адрес": to_str(account.info.get("address")),
-            "Телефон": to_str(account.info.get("phone")),
-            "Количество прописанных лиц": account.info.get("numberPersons"),
-            "Общая площадь": account.info.get("totalArea"),
-            "Жилая площадь": account.info.get("livingArea"),
-            "Документ на собственность": to_str(account.info.get("document")),
-            "Категория жильцов": to_str(account.info.get("tenantCategory")),
-            "Коэффициент сезонности": account.info.get("seasonRatio"),
+            "Адрес": account.info.address,
+            "Телефон": account.info.phone,
+            "Количество прописанных лиц": account.info.number_persons,
+            "Общая площадь": account.info.total_area,
+            "Жилая площадь": account.info.living_area,
+            "Документ на собственность": account.info.document,
+            "Категория жильцов": account.info.tenant_category,
+            "Коэффициент сезонности": account.info.season_ratio,
             "Доступность ИСУЭ": account.isue_available,
             "Начальный год": account.initial_year,
         },
@@ -64,21 +167,19 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="cost",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.sum_to_pay,
+        value_fn=lambda account, coordinator: _balance(account).sum_to_pay,
         available_fn=lambda account: account.has_balance,
         translation_key="cost",
         attr_fn=lambda account: {
-            "Сумма без округления": account.balance.get("sumToPayRaw"),
-            "Сумма без доп. начислений": account.balance.get("sumWithoutCheckbox"),
-            "Сумма с доп. начислениями": account.balance.get("sumWithCheckbox"),
+            "Сумма без округления": _balance(account).sum_to_pay_raw,
+            "Сумма без доп. начислений": _balance(account).sum_without_checkbox,
+            "Сумма с доп. начислениями": _balance(account).sum_with_checkbox,
         },
     ),
     TNSESensorEntityDescription(
         key="cost_date",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda account, coordinator: to_date(
-            account.closed_month, FORMAT_DATE_SHORT_YEAR
-        ),
+        value_fn=lambda account, coordinator: _balance(account).closed_month,
         available_fn=lambda account: account.has_balance,
         translation_key="cost_date",
     ),
@@ -86,17 +187,18 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="debt",
         device_class=SensorDeviceClass.MONETARY,
         native_unit_of_measurement="RUB",
-        value_fn=lambda account, coordinator: account.debt,
+        value_fn=lambda account, coordinator: _balance(account).debt,
         available_fn=lambda account: account.has_balance,
         translation_key="debt",
         attr_fn=lambda account: {
-            "Абсолютная задолженность": account.balance.get("debtAbs"),
+            "Абсолютная задолженность": _balance(account).debt_abs,
         },
     ),
     TNSESensorEntityDescription(
         key="current_timestamp",
         device_class=SensorDeviceClass.TIMESTAMP,
         value_fn=lambda account, coordinator: coordinator.last_update_time,
+        always_render=True,
         entity_category=EntityCategory.DIAGNOSTIC,
         translation_key="current_timestamp",
     ),
@@ -104,7 +206,7 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="penalty",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("peniDebt"),
+        value_fn=lambda account, coordinator: _balance(account).penalty,
         available_fn=lambda account: account.has_balance,
         translation_key="penalty",
     ),
@@ -112,19 +214,19 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="advance_payment",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("avansTotal"),
+        value_fn=lambda account, coordinator: _balance(account).advance_total,
         available_fn=lambda account: account.has_balance,
         translation_key="advance_payment",
         attr_fn=lambda account: {
-            "Тип аванса": to_str(account.balance.get("avansType")),
-            "Основной аванс": account.balance.get("avansMain"),
+            "Тип аванса": _balance(account).advance_type,
+            "Основной аванс": _balance(account).advance_main,
         },
     ),
     TNSESensorEntityDescription(
         key="recalculation",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("recalc"),
+        value_fn=lambda account, coordinator: _balance(account).recalculation,
         available_fn=lambda account: account.has_balance,
         translation_key="recalculation",
     ),
@@ -132,7 +234,7 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="common_needs",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("odn"),
+        value_fn=lambda account, coordinator: _balance(account).common_needs,
         available_fn=lambda account: account.has_balance,
         translation_key="common_needs",
     ),
@@ -140,7 +242,7 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="penalty_forecast",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("peniForecast"),
+        value_fn=lambda account, coordinator: _balance(account).penalty_forecast,
         available_fn=lambda account: account.has_balance,
         translation_key="penalty_forecast",
     ),
@@ -148,7 +250,7 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="losses",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("losses"),
+        value_fn=lambda account, coordinator: _balance(account).losses,
         available_fn=lambda account: account.has_balance,
         translation_key="losses",
     ),
@@ -156,7 +258,7 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="other_services_debt",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.balance.get("otherServicesDebt"),
+        value_fn=lambda account, coordinator: _balance(account).other_services_debt,
         available_fn=lambda account: account.has_balance,
         translation_key="other_services_debt",
     ),
@@ -164,19 +266,60 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
         key="last_payment",
         native_unit_of_measurement="RUB",
         device_class=SensorDeviceClass.MONETARY,
-        value_fn=lambda account, coordinator: account.last_payment_amount,
+        value_fn=lambda account, coordinator: _last_payment(account).amount,
         available_fn=lambda account: account.has_last_payment,
         translation_key="last_payment",
     ),
     TNSESensorEntityDescription(
         key="last_payment_date",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda account, coordinator: to_date(
-            account.last_payment_date, FORMAT_DATE_SHORT_YEAR
-        ),
+        value_fn=lambda account, coordinator: _last_payment(account).payment_date,
         available_fn=lambda account: account.has_last_payment,
         translation_key="last_payment_date",
     ),
+    TNSESensorEntityDescription(
+        key="paid_this_year",
+        native_unit_of_measurement="RUB",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=lambda account, coordinator: _payment_summary(account).paid,
+        available_fn=lambda account: account.payment_summary is not None,
+        translation_key="paid_this_year",
+    ),
+    TNSESensorEntityDescription(
+        key="payments_this_year",
+        value_fn=lambda account, coordinator: (
+            _payment_summary(account).payment_count
+        ),
+        available_fn=lambda account: account.payment_summary is not None,
+        translation_key="payments_this_year",
+    ),
+    TNSESensorEntityDescription(
+        key="average_monthly_bill",
+        native_unit_of_measurement="RUB",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=lambda account, coordinator: (
+            _payment_summary(account).average_monthly_bill
+        ),
+        available_fn=lambda account: (
+            _payment_summary(account).average_monthly_bill is not None
+        ),
+        translation_key="average_monthly_bill",
+    ),
+    TNSESensorEntityDescription(
+        key="projected_month_cost",
+        native_unit_of_measurement="RUB",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=_projected_month_cost,
+        translation_key="projected_month_cost",
+    ),
+    TNSESensorEntityDescription(
+        key="month_cost_estimate",
+        native_unit_of_measurement="RUB",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=_month_cost_estimate,
+        available_fn=lambda account: bool(account.counters),
+        translation_key="month_cost_estimate",
+    ),
 )
 
 
@@ -189,52 +332,31 @@ ACCOUNT_SENSOR_TYPES: tuple[TNSESensorEntityDescription, ...] = (
 class TNSECounterSensorEntityDescription(SensorEntityDescription):
     """Describes TNS-Energo counter-level sensor entity."""
 
-    value_fn: Callable[
-        [TNSEAccountData, int, TNSECoordinator], StateType | datetime | date
-    ]
-    attr_fn: Callable[[TNSEAccountData, int], dict[str, Any]] = (
-        lambda account, counter_index: {}
-    )
-    available_fn: Callable[[TNSEAccountData, int], bool] = (
-        lambda account, counter_index: True
-    )
+    value_fn: Callable[[Counter], StateType | datetime | date]
+    attr_fn: Callable[[Counter], dict[str, Any]] = lambda counter: {}
+    available_fn: Callable[[Counter], bool] = lambda counter: True
 
 
 COUNTER_SENSOR_TYPES: tuple[TNSECounterSensorEntityDescription, ...] = (
     TNSECounterSensorEntityDescription(
         key="readings_date",
         device_class=SensorDeviceClass.DATE,
-        value_fn=lambda account, counter_index, coordinator: to_date(
-            r["date"]
-            if (r := account.get_counter_reading(counter_index, 0))
-            else None,
-            FORMAT_DATE_SHORT_YEAR,
-        ),
-        available_fn=lambda account, counter_index: bool(
-            account.get_counter_readings(counter_index)
-        ),
+        value_fn=lambda counter: counter.readings_date,
+        available_fn=lambda counter: bool(counter.readings),
         translation_key="readings_date",
     ),
     TNSECounterSensorEntityDescription(
         key="meter",
-        value_fn=lambda account, counter_index, coordinator: account.get_counter_id(
-            counter_index
-        ),
-        available_fn=lambda account, counter_index: (
-            account.get_counter(counter_index) is not None
-        ),
+        value_fn=lambda counter: counter.counter_id,
         translation_key="meter",
         entity_category=EntityCategory.DIAGNOSTIC,
-        attr_fn=lambda account, counter_index: {
-            "Тип установки": to_str(ct.get("installationType")),
-            "Место установки": account.get_counter_place(counter_index),
-            "Тарифность": ct.get("tariff"),
-            "Дата поверки": ct.get("checkingDate"),
-        }
-        if (ct := account.get_counter(counter_index))
-        else {},
+        attr_fn=lambda counter: {
+            "Тип установки": counter.installation_type,
+            "Место установки": counter.place,
+            "Тарифность": counter.tariff,
+            "Дата поверки": counter.checking_date,
+        },
     ),
-
 )
 
 
@@ -243,46 +365,279 @@ COUNTER_SENSOR_TYPES: tuple[TNSECounterSensorEntityDescription, ...] = (
 # ---------------------------------------------------------------------------
 
 
-def _counter_tariff_value(
-    account: TNSEAccountData, counter_index: int, reading_index: int
-) -> float | None:
+def _counter_tariff_value(counter: Counter, reading_index: int) -> float | None:
     """Return the tariff reading value."""
-    reading = account.get_counter_reading(counter_index, reading_index)
-    return to_float(reading.get("value")) if reading else None
+    reading = counter.get_reading(reading_index)
+    return reading.value if reading else None
 
 
-def _counter_tariff_available(
-    account: TNSEAccountData, counter_index: int, reading_index: int
-) -> bool:
+def _counter_tariff_available(counter: Counter, reading_index: int) -> bool:
     """Return True if the tariff reading exists."""
-    return account.get_counter_reading(counter_index, reading_index) is not None
+    return counter.get_reading(reading_index) is not None
 
 
 def _counter_tariff_attributes(
-    account: TNSEAccountData, counter_index: int, reading_index: int
+    counter: Counter, reading_index: int
 ) -> dict[str, Any]:
     """Return extra state attributes for a tariff reading."""
-    reading = account.get_counter_reading(counter_index, reading_index)
+    reading = counter.get_reading(reading_index)
     if not reading:
         return {}
     return {
-        "Название тарифа": reading.get("name"),
-        "Дата показаний": reading.get("date"),
+        "Название тарифа": reading.name,
+        "Дата показаний": reading.reading_date_str,
     }
 
 
 def _counter_consumption_value(
-    account: TNSEAccountData, counter_index: int, reading_index: int
+    counter: Counter, reading_index: int
 ) -> float | None:
     """Return consumption value for a counter tariff."""
-    return account.get_counter_consumption(counter_index, reading_index)
+    reading = counter.get_reading(reading_index)
+    return reading.consumption if reading else None
 
 
-def _counter_consumption_available(
-    account: TNSEAccountData, counter_index: int, reading_index: int
-) -> bool:
+def _counter_consumption_available(counter: Counter, reading_index: int) -> bool:
     """Return True if consumption data exists for a counter tariff."""
-    return account.get_counter_consumption(counter_index, reading_index) is not None
+    return _counter_consumption_value(counter, reading_index) is not None
+
+
+# ---------------------------------------------------------------------------
+# Counter readings history sensor descriptions
+# ---------------------------------------------------------------------------
+
+
+def _annual_consumption(
+    coordinator: TNSECoordinator, counter: Counter
+) -> float | None:
+    """Return the consumption of all tariff zones over the last year of history.
+
+    The year ends at the latest stored reading, so the value changes only
+    when new readings arrive.
+    """
+    total: float | None = None
+    for index in range(counter.tariff_count):
+        series = coordinator.readings_store.get_series(counter.counter_id, index)
+        if series is None or series.last_day is None:
+            continue
+        end = date.fromordinal(series.last_day)
+        consumption = series.get_consumption(end - timedelta(days=364), end)
+        total = (total or 0.0) + consumption
+    return None if total is None else round(total, 3)
+
+
+_NO_CONSUMPTION_STATS: Final = ConsumptionStats()
+
+
+def _consumption_stats(
+    coordinator: TNSECoordinator, counter: Counter
+) -> ConsumptionStats:
+    """Return the consumption statistics of a counter, or empty ones."""
+    return coordinator.consumption_stats.get(
+        counter.counter_id, _NO_CONSUMPTION_STATS
+    )
+
+
+def _cost_estimate_attributes(estimate: CostEstimate | None) -> dict[str, Any]:
+    """Return extra state attributes for a cost estimate."""
+    if estimate is None:
+        return {}
+    return {
+        "Месяц показаний": estimate.month,
+        "Потребление": estimate.consumption,
+    }
+
+
+@dataclass(frozen=True, kw_only=True)
+class TNSECounterHistorySensorEntityDescription(SensorEntityDescription):
+    """Describes TNS-Energo counter sensor entity backed by readings history."""
+
+    value_fn: Callable[[TNSECoordinator, Counter], StateType]
+    attr_fn: Callable[[TNSECoordinator, Counter], dict[str, Any]] = (
+        lambda coordinator, counter: {}
+    )
+
+
+COUNTER_HISTORY_SENSOR_TYPES: tuple[TNSECounterHistorySensorEntityDescription, ...] = (
+    TNSECounterHistorySensorEntityDescription(
+        key="annual_consumption",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=_annual_consumption,
+        translation_key="annual_consumption",
+    ),
+    TNSECounterHistorySensorEntityDescription(
+        key="average_consumption_3_months",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=lambda coordinator, counter: (
+            _consumption_stats(coordinator, counter).average_3_months
+        ),
+        translation_key="average_consumption_3_months",
+    ),
+    TNSECounterHistorySensorEntityDescription(
+        key="average_consumption_12_months",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=lambda coordinator, counter: (
+            _consumption_stats(coordinator, counter).average_12_months
+        ),
+        translation_key="average_consumption_12_months",
+    ),
+    TNSECounterHistorySensorEntityDescription(
+        key="consumption_year_over_year",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, counter: (
+            _consumption_stats(coordinator, counter).year_over_year
+        ),
+        translation_key="consumption_year_over_year",
+    ),
+    TNSECounterHistorySensorEntityDescription(
+        key="seasonal_consumption",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=lambda coordinator, counter: (
+            _consumption_stats(coordinator, counter).seasonal_baseline
+        ),
+        translation_key="seasonal_consumption",
+    ),
+    TNSECounterHistorySensorEntityDescription(
+        key="month_cost_estimate",
+        native_unit_of_measurement="RUB",
+        device_class=SensorDeviceClass.MONETARY,
+        value_fn=lambda coordinator, counter: (
+            estimate.cost
+            if (estimate := coordinator.cost_engine.get_estimate(counter))
+            else None
+        ),
+        attr_fn=lambda coordinator, counter: _cost_estimate_attributes(
+            coordinator.cost_engine.get_estimate(counter)
+        ),
+        translation_key="month_cost_estimate",
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Counter tariff sensor descriptions
+# ---------------------------------------------------------------------------
+
+MAX_TARIFF_COUNT: Final = 3
+
+TARIFF_READING: Final = "reading"
+TARIFF_CONSUMPTION: Final = "consumption"
+
+
+def _get_tariff_key(tariff_count: int, index: int, key: str) -> str:
+    """Format tariff key."""
+    return key if tariff_count == 1 else f"t{index + 1}_{key}"
+
+
+@lru_cache(maxsize=None)
+def _build_tariff_description(
+    tariff_count: int, index: int, kind: str
+) -> TNSECounterSensorEntityDescription:
+    """Build the description of a tariff reading or consumption sensor.
+
+    Cached, so counters with more than MAX_TARIFF_COUNT tariffs share their
+    descriptions too.
+    """
+    key = _get_tariff_key(tariff_count, index, kind)
+    if kind == TARIFF_READING:
+        return TNSECounterSensorEntityDescription(
+            key=key,
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL,
+            value_fn=partial(_counter_tariff_value, reading_index=index),
+            available_fn=partial(_counter_tariff_available, reading_index=index),
+            translation_key=key,
+            attr_fn=partial(_counter_tariff_attributes, reading_index=index),
+        )
+    return TNSECounterSensorEntityDescription(
+        key=key,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        value_fn=partial(_counter_consumption_value, reading_index=index),
+        available_fn=partial(_counter_consumption_available, reading_index=index),
+        translation_key=key,
+    )
+
+
+# Shared by all counters of all entries, keyed by (tariff_count, index, kind);
+# built at import and never changed
+TARIFF_SENSOR_TYPES: Final[
+    Mapping[tuple[int, int, str], TNSECounterSensorEntityDescription]
+] = {
+    (tariff_count, index, kind): _build_tariff_description(
+        tariff_count, index, kind
+    )
+    for tariff_count in range(1, MAX_TARIFF_COUNT + 1)
+    for index in range(tariff_count)
+    for kind in (TARIFF_READING, TARIFF_CONSUMPTION)
+}
+
+
+def get_tariff_description(
+    tariff_count: int, index: int, kind: str
+) -> TNSECounterSensorEntityDescription:
+    """Return the shared description of a tariff sensor."""
+    key = (tariff_count, index, kind)
+    if (description := TARIFF_SENSOR_TYPES.get(key)) is None:
+        description = _build_tariff_description(*key)
+    return description
+
+
+# ---------------------------------------------------------------------------
+# Readings queue sensor descriptions
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True, kw_only=True)
+class TNSEQueueSensorEntityDescription(SensorEntityDescription):
+    """Describes TNS-Energo readings queue sensor entity."""
+
+    value_fn: Callable[[list[QueuedReadings]], StateType | datetime]
+
+
+QUEUE_SENSOR_TYPES: tuple[TNSEQueueSensorEntityDescription, ...] = (
+    TNSEQueueSensorEntityDescription(
+        key="queued_readings",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=len,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        translation_key="queued_readings",
+    ),
+    TNSEQueueSensorEntityDescription(
+        key="oldest_queued_readings",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda items: items[0].created if items else None,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        translation_key="oldest_queued_readings",
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class TNSEBillSensorEntityDescription(SensorEntityDescription):
+    """Describes TNS-Energo stored bills sensor entity."""
+
+    value_fn: Callable[[list[BillEntry]], StateType]
+
+
+BILL_SENSOR_TYPES: tuple[TNSEBillSensorEntityDescription, ...] = (
+    TNSEBillSensorEntityDescription(
+        key="bills_size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEBIBYTES,
+        value_fn=lambda entries: sum(entry.size for entry in entries),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        translation_key="bills_size",
+    ),
+)
 
 
 # ---------------------------------------------------------------------------
@@ -290,72 +645,149 @@ def _counter_consumption_available(
 # ---------------------------------------------------------------------------
 
 
-class TNSESensor(TNSEBaseCoordinatorEntity, SensorEntity):
+class TNSESensor(TNSERowEntity, SensorEntity):
     """TNS-Energo Account-Level Sensor."""
 
+    _unrecorded_attributes = ACCOUNT_UNRECORDED_ATTRIBUTES
+
     entity_description: TNSESensorEntityDescription
 
     @property
-    def available(self) -> bool:
-        """Return True if sensor is available."""
-        account = self._get_account()
-        if account is None:
-            return False
-        return super().available and self.entity_description.available_fn(account)
+    def _always_render_row(self) -> bool:
+        """Return True if the row is rendered on every refresh."""
+        return self.entity_description.always_render
+
+    def _render_row(self, accounts: Mapping[str, TNSEAccountData]) -> EntityRow:
+        """Render the sensor row from account data."""
+        account = accounts.get(self._account_number)
+        description = self.entity_description
+        if account is None or not description.available_fn(account):
+            return UNAVAILABLE_ROW
+        return EntityRow(
+            available=True,
+            value=description.value_fn(account, self.coordinator),
+            attributes=self._row_attributes(description.attr_fn(account)),
+        )
 
     @property
     def native_value(self) -> StateType | datetime | date:
         """Return the state of the sensor."""
-        account = self._get_account()
-        if account is None:
-            return None
-        return self.entity_description.value_fn(account, self.coordinator)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        account = self._get_account()
-        if account is None:
-            return {}
-        return self.entity_description.attr_fn(account)
+        return self._row.value
 
 
-class TNSECounterSensor(TNSECounterEntity, SensorEntity):
+class TNSECounterSensor(TNSECounterEntity, TNSERowEntity, SensorEntity):
     """TNS-Energo Counter Sub-Device Sensor."""
 
+    _unrecorded_attributes = COUNTER_UNRECORDED_ATTRIBUTES
+
     entity_description: TNSECounterSensorEntityDescription
 
-    @property
-    def available(self) -> bool:
-        """Return True if sensor is available."""
-        account = self._get_account()
-        if account is None:
-            return False
-        return super().available and self.entity_description.available_fn(
-            account, self._counter_index
+    def _render_row(self, accounts: Mapping[str, TNSEAccountData]) -> EntityRow:
+        """Render the sensor row from counter data."""
+        account = accounts.get(self._account_number)
+        counter = account.get_counter(self._counter_id) if account else None
+        description = self.entity_description
+        if counter is None or not description.available_fn(counter):
+            return UNAVAILABLE_ROW
+        return EntityRow(
+            available=True,
+            value=description.value_fn(counter),
+            attributes=self._row_attributes(description.attr_fn(counter)),
         )
 
     @property
     def native_value(self) -> StateType | datetime | date:
         """Return the state of the sensor."""
-        account = self._get_account()
-        if account is None:
-            return None
-        return self.entity_description.value_fn(
-            account, self._counter_index, self.coordinator
+        return self._row.value
+
+
+class TNSECounterTariffSensor(TNSECounterSensor):
+    """TNS-Energo Counter Tariff Reading Sensor."""
+
+
+class TNSECounterHistorySensor(TNSECounterEntity, TNSERowEntity, SensorEntity):
+    """TNS-Energo Counter Sensor computed from the stored readings history.
+
+    The sensor is unavailable while the history is too short for its value.
+    """
+
+    entity_description: TNSECounterHistorySensorEntityDescription
+
+    def _render_row(self, accounts: Mapping[str, TNSEAccountData]) -> EntityRow:
+        """Render the sensor row from the readings store."""
+        account = accounts.get(self._account_number)
+        counter = account.get_counter(self._counter_id) if account else None
+        if counter is None:
+            return UNAVAILABLE_ROW
+        description = self.entity_description
+        value = description.value_fn(self.coordinator, counter)
+        if value is None:
+            return UNAVAILABLE_ROW
+        return EntityRow(
+            available=True,
+            value=value,
+            attributes=self._row_attributes(
+                description.attr_fn(self.coordinator, counter)
+            ),
         )
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        account = self._get_account()
-        if account is None:
-            return {}
-        return self.entity_description.attr_fn(account, self._counter_index)
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self._row.value
 
 
-class TNSECounterTariffSensor(TNSECounterSensor):
-    """TNS-Energo Counter Tariff Reading Sensor."""
+class TNSEQueueSensor(TNSEBaseCoordinatorEntity, SensorEntity):
+    """TNS-Energo Readings Queue Sensor of an account."""
+
+    entity_description: TNSEQueueSensorEntityDescription
+
+    async def async_added_to_hass(self) -> None:
+        """Update state on readings queue changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.readings_queue.async_add_listener(
+                self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(
+            self.coordinator.readings_queue.get_account_items(self._account_number)
+        )
+
+
+class TNSEBillSensor(TNSEBaseCoordinatorEntity, SensorEntity):
+    """TNS-Energo Stored Bills Sensor of an account."""
+
+    entity_description: TNSEBillSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: TNSECoordinator,
+        entity_description: TNSEBillSensorEntityDescription,
+        account_number: str,
+        bill_cache: BillCache,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description, account_number)
+        self._bill_cache = bill_cache
+
+    async def async_added_to_hass(self) -> None:
+        """Update state on bill manifest changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._bill_cache.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(
+            self._bill_cache.get_account_entries(self._account_number)
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -363,11 +795,6 @@ class TNSECounterTariffSensor(TNSECounterSensor):
 # ---------------------------------------------------------------------------
 
 
-def _get_tariff_key(tariff_count: int, index: int, key: str) -> str:
-    """Format tariff key."""
-    return key if tariff_count == 1 else f"t{index + 1}_{key}"
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: TNSEConfigEntry,
@@ -375,6 +802,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensor entities."""
     coordinator = entry.runtime_data
+    bill_cache = await async_get_bill_cache(hass)
 
     entities: list[SensorEntity] = []
 
@@ -383,70 +811,52 @@ async def async_setup_entry(
         for description in ACCOUNT_SENSOR_TYPES:
             entities.append(TNSESensor(coordinator, description, account.number))
 
+        # Readings queue sensors
+        for queue_description in QUEUE_SENSOR_TYPES:
+            entities.append(
+                TNSEQueueSensor(coordinator, queue_description, account.number)
+            )
+
+        # Stored bills sensors
+        for bill_description in BILL_SENSOR_TYPES:
+            entities.append(
+                TNSEBillSensor(
+                    coordinator, bill_description, account.number, bill_cache
+                )
+            )
+
         # Counter sub-device sensors
-        for j, counter in enumerate(account.counters):
+        for counter in account.counters:
+            counter_id = counter.counter_id
+
             # Static counter sensors (meter, readings_date)
             for description in COUNTER_SENSOR_TYPES:
                 entities.append(
                     TNSECounterSensor(
-                        coordinator, description, account.number, j
+                        coordinator, description, account.number, counter_id
                     )
                 )
 
-            # Per-tariff reading sensors
-            last_readings = counter.get("lastReadings", [])
-            tariff_count = len(last_readings)
-
-            for i in range(tariff_count):
-                reading_key = _get_tariff_key(tariff_count, i, "reading")
-
+            # Readings history sensors
+            for history_description in COUNTER_HISTORY_SENSOR_TYPES:
                 entities.append(
-                    TNSECounterTariffSensor(
-                        coordinator,
-                        TNSECounterSensorEntityDescription(
-                            key=reading_key,
-                            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-                            device_class=SensorDeviceClass.ENERGY,
-                            state_class=SensorStateClass.TOTAL,
-                            value_fn=lambda account, counter_index, coordinator, reading_idx=i: _counter_tariff_value(
-                                account, counter_index, reading_idx
-                            ),
-                            available_fn=lambda account, counter_index, reading_idx=i: _counter_tariff_available(
-                                account, counter_index, reading_idx
-                            ),
-                            translation_key=reading_key,
-                            attr_fn=lambda account, counter_index, reading_idx=i: _counter_tariff_attributes(
-                                account, counter_index, reading_idx
-                            ),
-                        ),
-                        account.number,
-                        j,
+                    TNSECounterHistorySensor(
+                        coordinator, history_description, account.number, counter_id
                     )
                 )
 
-                # Per-tariff consumption sensors
-                consumption_key = _get_tariff_key(
-                    tariff_count, i, "consumption"
-                )
+            # Per-tariff reading and consumption sensors
+            tariff_count = counter.tariff_count
 
-                entities.append(
-                    TNSECounterTariffSensor(
-                        coordinator,
-                        TNSECounterSensorEntityDescription(
-                            key=consumption_key,
-                            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-                            device_class=SensorDeviceClass.ENERGY,
-                            value_fn=lambda account, counter_index, coordinator, reading_idx=i: _counter_consumption_value(
-                                account, counter_index, reading_idx
-                            ),
-                            available_fn=lambda account, counter_index, reading_idx=i: _counter_consumption_available(
-                                account, counter_index, reading_idx
-                            ),
-                            translation_key=consumption_key,
-                        ),
-                        account.number,
-                        j,
+            for i in range(tariff_count):
+                for kind in (TARIFF_READING, TARIFF_CONSUMPTION):
+                    entities.append(
+                        TNSECounterTariffSensor(
+                            coordinator,
+                            get_tariff_description(tariff_count, i, kind),
+                            account.number,
+                            counter_id,
+                        )
                     )
-                )
 
     async_add_entities(entities, True)
@@ -1,45 +1,100 @@
 """TNS-Energo services."""
 from __future__ import annotations
 
-import base64
+import asyncio
+import collections
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
-from datetime import date
-from pathlib import Path
+from datetime import date, timedelta
+from functools import partial
 from typing import Any, Final
 
 import voluptuous as vol
 from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.helpers import config_validation as cv
-
+from homeassistant.util import dt as dt_util
+
+from .bills import (
+    BillCache,
+    BillEntry,
+    async_fetch_bill,
+    async_get_bill_cache,
+    bill_month,
+)
 from .const import (
     ATTR_BALANCE,
+    ATTR_CACHED,
+    ATTR_END_DATE,
+    ATTR_ERROR,
+    ATTR_FIRE_EVENT,
+    ATTR_FORCE,
+    ATTR_ITEMS,
+    ATTR_PAYMENTS,
+    ATTR_QUEUED,
     ATTR_READINGS,
+    ATTR_START_DATE,
     ATTR_T1,
     ATTR_T2,
     ATTR_T3,
     DOMAIN,
+    READINGS_DEFAULT_PERIOD,
+    READINGS_MIN_DAILY_LIMIT,
+    READINGS_RATE_FACTOR,
 )
 from .coordinator import TNSECoordinator
 from .helpers import (
     get_account,
+    get_closed_month,
     get_coordinator,
     get_counter_data,
+    get_device_target,
     get_float_value,
     get_previous_month,
 )
+from .models import Counter, TNSEAccountData
+from .readings_queue import is_transient_error, readings_key
+from .views import async_get_signed_bill_url
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_REFRESH: Final = "refresh"
 SERVICE_SEND_READINGS: Final = "send_readings"
 SERVICE_GET_BILL: Final = "get_bill"
+SERVICE_SEND_READINGS_BATCH: Final = "send_readings_batch"
+SERVICE_BACKFILL_BILLS: Final = "backfill_bills"
+SERVICE_GET_PAYMENTS: Final = "get_payments"
+SERVICE_GET_READINGS: Final = "get_readings"
+
+BACKFILL_DOWNLOADED: Final = "downloaded"
+BACKFILL_CACHED: Final = "cached"
+BACKFILL_MISSING: Final = "missing"
+BACKFILL_FAILED: Final = "failed"
+BACKFILL_STATUSES: Final = (
+    BACKFILL_DOWNLOADED,
+    BACKFILL_CACHED,
+    BACKFILL_MISSING,
+    BACKFILL_FAILED,
+)
 
-SERVICE_BASE_SCHEMA = {vol.Required(ATTR_DEVICE_ID): cv.string}
+SERVICE_BASE_SCHEMA = {
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    vol.Optional(ATTR_FIRE_EVENT, default=True): cv.boolean,
+}
+
+# Query services only return a response and fire no events
+SERVICE_QUERY_BASE_SCHEMA = {
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+}
 
 SERVICE_REFRESH_SCHEMA = vol.Schema(SERVICE_BASE_SCHEMA)
 
@@ -52,10 +107,56 @@ SERVICE_SEND_READINGS_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_SEND_READINGS_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ITEMS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_DEVICE_ID): cv.string,
+                        vol.Required(ATTR_T1): cv.entity_id,
+                        vol.Optional(ATTR_T2): cv.entity_id,
+                        vol.Optional(ATTR_T3): cv.entity_id,
+                    }
+                )
+            ],
+            vol.Length(min=1),
+        ),
+        vol.Optional(ATTR_FIRE_EVENT, default=True): cv.boolean,
+    }
+)
+
 SERVICE_GET_BILL_SCHEMA = vol.Schema(
     {
         **SERVICE_BASE_SCHEMA,
         vol.Optional(ATTR_DATE): cv.date,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    },
+)
+
+SERVICE_BACKFILL_BILLS_SCHEMA = vol.Schema(
+    {
+        **SERVICE_BASE_SCHEMA,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    },
+)
+
+SERVICE_GET_PAYMENTS_SCHEMA = vol.Schema(
+    {
+        **SERVICE_QUERY_BASE_SCHEMA,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    },
+)
+
+SERVICE_GET_READINGS_SCHEMA = vol.Schema(
+    {
+        **SERVICE_QUERY_BASE_SCHEMA,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
     },
 )
 
@@ -69,6 +170,12 @@ class ServiceDescription:
         [HomeAssistant, ServiceCall, TNSECoordinator], Awaitable[dict[str, Any]]
     ]
     schema: vol.Schema | None = None
+    supports_response: SupportsResponse = SupportsResponse.OPTIONAL
+
+    @property
+    def fires_events(self) -> bool:
+        """Return True if the service fires completed and failed events."""
+        return self.supports_response is not SupportsResponse.ONLY
 
 
 async def _async_handle_refresh(
@@ -78,14 +185,62 @@ async def _async_handle_refresh(
     return {}
 
 
-async def _async_handle_send_readings(
-    hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
-) -> dict[str, Any]:
-    device_id = service_call.data.get(ATTR_DEVICE_ID)
-    account, counter = get_counter_data(hass, coordinator, device_id)
+def _check_reading(
+    account: TNSEAccountData,
+    counter: Counter,
+    tariff_index: int,
+    t_name: str,
+    value: float,
+) -> None:
+    """Reject a reading lower than the last one or with an implausible jump.
+
+    The allowed growth is the daily consumption rate of the last period,
+    multiplied by READINGS_RATE_FACTOR, but not less than
+    READINGS_MIN_DAILY_LIMIT, for each day since the last reading.
+    """
+    last = counter.get_reading(tariff_index)
+    if last is None or last.value is None:
+        return
+
+    placeholders = {
+        "account": account.number,
+        "tariff": t_name.upper(),
+        "value": f"{value:g}",
+        "last": f"{last.value:g}",
+    }
+    if value < last.value:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="reading_decreased",
+            translation_placeholders=placeholders,
+        )
+
+    days = READINGS_DEFAULT_PERIOD
+    if last.reading_date is not None:
+        days = max((dt_util.now().date() - last.reading_date).days, 1)
+    daily_limit = READINGS_MIN_DAILY_LIMIT
+    if last.consumption:
+        daily_limit = max(
+            daily_limit,
+            last.consumption / READINGS_DEFAULT_PERIOD * READINGS_RATE_FACTOR,
+        )
+    limit = daily_limit * days
+    if value - last.value > limit:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="reading_implausible",
+            translation_placeholders={**placeholders, "limit": f"{limit:.0f}"},
+        )
+
 
-    row_id = counter.get("rowId")
-    tariff_count: int = counter.get("tariff", 0)
+def _get_readings(
+    hass: HomeAssistant,
+    data: Mapping[str, Any],
+    account: TNSEAccountData,
+    counter: Counter,
+) -> list[str]:
+    """Validate tariff entities against the counter and return readings."""
+    tariff_count = counter.tariff
 
     t_names = (ATTR_T1, ATTR_T2, ATTR_T3)
     required = t_names[:tariff_count]
@@ -93,8 +248,8 @@ async def _async_handle_send_readings(
 
     # Validate required tariffs are provided
     readings: list[str] = []
-    for t_name in required:
-        entity_id = service_call.data.get(t_name)
+    for tariff_index, t_name in enumerate(required):
+        entity_id = data.get(t_name)
         if entity_id is None:
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
@@ -116,11 +271,12 @@ async def _async_handle_send_readings(
                     "need": str(tariff_count),
                 },
             )
+        _check_reading(account, counter, tariff_index, t_name, t_value)
         readings.append(str(int(t_value)))
 
     # Reject extra tariffs beyond counter's tariff count
     for t_name in extra:
-        if service_call.data.get(t_name) is not None:
+        if data.get(t_name) is not None:
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
                 translation_key="tariff_extra",
@@ -131,8 +287,72 @@ async def _async_handle_send_readings(
                 },
             )
 
-    result = await coordinator.async_send_readings(
-        account.number, row_id, readings
+    return readings
+
+
+def _check_not_submitted(
+    coordinator: TNSECoordinator,
+    account: TNSEAccountData,
+    counter: Counter,
+    readings: list[str],
+) -> None:
+    """Reject readings that are already queued or were sent recently."""
+    queue = coordinator.readings_queue
+    key = readings_key(account.number, counter.row_id, readings)
+    if queue.is_queued(key) or queue.is_sent(key):
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="readings_already_submitted",
+            translation_placeholders={
+                "account": account.number,
+                "readings": ", ".join(readings),
+            },
+        )
+
+
+async def _async_submit_readings(
+    coordinator: TNSECoordinator,
+    device_id: str | None,
+    account: TNSEAccountData,
+    counter: Counter,
+    readings: list[str],
+) -> Any:
+    """Send readings, queueing them for retry if the API is unavailable."""
+    queue = coordinator.readings_queue
+    try:
+        result = await coordinator.async_send_readings(
+            account.number, counter.row_id, readings
+        )
+    except UpdateFailed as exc:
+        if not queue.enabled or not is_transient_error(exc):
+            raise
+        item = await queue.async_enqueue(
+            device_id, account.number, counter.counter_id, counter.row_id, readings
+        )
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="readings_queued",
+            translation_placeholders={
+                "account": account.number,
+                "deadline": dt_util.as_local(item.deadline).strftime(
+                    "%d.%m.%Y %H:%M"
+                ),
+            },
+        ) from exc
+    await queue.async_mark_sent(readings_key(account.number, counter.row_id, readings))
+    return result
+
+
+async def _async_handle_send_readings(
+    hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
+) -> dict[str, Any]:
+    device_id = service_call.data.get(ATTR_DEVICE_ID)
+    account, counter = get_counter_data(hass, device_id)
+    readings = _get_readings(hass, service_call.data, account, counter)
+    _check_not_submitted(coordinator, account, counter, readings)
+
+    result = await _async_submit_readings(
+        coordinator, device_id, account, counter, readings
     )
 
     return {
@@ -141,40 +361,273 @@ async def _async_handle_send_readings(
     }
 
 
+@dataclass(slots=True)
+class _BatchItem:
+    """A validated item of a batch readings submission."""
+
+    device_id: str
+    coordinator: TNSECoordinator
+    account: TNSEAccountData
+    counter: Counter
+    readings: list[str]
+
+
+def _get_batch_items(
+    hass: HomeAssistant, items: list[dict[str, Any]]
+) -> list[_BatchItem]:
+    """Validate all batch items before anything is submitted."""
+    batch: list[_BatchItem] = []
+    seen: set[str] = set()
+    for index, item in enumerate(items, start=1):
+        device_id: str = item[ATTR_DEVICE_ID]
+        try:
+            if device_id in seen:
+                raise ValueError(f"Device {device_id} is listed more than once")
+            seen.add(device_id)
+            target = get_device_target(hass, device_id)
+            account, counter = get_counter_data(hass, device_id)
+            readings = _get_readings(hass, item, account, counter)
+            _check_not_submitted(target.coordinator, account, counter, readings)
+        except (ValueError, HomeAssistantError) as exc:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="batch_item_invalid",
+                translation_placeholders={"index": str(index), "error": str(exc)},
+            ) from exc
+        batch.append(
+            _BatchItem(device_id, target.coordinator, account, counter, readings)
+        )
+    return batch
+
+
+async def _async_send_batch_item(item: _BatchItem) -> dict[str, Any]:
+    """Submit readings of a single batch item and return its result."""
+    result: dict[str, Any] = {
+        ATTR_DEVICE_ID: item.device_id,
+        ATTR_READINGS: item.readings,
+    }
+    try:
+        result[ATTR_BALANCE] = await _async_submit_readings(
+            item.coordinator,
+            item.device_id,
+            item.account,
+            item.counter,
+            item.readings,
+        )
+    except Exception as exc:  # noqa: BLE001
+        _LOGGER.error(
+            "Sending readings for counter %s failed. Error: %s",
+            item.counter.counter_id,
+            exc,
+        )
+        result[ATTR_ERROR] = str(exc)
+        if (
+            isinstance(exc, HomeAssistantError)
+            and exc.translation_key == "readings_queued"
+        ):
+            result[ATTR_QUEUED] = True
+    return result
+
+
+async def _async_handle_send_readings_batch(
+    hass: HomeAssistant, service_call: ServiceCall
+) -> ServiceResponse:
+    """Validate all items, then send readings concurrently.
+
+    Concurrency is bounded by the request limiter of each coordinator.
+    """
+    batch = _get_batch_items(hass, service_call.data[ATTR_ITEMS])
+
+    results = list(
+        await asyncio.gather(*(_async_send_batch_item(item) for item in batch))
+    )
+
+    _async_fire_event(hass, service_call, "completed", {ATTR_ITEMS: results})
+
+    return {ATTR_ITEMS: results} if service_call.return_response else None
+
+
+def _get_bill_result(
+    hass: HomeAssistant, cache: BillCache, entry: BillEntry
+) -> dict[str, Any]:
+    """Return the file path and a signed download URL of a cached bill."""
+    return {
+        "file_path": str(cache.get_path(entry)),
+        "url": async_get_signed_bill_url(hass, entry),
+    }
+
+
 async def _async_handle_get_bill(
     hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
 ) -> dict[str, Any]:
     bill_date: date = service_call.data.get(ATTR_DATE, get_previous_month())
 
     device_id = service_call.data.get(ATTR_DEVICE_ID)
-    account = get_account(hass, coordinator, device_id)
-
-    date_str = bill_date.strftime("%d.%m.%Y")
-    result = await coordinator.async_get_invoice_file(account.number, date_str)
+    account = get_account(hass, device_id)
+    cache = await async_get_bill_cache(hass)
 
-    file_data = result.get("file")
-    if file_data is None:
+    entry, cached = await async_fetch_bill(
+        coordinator, cache, account, bill_date, service_call.data[ATTR_FORCE]
+    )
+    if entry is None:
         raise HomeAssistantError(
             translation_domain=DOMAIN,
             translation_key="no_file_in_response",
             translation_placeholders={"account": account.number},
         )
 
-    # Save PDF to /config/www/tns_energo/
-    filename = f"{account.number}_{bill_date.strftime('%Y-%m')}.pdf"
-    www_dir = Path(hass.config.path("www", "tns_energo"))
-    file_path = www_dir / filename
+    return {
+        ATTR_DATE: bill_date,
+        **_get_bill_result(hass, cache, entry),
+        ATTR_CACHED: cached,
+    }
 
-    def _save_file() -> None:
-        www_dir.mkdir(parents=True, exist_ok=True)
-        file_path.write_bytes(base64.b64decode(file_data))
 
-    await hass.async_add_executor_job(_save_file)
+async def _async_handle_backfill_bills(
+    hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
+) -> dict[str, Any]:
+    """Download all bills of closed months in a date range.
+
+    Months are fetched concurrently, the number of simultaneous API requests
+    is bounded by the coordinator request limiter. Every bill is recorded in
+    the cache manifest as soon as it is written, so a repeated call resumes
+    where an interrupted one stopped.
+    """
+    device_id = service_call.data.get(ATTR_DEVICE_ID)
+    account = get_account(hass, device_id)
+    cache = await async_get_bill_cache(hass)
+    force: bool = service_call.data[ATTR_FORCE]
+
+    end = get_closed_month(account.balance).replace(day=1)
+    if (end_date := service_call.data.get(ATTR_END_DATE)) is not None:
+        end = min(end, end_date.replace(day=1))
+    start: date = service_call.data.get(ATTR_START_DATE) or date(
+        account.initial_year or end.year, 1, 1
+    )
+    start = start.replace(day=1)
+    # Bills older than the retention age would be removed right away
+    today = dt_util.now().date()
+    if (oldest := coordinator.bill_retention.get_oldest_month(today)) is not None:
+        start = max(start, oldest)
+
+    months: list[date] = []
+    month = start
+    while month <= end:
+        months.append(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+
+    statuses: dict[str, str] = {}
+
+    async def _async_backfill_month(bill_date: date) -> None:
+        month = bill_month(bill_date)
+        if not force and cache.is_missing(account.number, month):
+            status = BACKFILL_MISSING
+        else:
+            try:
+                entry, cached = await async_fetch_bill(
+                    coordinator, cache, account, bill_date, force
+                )
+            except UpdateFailed as exc:
+                _LOGGER.warning(
+                    "Failed to get bill %s for account %s: %s",
+                    month,
+                    account.number,
+                    exc,
+                )
+                status = BACKFILL_FAILED
+            else:
+                if entry is None:
+                    await cache.async_mark_missing(account.number, month)
+                    status = BACKFILL_MISSING
+                else:
+                    status = BACKFILL_CACHED if cached else BACKFILL_DOWNLOADED
+
+        statuses[month] = status
+        _async_fire_event(
+            hass,
+            service_call,
+            "progress",
+            {
+                ATTR_DEVICE_ID: device_id,
+                ATTR_DATE: bill_date,
+                "status": status,
+                "done": len(statuses),
+                "total": len(months),
+            },
+        )
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            for bill_date in months:
+                task_group.create_task(_async_backfill_month(bill_date))
+    except ExceptionGroup as exc_group:
+        # Authentication errors stop the whole backfill
+        raise exc_group.exceptions[0] from None
 
+    counts = collections.Counter(statuses.values())
     return {
-        ATTR_DATE: bill_date,
-        "file_path": str(file_path),
-        "url": f"/local/tns_energo/{filename}",
+        "total": len(months),
+        **{status: counts[status] for status in BACKFILL_STATUSES},
+        "failed_months": sorted(
+            month for month, status in statuses.items() if status == BACKFILL_FAILED
+        ),
+    }
+
+
+async def _async_handle_get_payments(
+    hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
+) -> dict[str, Any]:
+    """Return the payments of an account from the local ledger.
+
+    The range defaults to the current year up to today.
+    """
+    device_id = service_call.data.get(ATTR_DEVICE_ID)
+    account = get_account(hass, device_id)
+
+    today = dt_util.now().date()
+    end: date = service_call.data.get(ATTR_END_DATE, today)
+    start: date = service_call.data.get(ATTR_START_DATE, date(end.year, 1, 1))
+
+    payments = coordinator.payment_ledger.get_payments(account.number, start, end)
+    return {
+        ATTR_START_DATE: start,
+        ATTR_END_DATE: end,
+        ATTR_PAYMENTS: [
+            {ATTR_DATE: payment.payment_date, "amount": payment.amount}
+            for payment in payments
+        ],
+        "count": len(payments),
+        "total": round(sum(payment.amount or 0.0 for payment in payments), 2),
+    }
+
+
+async def _async_handle_get_readings(
+    hass: HomeAssistant, service_call: ServiceCall, coordinator: TNSECoordinator
+) -> dict[str, Any]:
+    """Return the stored readings history of a counter by tariff zone.
+
+    Without dates the whole stored history is returned.
+    """
+    device_id = service_call.data.get(ATTR_DEVICE_ID)
+    _, counter = get_counter_data(hass, device_id)
+    start: date | None = service_call.data.get(ATTR_START_DATE)
+    end: date | None = service_call.data.get(ATTR_END_DATE)
+
+    store = coordinator.readings_store
+    return {
+        ATTR_START_DATE: start,
+        ATTR_END_DATE: end,
+        ATTR_READINGS: {
+            t_name: [
+                {ATTR_DATE: day, "value": value, "consumption": consumption}
+                for day, value, consumption in store.get_readings(
+                    counter.counter_id, index, start, end
+                )
+            ]
+            for index, t_name in enumerate(
+                (ATTR_T1, ATTR_T2, ATTR_T3)[: counter.tariff_count]
+            )
+        },
     }
 
 
@@ -188,14 +641,52 @@ SERVICES: dict[str, ServiceDescription] = {
     SERVICE_GET_BILL: ServiceDescription(
         SERVICE_GET_BILL, _async_handle_get_bill, SERVICE_GET_BILL_SCHEMA
     ),
+    SERVICE_BACKFILL_BILLS: ServiceDescription(
+        SERVICE_BACKFILL_BILLS,
+        _async_handle_backfill_bills,
+        SERVICE_BACKFILL_BILLS_SCHEMA,
+    ),
+    SERVICE_GET_PAYMENTS: ServiceDescription(
+        SERVICE_GET_PAYMENTS,
+        _async_handle_get_payments,
+        SERVICE_GET_PAYMENTS_SCHEMA,
+        SupportsResponse.ONLY,
+    ),
+    SERVICE_GET_READINGS: ServiceDescription(
+        SERVICE_GET_READINGS,
+        _async_handle_get_readings,
+        SERVICE_GET_READINGS_SCHEMA,
+        SupportsResponse.ONLY,
+    ),
 }
 
 
+@callback
+def _async_fire_event(
+    hass: HomeAssistant,
+    service_call: ServiceCall,
+    outcome: str,
+    event_data: dict[str, Any],
+) -> None:
+    """Fire the completed/failed event of a service call unless disabled."""
+    if not service_call.data.get(ATTR_FIRE_EVENT, True):
+        return
+    if (
+        description := SERVICES.get(service_call.service)
+    ) is not None and not description.fires_events:
+        return
+    hass.bus.async_fire(
+        event_type=f"{DOMAIN}_{service_call.service}_{outcome}",
+        event_data=event_data,
+        context=service_call.context,
+    )
+
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up the TNS-Energo services."""
 
-    async def _async_handle_service(service_call: ServiceCall) -> None:
-        """Call a service."""
+    async def _async_handle_service(service_call: ServiceCall) -> ServiceResponse:
+        """Call a service, return its result and optionally fire an event."""
         _LOGGER.debug("Service call %s", service_call.service)
 
         try:
@@ -206,28 +697,31 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 hass, service_call, coordinator
             )
 
-            hass.bus.async_fire(
-                event_type=f"{DOMAIN}_{service_call.service}_completed",
-                event_data={ATTR_DEVICE_ID: device_id, **result},
-                context=service_call.context,
+            _async_fire_event(
+                hass,
+                service_call,
+                "completed",
+                {ATTR_DEVICE_ID: device_id, **result},
             )
 
             _LOGGER.debug(
                 "Service call '%s' successfully finished", service_call.service
             )
+            return result if service_call.return_response else None
 
         except (UpdateFailed, ConfigEntryAuthFailed) as exc:
             _LOGGER.error(
                 "Service call '%s' failed. Error: %s", service_call.service, exc
             )
 
-            hass.bus.async_fire(
-                event_type=f"{DOMAIN}_{service_call.service}_failed",
-                event_data={
+            _async_fire_event(
+                hass,
+                service_call,
+                "failed",
+                {
                     ATTR_DEVICE_ID: service_call.data.get(ATTR_DEVICE_ID),
                     "error": str(exc),
                 },
-                context=service_call.context,
             )
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
@@ -244,13 +738,14 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 "Service call '%s' failed. Error: %s", service_call.service, exc
             )
 
-            hass.bus.async_fire(
-                event_type=f"{DOMAIN}_{service_call.service}_failed",
-                event_data={
+            _async_fire_event(
+                hass,
+                service_call,
+                "failed",
+                {
                     ATTR_DEVICE_ID: service_call.data.get(ATTR_DEVICE_ID),
                     "error": str(exc),
                 },
-                context=service_call.context,
             )
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
@@ -265,5 +760,18 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if hass.services.has_service(DOMAIN, service.name):
             continue
         hass.services.async_register(
-            DOMAIN, service.name, _async_handle_service, service.schema
+            DOMAIN,
+            service.name,
+            _async_handle_service,
+            service.schema,
+            supports_response=service.supports_response,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SEND_READINGS_BATCH):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SEND_READINGS_BATCH,
+            partial(_async_handle_send_readings_batch, hass),
+            SERVICE_SEND_READINGS_BATCH_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
         )
@@ -0,0 +1,151 @@
+"""Import of the TNS-Energo readings history into long-term statistics."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import COUNTER_NAME_FORMAT, DOMAIN
+from .models import Counter, ReadingsPeriod
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant < 2025.6
+    StatisticMeanType = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_statistic_id(counter_id: str, tariff_count: int, index: int) -> str:
+    """Return the external statistic ID of a counter tariff zone."""
+    key = "consumption" if tariff_count == 1 else f"t{index + 1}_consumption"
+    return f"{DOMAIN}:{slugify(f'{counter_id}_{key}')}"
+
+
+def _get_metadata(
+    counter: Counter, index: int, statistic_id: str
+) -> StatisticMetaData:
+    """Return the statistic metadata of a counter tariff zone."""
+    name = COUNTER_NAME_FORMAT.format(counter.counter_id)
+    if counter.tariff_count > 1:
+        reading = counter.get_reading(index)
+        tariff_name = reading.name if reading is not None else None
+        name = f"{name} {tariff_name or f'T{index + 1}'}"
+    metadata = StatisticMetaData(
+        has_sum=True,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    )
+    if StatisticMeanType is None:
+        metadata["has_mean"] = False
+    else:
+        metadata["mean_type"] = StatisticMeanType.NONE
+    return metadata
+
+
+def build_statistics(
+    history: Iterable[ReadingsPeriod],
+    index: int,
+    last_start: float | None,
+    last_sum: float,
+) -> list[StatisticData]:
+    """Return statistics of the periods newer than the last imported one.
+
+    The state is the meter reading and the sum accumulates the consumption
+    of each period; without a reported consumption the difference to the
+    previous reading is used.
+    """
+    statistics: list[StatisticData] = []
+    total = last_sum
+    previous: float | None = None
+    for period in history:
+        if index >= len(period.readings):
+            continue
+        reading = period.readings[index]
+        value = reading.value
+        consumption = reading.consumption
+        if consumption is None and value is not None and previous is not None:
+            consumption = max(value - previous, 0.0)
+        if value is not None:
+            previous = value
+
+        start = dt_util.start_of_local_day(period.reading_date)
+        if last_start is not None and start.timestamp() <= last_start:
+            continue
+        total += consumption or 0.0
+        statistics.append(StatisticData(start=start, state=value, sum=total))
+    return statistics
+
+
+class ReadingsStatistics:
+    """Incrementally import counter readings into external statistics.
+
+    The start and sum of the last imported statistic are read from the
+    recorder once per statistic and then kept in memory, so periods that
+    are already imported are skipped without a database query.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._last: dict[str, tuple[float | None, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_import(self, counters: Iterable[Counter]) -> None:
+        """Import the readings history of counters."""
+        async with self._lock:
+            for counter in counters:
+                if not counter.history:
+                    continue
+                for index in range(counter.tariff_count):
+                    await self._async_import_tariff(counter, index)
+
+    async def _async_get_last(
+        self, statistic_id: str
+    ) -> tuple[float | None, float]:
+        """Return the start and sum of the last imported statistic."""
+        if (last := self._last.get(statistic_id)) is not None:
+            return last
+        result = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if rows := result.get(statistic_id):
+            last = (rows[0]["start"], rows[0].get("sum") or 0.0)
+        else:
+            last = (None, 0.0)
+        self._last[statistic_id] = last
+        return last
+
+    async def _async_import_tariff(self, counter: Counter, index: int) -> None:
+        """Import the new periods of a counter tariff zone in one batch."""
+        statistic_id = get_statistic_id(
+            counter.counter_id, counter.tariff_count, index
+        )
+        last_start, last_sum = await self._async_get_last(statistic_id)
+        statistics = build_statistics(counter.history, index, last_start, last_sum)
+        if not statistics:
+            return
+
+        _LOGGER.debug("Importing %d statistics for %s", len(statistics), statistic_id)
+        async_add_external_statistics(
+            self.hass, _get_metadata(counter, index, statistic_id), statistics
+        )
+        self._last[statistic_id] = (
+            statistics[-1]["start"].timestamp(),
+            statistics[-1]["sum"],
+        )
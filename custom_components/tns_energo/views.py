@@ -0,0 +1,108 @@
+"""TNS-Energo HTTP views."""
+from __future__ import annotations
+
+from datetime import datetime
+from http import HTTPStatus
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.hass_dict import HassKey
+
+from .bills import (
+    BillEntry,
+    async_fetch_bill,
+    async_get_bill_cache,
+    is_closed_month,
+)
+from .const import BILL_URL, BILL_URL_EXPIRATION, DOMAIN
+from .coordinator import TNSECoordinator
+
+DATA_VIEWS_REGISTERED: HassKey[bool] = HassKey(f"{DOMAIN}_views_registered")
+
+
+def get_bill_url(account_number: str, month: str) -> str:
+    """Return the URL of a bill served by TNSEBillView."""
+    return BILL_URL.format(account_number=account_number, month=month)
+
+
+@callback
+def async_get_signed_bill_url(hass: HomeAssistant, entry: BillEntry) -> str:
+    """Return a bill URL that can be opened without logging in for a while."""
+    return async_sign_path(
+        hass, get_bill_url(entry.account_number, entry.month), BILL_URL_EXPIRATION
+    )
+
+
+class TNSEBillView(HomeAssistantView):
+    """Serve stored bills to authenticated users.
+
+    A bill of a closed month missing from the cache is downloaded on demand;
+    months the API had no invoice for are not requested again.
+    """
+
+    url = BILL_URL
+    name = f"api:{DOMAIN}:bill"
+    requires_auth = True
+
+    async def get(
+        self, request: web.Request, account_number: str, month: str
+    ) -> web.StreamResponse:
+        """Return the PDF file of a bill."""
+        hass = request.app[KEY_HASS]
+        try:
+            bill_date = datetime.strptime(month, "%Y-%m").date()
+        except ValueError:
+            return self.json_message("Invalid month", HTTPStatus.NOT_FOUND)
+
+        coordinator = _get_account_coordinator(hass, account_number)
+        if coordinator is None:
+            return self.json_message("Unknown account", HTTPStatus.NOT_FOUND)
+
+        account = coordinator.accounts[account_number]
+        cache = await async_get_bill_cache(hass)
+        if (entry := await cache.async_get(account_number, month)) is None:
+            if not is_closed_month(account, bill_date) or cache.is_missing(
+                account_number, month
+            ):
+                return self.json_message("No bill", HTTPStatus.NOT_FOUND)
+            try:
+                entry, _ = await async_fetch_bill(
+                    coordinator, cache, account, bill_date
+                )
+            except (UpdateFailed, ConfigEntryAuthFailed) as exc:
+                return self.json_message(str(exc), HTTPStatus.BAD_GATEWAY)
+            if entry is None:
+                await cache.async_mark_missing(account_number, month)
+                return self.json_message("No bill", HTTPStatus.NOT_FOUND)
+
+        return web.FileResponse(
+            cache.get_path(entry),
+            headers={
+                hdrs.CONTENT_TYPE: "application/pdf",
+                hdrs.CONTENT_DISPOSITION: f'inline; filename="{entry.file}"',
+            },
+        )
+
+
+def _get_account_coordinator(
+    hass: HomeAssistant, account_number: str
+) -> TNSECoordinator | None:
+    """Return the coordinator of a loaded entry with the account."""
+    for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+        coordinator: TNSECoordinator = entry.runtime_data
+        if account_number in coordinator.accounts:
+            return coordinator
+    return None
+
+
+@callback
+def async_register_views(hass: HomeAssistant) -> None:
+    """Register the HTTP views once."""
+    if hass.data.get(DATA_VIEWS_REGISTERED):
+        return
+    hass.data[DATA_VIEWS_REGISTERED] = True
+    hass.http.register_view(TNSEBillView())
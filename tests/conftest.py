@@ -23,6 +23,7 @@ if sys.platform == "win32":
     socket.socketpair = _safe_socketpair  # type: ignore[assignment]
 
 from collections.abc import Generator
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -54,6 +55,12 @@ def auto_enable_custom_integrations(
     """Enable custom integrations for all tests."""
 
 
+@pytest.fixture(autouse=True)
+def isolated_config_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Keep the files of the on-disk stores out of the shared config dir."""
+    hass.config.config_dir = str(tmp_path)
+
+
 @pytest.fixture(autouse=True)
 def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
     """Eliminate retry delays in tests."""
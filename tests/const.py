@@ -147,6 +147,27 @@ MOCK_COUNTER_READINGS_RESPONSE = [
     }
 ]
 
+MOCK_COUNTER_READINGS_HISTORY_RESPONSE = [
+    {
+        "readings": [
+            {"name": "День", "value": "3500", "date": "24.01.26", "consumption": "120"},
+            {"name": "Ночь", "value": "1500", "date": "24.01.26", "consumption": "60"},
+        ]
+    },
+    {
+        "readings": [
+            {"name": "День", "value": "3380", "date": "24.12.25", "consumption": "130"},
+            {"name": "Ночь", "value": "1440", "date": "24.12.25", "consumption": "70"},
+        ]
+    },
+    {
+        "readings": [
+            {"name": "День", "value": "3250", "date": "24.11.25", "consumption": "110"},
+            {"name": "Ночь", "value": "1370", "date": "24.11.25", "consumption": "50"},
+        ]
+    },
+]
+
 MOCK_COUNTER_READINGS_SINGLE_TARIFF_RESPONSE = [
     {
         "readings": [
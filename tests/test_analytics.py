@@ -0,0 +1,198 @@
+"""Tests for the TNS-Energo consumption analytics."""
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tns_energo.analytics import (
+    ConsumptionAnalytics,
+    ConsumptionStats,
+    compute_consumption_stats,
+)
+from custom_components.tns_energo.const import DOMAIN
+from custom_components.tns_energo.models import parse_counter
+from custom_components.tns_energo.readings_store import ReadingsSeries, ReadingsStore
+
+from .const import (
+    MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+    MOCK_COUNTERS_RESPONSE,
+)
+
+
+def _make_series(start: date, consumption: list[float]) -> ReadingsSeries:
+    """Return a series of monthly readings taken on the 24th from start."""
+    months = start.year * 12 + start.month - 1
+    days = [
+        date((months + index) // 12, (months + index) % 12 + 1, 24).toordinal()
+        for index in range(len(consumption))
+    ]
+    return ReadingsSeries(
+        array("i", days),
+        array("d", [float("nan")] * len(consumption)),
+        array("d", consumption),
+    )
+
+
+def test_compute_stats_short_history() -> None:
+    """Test averages of a short history without yearly statistics."""
+    stats = compute_consumption_stats(
+        {
+            "1": [
+                _make_series(date(2025, 11, 1), [110.0, 130.0, 120.0]),
+                _make_series(date(2025, 11, 1), [50.0, 70.0, 60.0]),
+            ],
+            "2": [],
+        }
+    )
+
+    assert stats["1"].average_3_months == 180.0
+    assert stats["1"].average_12_months == 180.0
+    assert stats["1"].year_over_year is None
+    assert stats["1"].seasonal_baseline is None
+    assert stats["1"].projected_consumption == 180.0
+    # Too short a history to score the latest month
+    assert stats["1"].latest_consumption == 180.0
+    assert stats["1"].anomaly_score is None
+    assert stats["2"] == ConsumptionStats()
+    assert stats["2"].projected_consumption is None
+
+
+def test_compute_stats_multiple_years() -> None:
+    """Test yearly statistics of counters with histories of different length."""
+    # 25 months from 2024-01 to 2026-01, consumption grows by 10 each month
+    long = [100.0 + 10 * index for index in range(25)]
+    stats = compute_consumption_stats(
+        {
+            "1": [_make_series(date(2024, 1, 1), long)],
+            "2": [_make_series(date(2025, 6, 1), [90.0, float("nan"), 30.0])],
+        }
+    )
+
+    assert stats["1"].average_3_months == 330.0
+    assert stats["1"].average_12_months == 285.0
+    # January 2026 against January 2025
+    assert stats["1"].year_over_year == round(120 * 100 / 220, 1)
+    # February of 2025 and 2024
+    assert stats["1"].seasonal_baseline == 170.0
+    assert stats["1"].projected_consumption == 170.0
+    # Previous 24 months from 330 down to 100, the median absolute deviation is 60
+    assert stats["1"].median_consumption == 215.0
+    assert stats["1"].anomaly_score == round((340 - 215) / (60 * 1.4826), 2)
+    assert not stats["1"].is_anomaly
+
+    # Missing consumption is skipped
+    assert stats["2"].average_3_months == 60.0
+    assert stats["2"].year_over_year is None
+    assert stats["2"].seasonal_baseline is None
+    assert stats["2"].anomaly_score is None
+    assert not stats["2"].is_anomaly
+
+
+def test_compute_stats_anomaly() -> None:
+    """Test the latest month is scored against the previous months."""
+    usual = [100.0, 110.0, 90.0, 105.0, 95.0, 100.0, 110.0]
+    stats = compute_consumption_stats(
+        {
+            "1": [_make_series(date(2025, 1, 1), [*usual, 300.0])],
+            "2": [_make_series(date(2025, 1, 1), [*usual, 40.0])],
+            "3": [_make_series(date(2025, 1, 1), [*usual, 115.0])],
+            # A flat history is scaled by the minimal deviation
+            "4": [_make_series(date(2025, 1, 1), [100.0] * 7 + [100.5])],
+        }
+    )
+
+    assert stats["1"].is_anomaly
+    assert stats["1"].latest_month == date(2025, 8, 1)
+    assert stats["2"].is_anomaly
+    assert stats["2"].anomaly_score is not None
+    assert stats["2"].anomaly_score < 0
+    assert not stats["3"].is_anomaly
+    assert stats["4"].anomaly_score == 0.5
+
+
+async def test_analytics_memoized(hass: HomeAssistant) -> None:
+    """Test statistics are recomputed only when the store changes."""
+    counter = parse_counter(
+        MOCK_COUNTERS_RESPONSE[0], history=MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    assert counter is not None
+    store = ReadingsStore(hass, "test")
+    analytics = ConsumptionAnalytics(store)
+    await store.async_update([counter])
+
+    stats = analytics.get_stats([counter])
+    assert stats["10000001"].average_3_months == 180.0
+    assert analytics.get_stats([counter]) is stats
+
+    # Stored periods are not appended again
+    await store.async_update([counter])
+    assert analytics.get_stats([counter]) is stats
+
+    updated = parse_counter(
+        MOCK_COUNTERS_RESPONSE[0],
+        history=[
+            {
+                "readings": [
+                    {"value": "3600", "date": "24.02.26", "consumption": "100"},
+                    {"value": "1520", "date": "24.02.26", "consumption": "20"},
+                ]
+            },
+            *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+        ],
+    )
+    assert updated is not None
+    await store.async_update([updated])
+    stats = analytics.get_stats([updated])
+    assert stats["10000001"].average_3_months == round((200 + 180 + 120) / 3, 1)
+
+
+@pytest.mark.freeze_time("2026-03-10 12:00:00+03:00")
+async def test_analytics_sensors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the consumption analytics and projected cost sensors."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+
+    async def _get_history(account: str, year: int, month: int) -> dict[str, Any]:
+        if (year, month) != (2026, 1):
+            return {"items": []}
+        return {"items": [{"type": 2, "amount": 900.0, "date": "01.01.26"}]}
+
+    mock_api.async_get_history.side_effect = _get_history
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+
+    def _get_state(key: str) -> str:
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"10000001_{key}"
+        )
+        assert entity_id is not None
+        state = hass.states.get(entity_id)
+        assert state is not None
+        return state.state
+
+    assert float(_get_state("average_consumption_3_months")) == 180.0
+    assert float(_get_state("average_consumption_12_months")) == 180.0
+    assert _get_state("consumption_year_over_year") == "unavailable"
+    assert _get_state("seasonal_consumption") == "unavailable"
+
+    # 900 RUB for an average of 180 kWh, the 3-month average is priced
+    state = hass.states.get("sensor.ls_no610000000001_projected_month_cost")
+    assert state is not None
+    assert float(state.state) == 900.0
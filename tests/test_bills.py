@@ -0,0 +1,201 @@
+"""Tests for TNS-Energo invoice file storage."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import tracemalloc
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.tns_energo.bills import (
+    BillCache,
+    BillEntry,
+    BillRetention,
+    evict_bills,
+    save_base64_file,
+)
+from custom_components.tns_energo.const import (
+    BILL_ACCESS_SAVE_DELAY,
+    BILL_DECODE_CHUNK_SIZE,
+    BILL_STORAGE_KEY,
+)
+
+
+def test_save_base64_file(tmp_path: Path) -> None:
+    """Test chunked decode matches a full decode and leaves no temp files."""
+    raw = os.urandom(3 * BILL_DECODE_CHUNK_SIZE + 123)
+    file_path = tmp_path / "bills" / "bill.pdf"
+
+    size, sha256 = save_base64_file(file_path, base64.b64encode(raw).decode())
+
+    assert size == len(raw)
+    assert sha256 == hashlib.sha256(raw).hexdigest()
+    assert file_path.read_bytes() == raw
+    assert os.listdir(file_path.parent) == ["bill.pdf"]
+
+
+def test_save_base64_file_line_wrapped(tmp_path: Path) -> None:
+    """Test base64 data wrapped into lines is decoded correctly."""
+    raw = os.urandom(2 * BILL_DECODE_CHUNK_SIZE)
+    data = base64.b64encode(raw).decode()
+    wrapped = "\n".join(data[i : i + 76] for i in range(0, len(data), 76))
+
+    save_base64_file(tmp_path / "bill.pdf", wrapped)
+
+    assert (tmp_path / "bill.pdf").read_bytes() == raw
+
+
+def test_save_base64_file_other_whitespace(tmp_path: Path) -> None:
+    """Test whitespace other than spaces and line breaks is skipped."""
+    raw = os.urandom(2 * BILL_DECODE_CHUNK_SIZE)
+    data = base64.b64encode(raw).decode()
+    data = f"{data[:10]}\t{data[10:]}"
+
+    save_base64_file(tmp_path / "bill.pdf", data)
+
+    assert (tmp_path / "bill.pdf").read_bytes() == raw
+
+
+def test_save_base64_file_invalid_keeps_old_file(tmp_path: Path) -> None:
+    """Test a failed decode keeps the previous bill and removes the temp file."""
+    file_path = tmp_path / "bill.pdf"
+    file_path.write_bytes(b"old bill")
+
+    with pytest.raises(ValueError):
+        save_base64_file(file_path, "not base64!")
+
+    assert file_path.read_bytes() == b"old bill"
+    assert os.listdir(tmp_path) == ["bill.pdf"]
+
+
+def test_save_base64_file_peak_memory(tmp_path: Path) -> None:
+    """Benchmark peak memory of saving a large synthetic invoice."""
+    raw = os.urandom(16 * 1024 * 1024)
+    data = base64.b64encode(raw).decode()
+    del raw
+
+    tracemalloc.start()
+    try:
+        size, _ = save_base64_file(tmp_path / "bill.pdf", data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size == 16 * 1024 * 1024
+    # A full decode would allocate the whole 16 MiB file at once
+    assert peak < 1024 * 1024
+
+
+def _make_bills(tmp_path: Path, *specs: tuple[str, str, int, int]) -> list[BillEntry]:
+    """Create bill files and manifest entries: account, month, size, accessed day."""
+    entries = []
+    for account_number, month, size, day in specs:
+        filename = f"{account_number}_{month}.pdf"
+        (tmp_path / filename).write_bytes(b"x" * size)
+        accessed = datetime(2026, 3, day, tzinfo=UTC)
+        entries.append(
+            BillEntry(
+                account_number=account_number,
+                month=month,
+                file=filename,
+                size=size,
+                sha256="",
+                fetched=accessed,
+                accessed=accessed,
+            )
+        )
+    return entries
+
+
+def test_evict_bills_max_age(tmp_path: Path) -> None:
+    """Test bills older than the age limit are removed."""
+    entries = _make_bills(
+        tmp_path, ("1", "2025-02", 10, 1), ("1", "2025-03", 10, 2)
+    )
+
+    evicted = evict_bills(
+        tmp_path, entries, BillRetention(max_age=12), date(2026, 3, 10)
+    )
+
+    assert [entry.month for entry in evicted] == ["2025-02"]
+    assert os.listdir(tmp_path) == ["1_2025-03.pdf"]
+
+
+def test_evict_bills_least_recently_used(tmp_path: Path) -> None:
+    """Test file count and size limits remove least recently used bills."""
+    entries = _make_bills(
+        tmp_path,
+        ("1", "2026-01", 10, 3),
+        ("1", "2025-12", 10, 1),
+        ("1", "2025-11", 10, 5),
+        ("2", "2026-01", 30, 2),
+        ("2", "2025-12", 10, 4),
+    )
+
+    evicted = evict_bills(
+        tmp_path, entries, BillRetention(max_files=2), date(2026, 3, 10)
+    )
+    assert [(e.account_number, e.month) for e in evicted] == [("1", "2025-12")]
+
+    evicted = evict_bills(
+        tmp_path,
+        [entry for entry in entries if entry not in evicted],
+        BillRetention(max_bytes=25),
+        date(2026, 3, 10),
+    )
+    assert [(e.account_number, e.month) for e in evicted] == [
+        ("2", "2026-01"),
+        ("1", "2026-01"),
+    ]
+    assert sorted(os.listdir(tmp_path)) == ["1_2025-11.pdf", "2_2025-12.pdf"]
+
+
+def test_evict_bills_keeps_requested_bill(tmp_path: Path) -> None:
+    """Test the bill just requested is never removed."""
+    entries = _make_bills(tmp_path, ("1", "2020-01", 100, 1))
+
+    evicted = evict_bills(
+        tmp_path,
+        entries,
+        BillRetention(max_bytes=10, max_age=12),
+        date(2026, 3, 10),
+        keep=entries[0],
+    )
+
+    assert evicted == []
+    assert (tmp_path / "1_2020-01.pdf").exists()
+
+
+async def test_bill_cache_hit_saves_access_later(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+) -> None:
+    """Test a cache hit saves its access time with a delay, without listeners."""
+    (entry,) = _make_bills(tmp_path, ("1", "2026-01", 10, 1))
+    cache = BillCache(hass, tmp_path)
+    cache.entries["1", "2026-01"] = entry
+    listener = Mock()
+    cache.async_add_listener(listener)
+
+    hit = await cache.async_get("1", "2026-01")
+    assert hit is not None
+    assert hit.accessed > entry.accessed
+    assert BILL_STORAGE_KEY not in hass_storage
+
+    freezer.tick(timedelta(seconds=BILL_ACCESS_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    (saved,) = hass_storage[BILL_STORAGE_KEY]["data"]["bills"]
+    assert saved["accessed"] == hit.accessed.isoformat()
+    listener.assert_not_called()
@@ -0,0 +1,156 @@
+"""Tests for TNS-Energo binary sensor entities."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+from unittest.mock import AsyncMock
+
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.tns_energo.const import ATTR_ANOMALIES, DOMAIN
+
+from .const import MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+
+# Monthly T1 consumption from 2025-06 to 2025-12, T2 is always 50
+USUAL_CONSUMPTION = [100, 110, 90, 105, 95, 100, 110]
+
+
+def _history(consumption: list[int]) -> list[dict[str, Any]]:
+    """Return a readings history response of monthly T1 consumption from 2025-06."""
+    periods: list[dict[str, Any]] = []
+    for index, value in enumerate(consumption):
+        reading_date = date(2025 + (index + 5) // 12, (index + 5) % 12 + 1, 24)
+        date_str = reading_date.strftime("%d.%m.%y")
+        periods.append(
+            {
+                "readings": [
+                    {"name": "День", "date": date_str, "consumption": str(value)},
+                    {"name": "Ночь", "date": date_str, "consumption": "50"},
+                ]
+            }
+        )
+    return periods[::-1]
+
+
+def _get_entity_id(hass: HomeAssistant) -> str:
+    """Return the entity ID of the consumption anomaly sensor."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "binary_sensor", DOMAIN, "10000001_consumption_anomaly"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+async def test_consumption_anomaly_unavailable_short_history(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the anomaly sensor is unavailable without enough history."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(_get_entity_id(hass))
+    assert state is not None
+    assert state.state == STATE_UNAVAILABLE
+
+
+async def test_consumption_anomaly(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test new readings far from the usual consumption are flagged."""
+    mock_api.async_get_counter_readings.return_value = _history(
+        [*USUAL_CONSUMPTION, 105]
+    )
+    mock_config_entry.add_to_hass(hass)
+    events = async_capture_events(hass, f"{DOMAIN}_consumption_anomaly")
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = _get_entity_id(hass)
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == STATE_OFF
+    assert state.attributes["Медиана потребления"] == 150.0
+
+    # A higher but usual month is not an anomaly
+    mock_api.async_get_counter_readings.return_value = _history(
+        [*USUAL_CONSUMPTION, 105, 115]
+    )
+    await mock_config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == STATE_OFF
+    assert events == []
+
+    mock_api.async_get_counter_readings.return_value = _history(
+        [*USUAL_CONSUMPTION, 105, 115, 400]
+    )
+    await mock_config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == STATE_ON
+    assert state.attributes["Потребление за месяц"] == 450.0
+
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "10000001")})
+    assert device is not None
+    assert len(events) == 1
+    (anomaly,) = events[0].data[ATTR_ANOMALIES]
+    assert anomaly["device_id"] == device.id
+    assert anomaly["counter_id"] == "10000001"
+    assert anomaly["date"] == date(2026, 3, 1)
+    assert anomaly["consumption"] == 450.0
+    assert anomaly["score"] >= 3.5
+
+    # Refreshes without new readings do not repeat the event
+    await mock_config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+
+    # Another reading in the same month does not report the anomaly again
+    later_reading = {
+        "readings": [
+            {"name": "День", "date": "28.03.26", "consumption": "10"},
+            {"name": "Ночь", "date": "28.03.26", "consumption": "0"},
+        ]
+    }
+    mock_api.async_get_counter_readings.return_value = [
+        later_reading,
+        *_history([*USUAL_CONSUMPTION, 105, 115, 400]),
+    ]
+    await mock_config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == STATE_ON
+    assert state.attributes["Потребление за месяц"] == 460.0
+    assert len(events) == 1
+
+    # An anomaly of the next month is reported
+    mock_api.async_get_counter_readings.return_value = [
+        *_history([*USUAL_CONSUMPTION, 105, 115, 400, 420])[:1],
+        later_reading,
+        *_history([*USUAL_CONSUMPTION, 105, 115, 400]),
+    ]
+    await mock_config_entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    (anomaly,) = events[1].data[ATTR_ANOMALIES]
+    assert anomaly["date"] == date(2026, 4, 1)
@@ -13,8 +13,11 @@ from homeassistant.data_entry_flow import FlowResultType
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.tns_energo.const import (
+    CONF_LEAN_ATTRIBUTES,
     CONF_REGION,
     CONF_SCAN_INTERVAL,
+    CONF_TARIFF_T1,
+    CONF_TARIFF_T2,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
 )
@@ -646,3 +649,45 @@ async def test_options_flow_success(
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert result["data"] == {CONF_SCAN_INTERVAL: 30}
+
+
+async def test_options_flow_lean_attributes(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test options flow stores the lean attribute profile."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(
+        mock_config_entry.entry_id
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_SCAN_INTERVAL: 24, CONF_LEAN_ATTRIBUTES: True},
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_SCAN_INTERVAL: 24, CONF_LEAN_ATTRIBUTES: True}
+
+
+async def test_options_flow_tariff_rates(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test options flow stores the tariff rates."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(
+        mock_config_entry.entry_id
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_SCAN_INTERVAL: 24, CONF_TARIFF_T1: "6.5", CONF_TARIFF_T2: 3},
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        CONF_SCAN_INTERVAL: 24,
+        CONF_TARIFF_T1: 6.5,
+        CONF_TARIFF_T2: 3.0,
+    }
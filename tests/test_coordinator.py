@@ -1,15 +1,21 @@
 """Tests for the TNS-Energo coordinator."""
 from __future__ import annotations
 
+import asyncio
+from datetime import date
+from typing import Any
 from unittest.mock import AsyncMock
 
+import pytest
 from aiotnse.exceptions import TNSEApiError, TNSEAuthError
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.tns_energo.const import (
+    API_MAX_CONCURRENT_REQUESTS,
     CONF_ACCESS_TOKEN,
     CONF_ACCESS_TOKEN_EXPIRES,
     CONF_REFRESH_TOKEN,
@@ -18,12 +24,10 @@ from custom_components.tns_energo.const import (
     DOMAIN,
 )
 from custom_components.tns_energo.coordinator import TNSEAccountData
+from custom_components.tns_energo.models import UNAVAILABLE_ROW, EntityRow, Payment
 
 from .const import (
     MOCK_ACCOUNTS_RESPONSE,
-    MOCK_BALANCE_RESPONSE,
-    MOCK_COUNTERS_MULTI,
-    MOCK_COUNTERS_RESPONSE,
     MOCK_EMAIL,
     MOCK_HISTORY_EMPTY_RESPONSE,
     MOCK_HISTORY_RESPONSE,
@@ -52,10 +56,11 @@ async def test_coordinator_first_refresh(
     assert isinstance(account, TNSEAccountData)
     assert account.number == "610000000001"
     assert account.id == 100001
-    assert account.info.get("totalArea") == 65
-    assert account.balance.get("sumToPay") == 1500.5
+    assert account.info.total_area == 65
+    assert account.balance is not None
+    assert account.balance.sum_to_pay == 1500.5
     assert len(account.counters) == 1
-    assert account.counters[0]["counterId"] == "10000001"
+    assert account.counters[0].counter_id == "10000001"
 
 
 async def test_coordinator_update_time(
@@ -133,6 +138,46 @@ async def test_coordinator_api_error_retries(
     assert call_count == 2
 
 
+async def test_coordinator_limiter_released_between_retries(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test requests waiting for a retry do not hold the request limiter."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    monkeypatch.setattr(
+        "custom_components.tns_energo.decorators.API_RETRY_DELAY", 60
+    )
+    mock_api.async_get_history.reset_mock()
+    mock_api.async_get_history.side_effect = TNSEApiError("Transient error")
+
+    # Fill every limiter slot with a request that waits for its retry
+    failing = [
+        asyncio.create_task(
+            coordinator._async_get_history("610000000001", 2026, 1)
+        )
+        for _ in range(API_MAX_CONCURRENT_REQUESTS)
+    ]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert mock_api.async_get_history.await_count == API_MAX_CONCURRENT_REQUESTS
+    assert not coordinator.request_limiter.locked()
+
+    async with asyncio.timeout(1):
+        assert await coordinator._async_get_accounts() == MOCK_ACCOUNTS_RESPONSE
+
+    for task in failing:
+        task.cancel()
+    await asyncio.gather(*failing, return_exceptions=True)
+
+
 async def test_coordinator_api_error_update_failed(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
@@ -302,206 +347,6 @@ async def test_coordinator_token_update_callback(
     assert entry.data[CONF_PASSWORD] == MOCK_PASSWORD
 
 
-# --- Pure unit tests for TNSEAccountData accessors ---
-
-
-def _make_account(**kwargs) -> TNSEAccountData:
-    """Create a TNSEAccountData with defaults."""
-    defaults = {
-        "id": 1,
-        "number": "610000000001",
-        "name": "",
-        "address": "",
-    }
-    defaults.update(kwargs)
-    return TNSEAccountData(**defaults)
-
-
-class TestHasBalance:
-    """Tests for has_balance property."""
-
-    def test_has_balance(self) -> None:
-        assert _make_account(balance=MOCK_BALANCE_RESPONSE).has_balance is True
-        assert _make_account(balance={}).has_balance is False
-
-
-class TestBalanceAccessors:
-    """Tests for sum_to_pay, debt, closed_month properties."""
-
-    def test_sum_to_pay(self) -> None:
-        account = _make_account(balance=MOCK_BALANCE_RESPONSE)
-        assert account.sum_to_pay == 1500.5
-
-    def test_sum_to_pay_empty(self) -> None:
-        assert _make_account(balance={}).sum_to_pay is None
-
-    def test_debt(self) -> None:
-        account = _make_account(balance=MOCK_BALANCE_RESPONSE)
-        assert account.debt == 0
-
-    def test_debt_empty(self) -> None:
-        assert _make_account(balance={}).debt is None
-
-    def test_closed_month(self) -> None:
-        account = _make_account(balance=MOCK_BALANCE_RESPONSE)
-        assert account.closed_month == "01.02.26"
-
-    def test_closed_month_empty(self) -> None:
-        assert _make_account(balance={}).closed_month is None
-
-
-class TestCounterIndexedMethods:
-    """Tests for counter-indexed methods on TNSEAccountData."""
-
-    def test_get_counter(self) -> None:
-        counters = MOCK_COUNTERS_MULTI
-        account = _make_account(counters=counters)
-        assert account.get_counter(0) is counters[0]
-        assert account.get_counter(1) is counters[1]
-        assert account.get_counter(2) is None
-
-    def test_get_counter_id(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_MULTI)
-        assert account.get_counter_id(0) == "10000001"
-        assert account.get_counter_id(1) == "10000002"
-        assert account.get_counter_id(2) is None
-
-    def test_get_counter_row_id(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_MULTI)
-        assert account.get_counter_row_id(0) == "2000001"
-        assert account.get_counter_row_id(1) == "2000002"
-        assert account.get_counter_row_id(2) is None
-
-    def test_get_counter_readings(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_MULTI)
-        readings_0 = account.get_counter_readings(0)
-        assert len(readings_0) == 2
-        assert readings_0[0]["name"] == "День"
-
-        readings_1 = account.get_counter_readings(1)
-        assert len(readings_1) == 1
-        assert readings_1[0]["name"] == "Основной"
-
-        assert account.get_counter_readings(2) == []
-
-    def test_get_counter_tariff_count(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_MULTI)
-        assert account.get_counter_tariff_count(0) == 2
-        assert account.get_counter_tariff_count(1) == 1
-        assert account.get_counter_tariff_count(2) == 0
-
-    def test_get_counter_reading(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_MULTI)
-        reading = account.get_counter_reading(0, 0)
-        assert reading is not None
-        assert reading["name"] == "День"
-        assert reading["value"] == "3500"
-
-        reading = account.get_counter_reading(0, 1)
-        assert reading is not None
-        assert reading["name"] == "Ночь"
-
-        reading = account.get_counter_reading(1, 0)
-        assert reading is not None
-        assert reading["name"] == "Основной"
-
-        assert account.get_counter_reading(0, 2) is None
-        assert account.get_counter_reading(1, 1) is None
-        assert account.get_counter_reading(2, 0) is None
-
-    def test_no_counters(self) -> None:
-        account = _make_account(counters=[])
-        assert account.get_counter(0) is None
-        assert account.get_counter_id(0) is None
-        assert account.get_counter_row_id(0) is None
-        assert account.get_counter_readings(0) == []
-        assert account.get_counter_tariff_count(0) == 0
-        assert account.get_counter_reading(0, 0) is None
-
-    def test_get_counter_place(self) -> None:
-        """Test get_counter_place returns place from countersInfo."""
-        from .const import MOCK_ACCOUNT_INFO_RESPONSE
-
-        account = _make_account(
-            counters=MOCK_COUNTERS_RESPONSE,
-            info=MOCK_ACCOUNT_INFO_RESPONSE,
-        )
-        # Counter exists but place is empty string → returns None (or None)
-        place = account.get_counter_place(0)
-        # countersInfo has place="" for 10000001, `or None` returns None
-        assert place is None
-
-    def test_get_counter_place_out_of_range(self) -> None:
-        """Test get_counter_place returns None for out-of-range counter index."""
-        account = _make_account(counters=[])
-        assert account.get_counter_place(0) is None
-
-
-class TestCounterConsumption:
-    """Tests for get_counter_consumption method."""
-
-    def test_consumption_value(self) -> None:
-        account = _make_account(
-            counters=MOCK_COUNTERS_RESPONSE,
-            counter_consumption={
-                "10000001": [
-                    {"consumption": "120"},
-                    {"consumption": "60"},
-                ]
-            },
-        )
-        assert account.get_counter_consumption(0, 0) == 120.0
-        assert account.get_counter_consumption(0, 1) == 60.0
-
-    def test_consumption_no_data(self) -> None:
-        account = _make_account(counters=MOCK_COUNTERS_RESPONSE)
-        assert account.get_counter_consumption(0, 0) is None
-
-    def test_consumption_out_of_range(self) -> None:
-        account = _make_account(
-            counters=MOCK_COUNTERS_RESPONSE,
-            counter_consumption={
-                "10000001": [{"consumption": "120"}]
-            },
-        )
-        assert account.get_counter_consumption(0, 5) is None
-
-    def test_consumption_no_counter(self) -> None:
-        account = _make_account(counters=[])
-        assert account.get_counter_consumption(0, 0) is None
-
-    def test_consumption_none_value(self) -> None:
-        account = _make_account(
-            counters=MOCK_COUNTERS_RESPONSE,
-            counter_consumption={
-                "10000001": [{"consumption": None}]
-            },
-        )
-        assert account.get_counter_consumption(0, 0) is None
-
-    def test_consumption_non_numeric_value(self) -> None:
-        """Test consumption returns None for non-numeric string."""
-        account = _make_account(
-            counters=MOCK_COUNTERS_RESPONSE,
-            counter_consumption={
-                "10000001": [{"consumption": "abc"}]
-            },
-        )
-        assert account.get_counter_consumption(0, 0) is None
-
-
-class TestLastPayment:
-    """Tests for has_last_payment property."""
-
-    def test_has_last_payment(self) -> None:
-        account = _make_account(last_payment_amount=1200.0, last_payment_date="15.01.26")
-        assert account.has_last_payment is True
-
-    def test_no_last_payment(self) -> None:
-        account = _make_account()
-        assert account.has_last_payment is False
-
-
 async def test_coordinator_fetches_counter_consumption(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
@@ -516,9 +361,10 @@ async def test_coordinator_fetches_counter_consumption(
 
     coordinator = mock_config_entry.runtime_data
     account = coordinator.data[0]
-    assert "10000001" in account.counter_consumption
-    assert account.get_counter_consumption(0, 0) == 120.0
-    assert account.get_counter_consumption(0, 1) == 60.0
+    counter = account.get_counter("10000001")
+    assert counter is not None
+    assert counter.readings[0].consumption == 120.0
+    assert counter.readings[1].consumption == 60.0
 
 
 async def test_coordinator_fetches_last_payment(
@@ -536,8 +382,9 @@ async def test_coordinator_fetches_last_payment(
     coordinator = mock_config_entry.runtime_data
     account = coordinator.data[0]
     assert account.has_last_payment is True
-    assert account.last_payment_amount == 1200.0
-    assert account.last_payment_date == "15.01.26"
+    assert account.last_payment == Payment(
+        amount=1200.0, payment_date=date(2026, 1, 15)
+    )
 
 
 async def test_coordinator_counter_readings_failure_non_critical(
@@ -556,7 +403,11 @@ async def test_coordinator_counter_readings_failure_non_critical(
     coordinator = mock_config_entry.runtime_data
     assert coordinator.last_update_success is True
     account = coordinator.data[0]
-    assert account.counter_consumption == {}
+    assert all(
+        reading.consumption is None
+        for counter in account.counters
+        for reading in counter.readings
+    )
 
 
 async def test_coordinator_history_failure_non_critical(
@@ -585,10 +436,14 @@ async def test_coordinator_history_fallback_previous_month(
     mock_api: AsyncMock,
 ) -> None:
     """Test history falls back to previous month when current month has no payments."""
-    mock_api.async_get_history.side_effect = [
-        MOCK_HISTORY_EMPTY_RESPONSE,
-        MOCK_HISTORY_RESPONSE,
-    ]
+    current = dt_util.now().date()
+
+    async def _get_history(account: str, year: int, month: int) -> dict[str, Any]:
+        if (year, month) == (current.year, current.month):
+            return MOCK_HISTORY_EMPTY_RESPONSE
+        return MOCK_HISTORY_RESPONSE
+
+    mock_api.async_get_history.side_effect = _get_history
     mock_config_entry.add_to_hass(hass)
 
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -597,4 +452,57 @@ async def test_coordinator_history_fallback_previous_month(
     coordinator = mock_config_entry.runtime_data
     account = coordinator.data[0]
     assert account.has_last_payment is True
-    assert account.last_payment_amount == 1200.0
+    assert account.last_payment is not None
+    assert account.last_payment.amount == 1200.0
+
+
+async def test_coordinator_renders_entity_rows(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the coordinator renders one row per entity on each refresh."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.rows["610000000001_cost"] == EntityRow(
+        available=True,
+        value=1500.5,
+        attributes={
+            "Сумма без округления": 1500.5,
+            "Сумма без доп. начислений": 0.0,
+            "Сумма с доп. начислениями": 1500.5,
+        },
+    )
+    assert coordinator.rows["10000001_t2_reading"].value == 1500.0
+
+    mock_api.async_get_balance.return_value = {}
+    await coordinator.async_refresh()
+
+    assert coordinator.rows["610000000001_cost"] is UNAVAILABLE_ROW
+    assert coordinator.rows["10000001_t2_reading"].value == 1500.0
+
+
+async def test_coordinator_rows_removed_on_unload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test entity row builders are dropped when entities are removed."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.rows
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert coordinator.rows == {}
@@ -0,0 +1,189 @@
+"""Tests for the TNS-Energo local cost estimate."""
+from __future__ import annotations
+
+from datetime import date
+from unittest.mock import AsyncMock
+
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tns_energo.const import (
+    CONF_REGION,
+    CONF_TARIFF_T1,
+    CONF_TARIFF_T2,
+    DOMAIN,
+)
+from custom_components.tns_energo.cost import CostEstimate, TariffCostEngine
+from custom_components.tns_energo.models import Counter, parse_counter
+from custom_components.tns_energo.readings_store import ReadingsStore
+
+from .const import (
+    MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+    MOCK_COUNTERS_RESPONSE,
+    MOCK_EMAIL,
+    MOCK_PASSWORD,
+    MOCK_REGION,
+)
+
+
+def _make_counter(*periods: tuple[str, str, str]) -> Counter:
+    """Return the mocked counter with new (date, T1, T2) readings."""
+    counter = parse_counter(
+        MOCK_COUNTERS_RESPONSE[0],
+        history=[
+            *(
+                {
+                    "readings": [
+                        {"value": t1, "date": reading_date},
+                        {"value": t2, "date": reading_date},
+                    ]
+                }
+                for reading_date, t1, t2 in reversed(periods)
+            ),
+            *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+        ],
+    )
+    assert counter is not None
+    return counter
+
+
+async def _async_update(
+    store: ReadingsStore, engine: TariffCostEngine, counter: Counter
+) -> None:
+    """Store the counter history and add the new periods to the engine."""
+    engine.update(store, [counter], await store.async_update([counter]))
+
+
+async def test_cost_running_estimate(hass: HomeAssistant) -> None:
+    """Test new readings are added to the estimate of their month."""
+    store = ReadingsStore(hass, "test")
+    engine = TariffCostEngine([6.0, 3.0, 0.0])
+    assert engine.enabled
+
+    counter = _make_counter()
+    await _async_update(store, engine, counter)
+    # January: 120 kWh of T1 and 60 kWh of T2
+    assert engine.get_estimate(counter) == CostEstimate(
+        month=date(2026, 1, 1), consumption=180.0, cost=900.0
+    )
+
+    # Without a reported consumption the reading difference is used
+    counter = _make_counter(("10.02.26", "3550", "1520"))
+    await _async_update(store, engine, counter)
+    assert engine.get_estimate(counter) == CostEstimate(
+        month=date(2026, 2, 1), consumption=70.0, cost=360.0
+    )
+
+    counter = _make_counter(
+        ("10.02.26", "3550", "1520"), ("20.02.26", "3600", "1540")
+    )
+    await _async_update(store, engine, counter)
+    estimate = engine.get_estimate(counter)
+    assert estimate == CostEstimate(
+        month=date(2026, 2, 1), consumption=140.0, cost=720.0
+    )
+
+    # An engine seeded from the stored history has the same estimate
+    loaded = ReadingsStore(hass, "test")
+    await loaded.async_load()
+    seeded = TariffCostEngine([6.0, 3.0, 0.0])
+    seeded.update(loaded, [counter], {})
+    assert seeded.get_estimate(counter) == estimate
+
+
+async def test_cost_without_rates(hass: HomeAssistant) -> None:
+    """Test there is no estimate unless all tariff zones have a rate."""
+    store = ReadingsStore(hass, "test")
+    counter = _make_counter()
+
+    engine = TariffCostEngine([6.0, 0.0, 0.0])
+    await _async_update(store, engine, counter)
+    assert engine.get_estimate(counter) is None
+
+    engine = TariffCostEngine([0.0, 0.0, 0.0])
+    assert not engine.enabled
+    engine.update(store, [counter], {})
+    assert engine.get_estimate(counter) is None
+
+
+async def test_cost_sensors(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the counter and account cost estimate sensors."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: MOCK_EMAIL,
+            CONF_PASSWORD: MOCK_PASSWORD,
+            CONF_REGION: MOCK_REGION,
+        },
+        options={CONF_TARIFF_T1: 6.0, CONF_TARIFF_T2: 3.0},
+        unique_id=MOCK_EMAIL,
+        version=2,
+        minor_version=0,
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, "10000001_month_cost_estimate"
+    )
+    assert entity_id is not None
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert float(state.state) == 900.0
+    assert state.attributes["Месяц показаний"] == date(2026, 1, 1)
+    assert state.attributes["Потребление"] == 180.0
+
+    state = hass.states.get("sensor.ls_no610000000001_month_cost_estimate")
+    assert state is not None
+    assert float(state.state) == 900.0
+
+    mock_api.async_get_counter_readings.return_value = [
+        {
+            "readings": [
+                {"value": "3550", "date": "10.02.26"},
+                {"value": "1520", "date": "10.02.26"},
+            ]
+        },
+        *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+    ]
+    await entry.runtime_data.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert float(state.state) == 360.0
+
+
+async def test_cost_sensor_unavailable_without_rates(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the counter cost estimate is unavailable without tariff rates."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, "10000001_month_cost_estimate"
+    )
+    assert entity_id is not None
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "unavailable"
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import date
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from homeassistant.core import HomeAssistant
@@ -12,12 +12,14 @@ from custom_components.tns_energo.const import DOMAIN
 from custom_components.tns_energo.helpers import (
     to_date,
     to_float,
+    to_int,
     to_str,
     get_account,
     get_counter_data,
     get_identifier_from_device,
     get_coordinator,
     get_device_entry_by_device_id,
+    get_device_target,
     get_float_value,
     get_previous_month,
 )
@@ -46,6 +48,14 @@ def test_to_float() -> None:
     assert to_float("invalid") is None
 
 
+def test_to_int() -> None:
+    """Test to_int helper."""
+    assert to_int("2") == 2
+    assert to_int(3) == 3
+    assert to_int(None) is None
+    assert to_int("invalid") is None
+
+
 def test_to_date() -> None:
     """Test to_date helper."""
     result = to_date("24.01.26", "%d.%m.%y")
@@ -149,7 +159,6 @@ async def test_get_account_not_found(
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    coordinator = mock_config_entry.runtime_data
     device_registry = dr.async_get(hass)
 
     # Create device with DOMAIN identifier but unknown account number
@@ -159,7 +168,7 @@ async def test_get_account_not_found(
     )
 
     with pytest.raises(ValueError, match="Account 999999999999 not found"):
-        get_account(hass, coordinator, device.id)
+        get_account(hass, device.id)
 
 
 async def test_get_account_no_account_number(
@@ -176,7 +185,6 @@ async def test_get_account_no_account_number(
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    coordinator = mock_config_entry.runtime_data
     device_registry = dr.async_get(hass)
 
     # Create device with non-DOMAIN identifiers
@@ -186,7 +194,7 @@ async def test_get_account_no_account_number(
     )
 
     with pytest.raises(ValueError, match="No account number found"):
-        get_account(hass, coordinator, device.id)
+        get_account(hass, device.id)
 
 
 async def test_get_float_value(
@@ -218,7 +226,6 @@ async def test_get_counter_data(
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    coordinator = mock_config_entry.runtime_data
     device_registry = dr.async_get(hass)
 
     # Get counter device (created by sensor platform)
@@ -227,10 +234,10 @@ async def test_get_counter_data(
     )
     assert counter_device is not None
 
-    account, counter = get_counter_data(hass, coordinator, counter_device.id)
+    account, counter = get_counter_data(hass, counter_device.id)
     assert account.number == "610000000001"
-    assert counter["counterId"] == "10000001"
-    assert counter["rowId"] == "2000001"
+    assert counter.counter_id == "10000001"
+    assert counter.row_id == "2000001"
 
 
 async def test_get_counter_data_no_identifier(
@@ -247,7 +254,6 @@ async def test_get_counter_data_no_identifier(
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    coordinator = mock_config_entry.runtime_data
     device_registry = dr.async_get(hass)
 
     # Create device with non-DOMAIN identifiers
@@ -257,7 +263,7 @@ async def test_get_counter_data_no_identifier(
     )
 
     with pytest.raises(ValueError, match="No identifier found"):
-        get_counter_data(hass, coordinator, device.id)
+        get_counter_data(hass, device.id)
 
 
 async def test_get_counter_data_not_found(
@@ -274,7 +280,6 @@ async def test_get_counter_data_not_found(
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    coordinator = mock_config_entry.runtime_data
     device_registry = dr.async_get(hass)
 
     # Create device with unknown counter ID
@@ -284,4 +289,60 @@ async def test_get_counter_data_not_found(
     )
 
     with pytest.raises(ValueError, match="Counter 99999999 not found"):
-        get_counter_data(hass, coordinator, device.id)
+        get_counter_data(hass, device.id)
+
+
+async def test_get_device_target_cached(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test device targets are cached until registry or data changes."""
+    from homeassistant.helpers import device_registry as dr
+
+    from .const import MOCK_BALANCE_RESPONSE
+
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    device_registry = dr.async_get(hass)
+    counter_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, "10000001")}
+    )
+    assert counter_device is not None
+
+    target = get_device_target(hass, counter_device.id)
+    assert target.coordinator is coordinator
+    assert target.account is coordinator.accounts["610000000001"]
+    assert target.counter is coordinator.counters["10000001"]
+
+    # Cached: no registry lookup on repeated resolution
+    with patch.object(
+        device_registry, "async_get", side_effect=AssertionError
+    ):
+        assert get_device_target(hass, counter_device.id) is target
+        assert get_counter_data(hass, counter_device.id) == (
+            target.account,
+            target.counter,
+        )
+
+    # Coordinator data change invalidates the cache
+    mock_api.async_get_balance.return_value = {
+        **MOCK_BALANCE_RESPONSE,
+        "sumToPay": 1.0,
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    new_target = get_device_target(hass, counter_device.id)
+    assert new_target is not target
+    assert new_target.account is coordinator.accounts["610000000001"]
+
+    # Device registry update invalidates the cache
+    device_registry.async_update_device(counter_device.id, name_by_user="Meter")
+    await hass.async_block_till_done()
+    assert get_device_target(hass, counter_device.id) is not new_target
@@ -1,17 +1,27 @@
 """Tests for the TNS-Energo integration setup."""
 from __future__ import annotations
 
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
 
-from custom_components.tns_energo.const import CONF_REGION, DOMAIN
+from custom_components.tns_energo.const import BILL_STORAGE_KEY, CONF_REGION, DOMAIN
 
-from .const import MOCK_EMAIL, MOCK_PASSWORD, MOCK_REGION
+from .const import (
+    MOCK_BALANCE_RESPONSE,
+    MOCK_EMAIL,
+    MOCK_INVOICE_FILE_RESPONSE,
+    MOCK_PASSWORD,
+    MOCK_REGION,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -222,6 +232,150 @@ async def test_stale_counter_device_removal(
     assert valid_account is not None
 
 
+async def test_setup_registers_devices_once(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Benchmark setup with hundreds of counters against registry updates."""
+    from homeassistant.helpers import device_registry as dr
+
+    counter_count = 300
+    mock_api.async_get_counters.return_value = [
+        {
+            "counterId": str(20000000 + i),
+            "rowId": str(3000000 + i),
+            "installationType": "",
+            "tariff": 2,
+            "checkingDate": "01.01.2040",
+            "lastReadings": [
+                {"name": "День", "value": "3500", "date": "24.01.26"},
+                {"name": "Ночь", "value": "1500", "date": "24.01.26"},
+            ],
+        }
+        for i in range(counter_count)
+    ]
+
+    actions: list[str] = []
+
+    @callback
+    def _async_device_updated(event: Event) -> None:
+        actions.append(event.data["action"])
+
+    hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, _async_device_updated)
+
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    # One create per account and counter device, no merge updates
+    assert actions.count("create") == counter_count + 1
+    assert actions.count("update") == 0
+
+    coordinator = mock_config_entry.runtime_data
+    assert len(coordinator.device_infos) == counter_count + 1
+
+    device_registry = dr.async_get(hass)
+    counter_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, "20000000")}
+    )
+    account_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, "610000000001")}
+    )
+    assert counter_device is not None
+    assert account_device is not None
+    assert counter_device.via_device_id == account_device.id
+
+    # Refresh keeps the shared device info objects
+    device_info = coordinator.device_infos["20000000"]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.device_infos["20000000"] is device_info
+
+
+async def test_stale_devices_reconciled_after_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Scale test: only devices whose identifiers disappeared are removed."""
+    from homeassistant.helpers import device_registry as dr
+
+    def _counters(count: int) -> list[dict]:
+        return [
+            {
+                "counterId": str(20000000 + i),
+                "rowId": str(3000000 + i),
+                "tariff": 1,
+                "lastReadings": [
+                    {"name": "Основной", "value": "8000", "date": "24.01.26"},
+                ],
+            }
+            for i in range(count)
+        ]
+
+    mock_api.async_get_counters.return_value = _counters(1000)
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Another entry with its own devices, sharing the last 100 counters
+    other_entry = MockConfigEntry(domain=DOMAIN, unique_id="other@example.com")
+    other_entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    for i in range(2000):
+        device_registry.async_get_or_create(
+            config_entry_id=other_entry.entry_id,
+            identifiers={(DOMAIN, str(40000000 + i))},
+        )
+    for i in range(900, 1000):
+        device_registry.async_get_or_create(
+            config_entry_id=other_entry.entry_id,
+            identifiers={(DOMAIN, str(20000000 + i))},
+        )
+
+    mock_api.async_get_counters.return_value = _counters(500)
+    coordinator = mock_config_entry.runtime_data
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    entry_devices = dr.async_entries_for_config_entry(
+        device_registry, mock_config_entry.entry_id
+    )
+    assert len(entry_devices) == 501
+    assert device_registry.async_get_device(
+        identifiers={(DOMAIN, "610000000001")}
+    )
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "20000499")})
+    assert not device_registry.async_get_device(
+        identifiers={(DOMAIN, "20000500")}
+    )
+
+    # Shared devices are only detached from the refreshed entry
+    shared = device_registry.async_get_device(identifiers={(DOMAIN, "20000950")})
+    assert shared is not None
+    assert shared.config_entries == {other_entry.entry_id}
+    assert (
+        len(dr.async_entries_for_config_entry(device_registry, other_entry.entry_id))
+        == 2100
+    )
+
+    # An unchanged refresh removes nothing
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert (
+        len(
+            dr.async_entries_for_config_entry(
+                device_registry, mock_config_entry.entry_id
+            )
+        )
+        == 501
+    )
+
+
 async def test_migrate_future_version(
     hass: HomeAssistant,
 ) -> None:
@@ -241,3 +395,149 @@ async def test_migrate_future_version(
     await hass.async_block_till_done()
 
     assert entry.state is ConfigEntryState.MIGRATION_ERROR
+
+
+# ---------------------------------------------------------------------------
+# Bill prefetch
+# ---------------------------------------------------------------------------
+
+
+async def test_bill_prefetch_first_closed_month_recorded(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the first closed month seen is recorded without a download."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_invoice_file.assert_not_awaited()
+    assert hass_storage[BILL_STORAGE_KEY]["data"]["closed_months"] == {
+        "610000000001": "2026-02"
+    }
+
+
+async def test_bill_prefetch_on_new_closed_month(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the bill is downloaded once when a new billing month closes."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    events = async_capture_events(hass, f"{DOMAIN}_new_bill")
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert not events
+
+    coordinator = mock_config_entry.runtime_data
+    mock_api.async_get_balance.return_value = {
+        **MOCK_BALANCE_RESPONSE,
+        "closedMonth": "01.03.26",
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_invoice_file.assert_awaited_once_with(
+        "610000000001", "01.03.2026"
+    )
+    assert len(events) == 1
+    assert events[0].data["file_path"].endswith("610000000001_2026-03.pdf")
+    assert events[0].data["url"].startswith(
+        "/api/tns_energo/bills/610000000001/2026-03"
+    )
+
+    # Further refreshes do not download the bill again
+    mock_api.async_get_balance.return_value = {
+        **MOCK_BALANCE_RESPONSE,
+        "closedMonth": "01.03.26",
+        "debt": 10,
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_invoice_file.assert_awaited_once()
+    assert len(events) == 1
+
+
+async def test_bill_prefetch_retried_after_failure(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a failed prefetch keeps the previous month to retry the download."""
+    from aiotnse.exceptions import TNSEApiError
+
+    mock_api.async_get_invoice_file = AsyncMock(side_effect=TNSEApiError("Down"))
+    events = async_capture_events(hass, f"{DOMAIN}_new_bill")
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = mock_config_entry.runtime_data
+    mock_api.async_get_balance.return_value = {
+        **MOCK_BALANCE_RESPONSE,
+        "closedMonth": "01.03.26",
+    }
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not events
+    assert hass_storage[BILL_STORAGE_KEY]["data"]["closed_months"] == {
+        "610000000001": "2026-02"
+    }
+
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_invoice_file.assert_awaited_once_with(
+        "610000000001", "01.03.2026"
+    )
+    assert len(events) == 1
+    assert hass_storage[BILL_STORAGE_KEY]["data"]["closed_months"] == {
+        "610000000001": "2026-03"
+    }
+
+
+async def test_bill_prefetch_after_restart(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a month closed while Home Assistant was stopped is prefetched."""
+    hass_storage[BILL_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": BILL_STORAGE_KEY,
+        "data": {"bills": [], "closed_months": {"610000000001": "2026-01"}},
+    }
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_get_invoice_file.assert_awaited_once_with(
+        "610000000001", "01.02.2026"
+    )
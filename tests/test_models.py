@@ -0,0 +1,204 @@
+"""Tests for TNS-Energo data models."""
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+from datetime import date
+
+import pytest
+
+from custom_components.tns_energo.models import (
+    Balance,
+    Counter,
+    TNSEAccountData,
+    parse_account_info,
+    parse_balance,
+    parse_counter,
+    parse_counter_places,
+    parse_last_payment,
+    parse_readings_history,
+)
+
+from .const import (
+    MOCK_ACCOUNT_INFO_RESPONSE,
+    MOCK_BALANCE_RESPONSE,
+    MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+    MOCK_COUNTER_READINGS_RESPONSE,
+    MOCK_COUNTERS_MULTI,
+    MOCK_COUNTERS_RESPONSE,
+    MOCK_HISTORY_EMPTY_RESPONSE,
+    MOCK_HISTORY_RESPONSE,
+)
+
+
+def _make_account(**kwargs) -> TNSEAccountData:
+    """Create a TNSEAccountData with defaults."""
+    defaults = {
+        "id": 1,
+        "number": "610000000001",
+        "name": "",
+        "address": "",
+    }
+    defaults.update(kwargs)
+    return TNSEAccountData(**defaults)
+
+
+class TestParseBalance:
+    """Tests for parse_balance."""
+
+    def test_balance(self) -> None:
+        balance = parse_balance(MOCK_BALANCE_RESPONSE)
+        assert balance is not None
+        assert balance.sum_to_pay == 1500.5
+        assert balance.debt == 0
+        assert balance.closed_month == date(2026, 2, 1)
+        assert balance.advance_type == "avg"
+        assert balance.advance_main == 1500.5
+
+    def test_balance_empty(self) -> None:
+        assert parse_balance({}) is None
+        assert parse_balance(None) is None
+
+    def test_has_balance(self) -> None:
+        assert _make_account(balance=parse_balance(MOCK_BALANCE_RESPONSE)).has_balance
+        assert not _make_account().has_balance
+
+    def test_balance_frozen(self) -> None:
+        balance = Balance(debt=1.0)
+        with pytest.raises(FrozenInstanceError):
+            balance.debt = 2.0  # type: ignore[misc]
+
+
+class TestParseAccountInfo:
+    """Tests for parse_account_info."""
+
+    def test_account_info(self) -> None:
+        info = parse_account_info(MOCK_ACCOUNT_INFO_RESPONSE)
+        assert info.total_area == 65
+        assert info.season_ratio == 0.9
+        assert info.number_persons == 0
+        assert info.document == "нет"
+
+    def test_account_info_empty(self) -> None:
+        info = parse_account_info(None)
+        assert info.address is None
+        assert info.total_area is None
+
+    def test_counter_places(self) -> None:
+        assert parse_counter_places(MOCK_ACCOUNT_INFO_RESPONSE) == {"10000001": ""}
+        assert parse_counter_places(None) == {}
+
+
+class TestParseCounter:
+    """Tests for parse_counter."""
+
+    def test_counter(self) -> None:
+        counter = parse_counter(MOCK_COUNTERS_MULTI[0])
+        assert counter is not None
+        assert counter.counter_id == "10000001"
+        assert counter.row_id == "2000001"
+        assert counter.tariff == 2
+        assert counter.tariff_count == 2
+        assert counter.readings_date == date(2026, 1, 24)
+
+        reading = counter.get_reading(0)
+        assert reading is not None
+        assert reading.name == "День"
+        assert reading.value == 3500.0
+        assert reading.reading_date_str == "24.01.26"
+        assert reading.consumption is None
+        assert counter.get_reading(2) is None
+
+    def test_counter_with_consumption(self) -> None:
+        counter = parse_counter(
+            MOCK_COUNTERS_RESPONSE[0],
+            consumption=MOCK_COUNTER_READINGS_RESPONSE[0]["readings"],
+        )
+        assert counter is not None
+        assert counter.readings[0].consumption == 120.0
+        assert counter.readings[1].consumption == 60.0
+
+    def test_counter_consumption_partial(self) -> None:
+        counter = parse_counter(
+            MOCK_COUNTERS_RESPONSE[0],
+            consumption=[{"consumption": "abc"}],
+        )
+        assert counter is not None
+        assert counter.readings[0].consumption is None
+        assert counter.readings[1].consumption is None
+
+    def test_counter_place(self) -> None:
+        counter = parse_counter(MOCK_COUNTERS_RESPONSE[0], place="Подъезд")
+        assert counter is not None
+        assert counter.place == "Подъезд"
+
+        counter = parse_counter(MOCK_COUNTERS_RESPONSE[0], place="")
+        assert counter is not None
+        assert counter.place is None
+
+    def test_counter_without_id(self) -> None:
+        assert parse_counter({"rowId": "1", "lastReadings": []}) is None
+
+    def test_counter_without_readings(self) -> None:
+        counter = parse_counter({"counterId": "1"})
+        assert counter is not None
+        assert counter.tariff == 0
+        assert counter.tariff_count == 0
+        assert counter.readings_date is None
+
+    def test_counter_history(self) -> None:
+        counter = parse_counter(
+            MOCK_COUNTERS_RESPONSE[0],
+            history=MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+        )
+        assert counter is not None
+        assert [period.reading_date for period in counter.history] == [
+            date(2025, 11, 24),
+            date(2025, 12, 24),
+            date(2026, 1, 24),
+        ]
+        assert counter.history[0].readings[1].value == 1370.0
+        assert counter.history[0].readings[1].consumption == 50.0
+
+    def test_readings_history_invalid(self) -> None:
+        history = parse_readings_history(
+            [
+                {"readings": []},
+                {"readings": [{"value": "1", "date": "bad"}]},
+                {"readings": [{"value": "2", "date": "24.01.26"}]},
+                {"readings": [{"value": "3", "date": "24.01.26"}]},
+            ]
+        )
+        assert len(history) == 1
+        assert history[0].readings[0].value == 2.0
+        assert parse_readings_history(None) == ()
+
+    def test_get_counter(self) -> None:
+        counters = tuple(
+            c for raw in MOCK_COUNTERS_MULTI if (c := parse_counter(raw))
+        )
+        account = _make_account(counters=counters)
+        assert account.get_counter("10000002") is counters[1]
+        assert account.get_counter("99999999") is None
+
+
+class TestParseLastPayment:
+    """Tests for parse_last_payment."""
+
+    def test_last_payment(self) -> None:
+        payment = parse_last_payment(MOCK_HISTORY_RESPONSE["items"])
+        assert payment is not None
+        assert payment.amount == 1200.0
+        assert payment.payment_date == date(2026, 1, 15)
+        assert _make_account(last_payment=payment).has_last_payment
+
+    def test_no_last_payment(self) -> None:
+        assert parse_last_payment(MOCK_HISTORY_EMPTY_RESPONSE["items"]) is None
+        assert not _make_account().has_last_payment
+
+
+def test_account_equality_ignores_raw() -> None:
+    """Test raw payloads do not take part in account comparison."""
+    counter = Counter(counter_id="1")
+    first = _make_account(counters=(counter,), raw={"info": {"a": 1}})
+    second = _make_account(counters=(counter,), raw={"info": {"a": 2}})
+    assert first == second
@@ -0,0 +1,286 @@
+"""Tests for the TNS-Energo payment ledger."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, call
+
+import pytest
+from aiotnse.exceptions import TNSEApiError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.tns_energo.const import (
+    API_MAX_TRIES,
+    LEDGER_SAVE_DELAY,
+    LEDGER_STORAGE_KEY,
+)
+from custom_components.tns_energo.payments import PaymentLedger, iter_months
+
+
+def _add_months(month: date, months: int) -> date:
+    """Return the first day of the month a number of months later."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _history(*items: tuple[int, float, str]) -> list[dict[str, Any]]:
+    """Return history items from (type, amount, date) tuples."""
+    return [
+        {"type": item_type, "amount": amount, "date": item_date}
+        for item_type, amount, item_date in items
+    ]
+
+
+async def test_closed_months_not_refetched(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test stored closed months are not polled again."""
+    freezer.move_to("2026-03-10 12:00:00+03:00")
+    current = dt_util.now().date().replace(day=1)
+    previous = _add_months(current, -1)
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    def _backfill(newest: int) -> list[Any]:
+        """Return the backfill calls of twelve months, newest first."""
+        return [
+            call("610000000001", dt.year, dt.month)
+            for dt in iter_months(
+                _add_months(current, newest - 11), _add_months(current, newest)
+            )
+        ]
+
+    # The mocked balance closes the previous month, older months are
+    # backfilled twelve per update, newest first. Setup refreshes twice:
+    # the first refresh and the update requested when entities are added.
+    assert mock_api.async_get_history.await_args_list == [
+        call("610000000001", current.year, current.month),
+        call("610000000001", previous.year, previous.month),
+        *_backfill(-2),
+        call("610000000001", current.year, current.month),
+        *_backfill(-14),
+    ]
+
+    mock_api.async_get_history.reset_mock()
+    coordinator = mock_config_entry.runtime_data
+    await coordinator.async_refresh()
+
+    assert mock_api.async_get_history.await_args_list == [
+        call("610000000001", current.year, current.month),
+        *_backfill(-26),
+    ]
+
+
+async def test_backfill_stops_on_error(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a failed backfill month is retried on the next update."""
+    freezer.move_to("2026-03-10 12:00:00+03:00")
+    current = dt_util.now().date().replace(day=1)
+    failing = _add_months(current, -3)
+    history = mock_api.async_get_history.return_value
+
+    async def _get_history(account: str, year: int, month: int) -> dict[str, Any]:
+        if (year, month) == (failing.year, failing.month):
+            raise TNSEApiError("API error")
+        return history
+
+    mock_api.async_get_history.side_effect = _get_history
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Both setup refreshes stop at the failed month after its retries
+    previous = _add_months(current, -1)
+    newer = _add_months(current, -2)
+    failed = [call("610000000001", failing.year, failing.month)] * API_MAX_TRIES
+    assert mock_api.async_get_history.await_args_list == [
+        call("610000000001", current.year, current.month),
+        call("610000000001", previous.year, previous.month),
+        call("610000000001", newer.year, newer.month),
+        *failed,
+        call("610000000001", current.year, current.month),
+        *failed,
+    ]
+
+    mock_api.async_get_history.reset_mock()
+    mock_api.async_get_history.side_effect = None
+    await mock_config_entry.runtime_data.async_refresh()
+
+    assert mock_api.async_get_history.await_args_list[:2] == [
+        call("610000000001", current.year, current.month),
+        call("610000000001", failing.year, failing.month),
+    ]
+
+
+@pytest.mark.freeze_time("2026-03-10 12:00:00+03:00")
+async def test_last_payment_from_ledger(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the last payment survives a reload while the history API fails."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The ledger is saved with a delay and flushed on unload
+    key = LEDGER_STORAGE_KEY.format(entry_id=mock_config_entry.entry_id)
+    assert key not in hass_storage
+
+    mock_api.async_get_history.side_effect = TNSEApiError("API error")
+    await hass.config_entries.async_reload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    months = hass_storage[key]["data"]["accounts"]["610000000001"]
+    assert months["2026-02"]["closed"] is True
+    assert months["2026-03"]["closed"] is False
+
+    account = mock_config_entry.runtime_data.data[0]
+    assert account.last_payment is not None
+    assert account.last_payment.amount == 1200.0
+
+
+async def test_ledger_aggregates(hass: HomeAssistant) -> None:
+    """Test yearly totals and the average bill follow replaced months."""
+    ledger = PaymentLedger(hass, "test")
+    ledger.set_month(
+        "1", "2025-12", _history((2, 900.0, "01.12.25"), (1, 800.0, "20.12.25")), True
+    )
+    ledger.set_month(
+        "1", "2026-01", _history((2, 1000.0, "01.01.26"), (1, 900.0, "15.01.26")), True
+    )
+    ledger.set_month("1", "2026-02", _history((1, 500.0, "05.02.26")), False)
+
+    summary = ledger.get_summary("1", 2026)
+    assert summary.paid == 1400.0
+    assert summary.payment_count == 2
+    assert summary.average_monthly_bill == 950.0
+
+    # An open month is replaced on the next sync
+    ledger.set_month(
+        "1",
+        "2026-02",
+        _history((2, 1100.0, "01.02.26"), (1, 1100.0, "05.02.26")),
+        False,
+    )
+
+    summary = ledger.get_summary("1", 2026)
+    assert summary.paid == 2000.0
+    assert summary.payment_count == 2
+    assert summary.average_monthly_bill == 1000.0
+    assert ledger.get_summary("1", 2025).paid == 800.0
+    assert ledger.get_summary("2", 2026).average_monthly_bill is None
+
+
+async def test_ledger_unchanged_month(hass: HomeAssistant) -> None:
+    """Test storing the same items of a month is not a change."""
+    ledger = PaymentLedger(hass, "test")
+    items = _history((2, 1000.0, "01.03.26"), (1, 900.0, "05.03.26"))
+    assert ledger.set_month("1", "2026-03", items, False)
+    assert not ledger.set_month("1", "2026-03", list(items), False)
+    assert ledger.get_summary("1", 2026).paid == 900.0
+
+    assert ledger.set_month("1", "2026-03", items, True)
+    assert ledger.is_closed("1", "2026-03")
+    assert ledger.set_month("1", "2026-03", items[:1], True)
+    assert ledger.get_summary("1", 2026).paid == 0.0
+
+
+async def test_ledger_delayed_save(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test changes are saved after a delay and flushed on demand."""
+    key = LEDGER_STORAGE_KEY.format(entry_id="test")
+    ledger = PaymentLedger(hass, "test")
+    ledger.set_month("1", "2026-03", _history((1, 900.0, "05.03.26")), False)
+
+    # Nothing is pending, so nothing is written
+    await ledger.async_flush()
+    assert key not in hass_storage
+
+    ledger.async_delay_save()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=LEDGER_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["accounts"]["1"]["2026-03"]["closed"] is False
+
+    ledger.set_month("1", "2026-03", _history((1, 900.0, "05.03.26")), True)
+    ledger.async_delay_save()
+    await ledger.async_flush()
+    assert hass_storage[key]["data"]["accounts"]["1"]["2026-03"]["closed"] is True
+
+
+async def test_ledger_payments_range(hass: HomeAssistant) -> None:
+    """Test payments are returned by date range, oldest first."""
+    ledger = PaymentLedger(hass, "test")
+    ledger.set_month("1", "2026-02", _history((1, 300.0, "28.02.26")), False)
+    ledger.set_month(
+        "1", "2026-01", _history((1, 100.0, "01.01.26"), (1, 200.0, "31.01.26")), True
+    )
+
+    payments = ledger.get_payments("1", date(2026, 1, 1), date(2026, 1, 31))
+    assert [payment.amount for payment in payments] == [100.0, 200.0]
+
+    payments = ledger.get_payments("1", date(2026, 1, 2), date(2026, 2, 28))
+    assert [payment.payment_date for payment in payments] == [
+        date(2026, 1, 31),
+        date(2026, 2, 28),
+    ]
+    assert ledger.get_payments("2", date(2026, 1, 1), date(2026, 12, 31)) == []
+
+
+@pytest.mark.freeze_time("2026-03-10 12:00:00+03:00")
+async def test_payment_summary_sensors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the yearly payment sensors."""
+    months = {
+        (2026, 1): _history((2, 1000.0, "01.01.26"), (1, 1200.0, "15.01.26")),
+        (2026, 2): _history((2, 800.0, "01.02.26"), (1, 1000.0, "10.02.26")),
+    }
+
+    async def _get_history(account: str, year: int, month: int) -> dict[str, Any]:
+        return {"items": months.get((year, month), [])}
+
+    mock_api.async_get_history.side_effect = _get_history
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.ls_no610000000001_paid_this_year")
+    assert state is not None
+    assert float(state.state) == 2200.0
+
+    state = hass.states.get("sensor.ls_no610000000001_payments_this_year")
+    assert state is not None
+    assert int(state.state) == 2
+
+    state = hass.states.get("sensor.ls_no610000000001_average_monthly_bill")
+    assert state is not None
+    assert float(state.state) == 900.0
@@ -0,0 +1,265 @@
+"""Tests for the TNS-Energo readings submission queue."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+from aiotnse.exceptions import TNSEApiError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.tns_energo.const import ATTR_T1, ATTR_T2, DOMAIN
+from custom_components.tns_energo.services import SERVICE_SEND_READINGS
+
+from .const import MOCK_SEND_READINGS_RESPONSE
+
+
+async def _async_setup(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> str:
+    """Set up the entry and return the counter device ID."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "10000001")})
+    assert device is not None
+
+    hass.states.async_set("sensor.t1_meter", "3600")
+    hass.states.async_set("sensor.t2_meter", "1600")
+    return device.id
+
+
+async def _async_send(hass: HomeAssistant, device_id: str) -> None:
+    """Call send_readings for the test counter."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SEND_READINGS,
+        {
+            ATTR_DEVICE_ID: device_id,
+            ATTR_T1: "sensor.t1_meter",
+            ATTR_T2: "sensor.t2_meter",
+        },
+        blocking=True,
+    )
+
+
+async def test_failed_readings_queued_and_retried(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test failed readings are queued, retried and sent exactly once."""
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=aiohttp.ClientConnectionError("Down")
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+    queue = mock_config_entry.runtime_data.readings_queue
+
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key == "readings_queued"
+    assert len(queue.items) == 1
+
+    depth = hass.states.get("sensor.ls_no610000000001_queued_readings")
+    assert depth is not None
+    assert depth.state == "1"
+    oldest = hass.states.get("sensor.ls_no610000000001_oldest_queued_readings")
+    assert oldest is not None
+    assert oldest.state != "unknown"
+
+    # Resending the same readings does not queue them twice
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key == "readings_already_submitted"
+    assert len(queue.items) == 1
+
+    completed = async_capture_events(hass, f"{DOMAIN}_send_readings_completed")
+    mock_api.async_send_readings = AsyncMock(
+        return_value=MOCK_SEND_READINGS_RESPONSE
+    )
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    mock_api.async_send_readings.assert_awaited_once_with(
+        "610000000001", "2000001", ["3600", "1600"]
+    )
+    assert not queue.items
+    assert len(completed) == 1
+    assert completed[0].data["queued"] is True
+    assert completed[0].data[ATTR_DEVICE_ID] == device_id
+    depth = hass.states.get("sensor.ls_no610000000001_queued_readings")
+    assert depth is not None
+    assert depth.state == "0"
+
+    # Sent readings are never sent again in the same month
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key == "readings_already_submitted"
+    mock_api.async_send_readings.assert_awaited_once()
+
+
+async def test_queued_readings_expire_at_deadline(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test queued readings are dropped with a failed event after the deadline."""
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=aiohttp.ClientConnectionError("Down")
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+    queue = mock_config_entry.runtime_data.readings_queue
+
+    with pytest.raises(HomeAssistantError):
+        await _async_send(hass, device_id)
+
+    failed = async_capture_events(hass, f"{DOMAIN}_send_readings_failed")
+
+    # Backoff: retries get further apart
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    item = next(iter(queue.items.values()))
+    assert item.attempts == 1
+    assert item.next_attempt - item.created > timedelta(minutes=15)
+
+    freezer.tick(timedelta(hours=73))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not queue.items
+    assert len(failed) == 1
+    assert failed[0].data["queued"] is True
+
+
+async def test_rejected_queued_readings_dropped(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test queued readings rejected by the API are dropped without retries."""
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=aiohttp.ClientConnectionError("Down")
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+    queue = mock_config_entry.runtime_data.readings_queue
+
+    with pytest.raises(HomeAssistantError):
+        await _async_send(hass, device_id)
+
+    failed = async_capture_events(hass, f"{DOMAIN}_send_readings_failed")
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=TNSEApiError("Показания не приняты (POST /sendReadings)")
+    )
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not queue.items
+    assert len(failed) == 1
+    assert failed[0].data["queued"] is True
+    assert failed[0].data["error"]
+
+
+async def test_rejected_readings_not_queued(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test readings rejected by the API fail at once, server errors are queued."""
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=TNSEApiError("Показания не приняты (POST /sendReadings)")
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+    queue = mock_config_entry.runtime_data.readings_queue
+
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key != "readings_queued"
+    assert not queue.items
+
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=TNSEApiError("API request failed (POST /sendReadings -> 503)")
+    )
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key == "readings_queued"
+    assert len(queue.items) == 1
+
+
+async def test_same_readings_sent_next_month(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test unchanged readings can be sent again in the next billing period."""
+    freezer.move_to("2026-03-20 12:00:00+03:00")
+    mock_api.async_send_readings = AsyncMock(
+        return_value=MOCK_SEND_READINGS_RESPONSE
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    await _async_send(hass, device_id)
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await _async_send(hass, device_id)
+    assert exc_info.value.translation_key == "readings_already_submitted"
+
+    # No consumption since the previous month
+    freezer.move_to("2026-04-20 12:00:00+03:00")
+    await _async_send(hass, device_id)
+    assert mock_api.async_send_readings.await_count == 2
+
+
+async def test_readings_queue_persisted(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the queue survives a reload."""
+    mock_api.async_send_readings = AsyncMock(
+        side_effect=aiohttp.ClientConnectionError("Down")
+    )
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    with pytest.raises(HomeAssistantError):
+        await _async_send(hass, device_id)
+
+    key = f"{DOMAIN}.{mock_config_entry.entry_id}.readings_queue"
+    assert len(hass_storage[key]["data"]["items"]) == 1
+
+    await hass.config_entries.async_reload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    queue = mock_config_entry.runtime_data.readings_queue
+    assert len(queue.items) == 1
+    item = next(iter(queue.items.values()))
+    assert item.readings == ["3600", "1600"]
+    assert item.counter_id == "10000001"
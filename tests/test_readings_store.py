@@ -0,0 +1,214 @@
+"""Tests for the TNS-Energo readings history store."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.tns_energo.const import ATTR_END_DATE, ATTR_START_DATE, DOMAIN
+from custom_components.tns_energo.models import Counter, parse_counter
+from custom_components.tns_energo.readings_store import ReadingsStore
+from custom_components.tns_energo.services import SERVICE_GET_READINGS
+
+from .const import MOCK_COUNTER_READINGS_HISTORY_RESPONSE, MOCK_COUNTERS_RESPONSE
+
+
+def _make_counter(history: list[dict[str, Any]]) -> Counter:
+    """Return the mocked counter with a readings history."""
+    counter = parse_counter(MOCK_COUNTERS_RESPONSE[0], history=history)
+    assert counter is not None
+    return counter
+
+
+async def test_store_append_and_load(hass: HomeAssistant) -> None:
+    """Test periods are appended to the files and loaded back."""
+    store = ReadingsStore(hass, "test")
+    await store.async_update([_make_counter(MOCK_COUNTER_READINGS_HISTORY_RESPONSE)])
+
+    series = store.get_series("10000001", 0)
+    assert series is not None
+    assert list(series.values) == [3250.0, 3380.0, 3500.0]
+    path = store.directory / "10000001.t1.days"
+    size = path.stat().st_size
+
+    # Stored periods are skipped, only the new one is appended
+    await store.async_update(
+        [
+            _make_counter(
+                [
+                    {"readings": [{"value": "3600", "date": "24.02.26"}]},
+                    *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+                ]
+            )
+        ]
+    )
+    assert path.stat().st_size == size + series.days.itemsize
+
+    loaded = ReadingsStore(hass, "test")
+    await loaded.async_load()
+    assert loaded.get_readings("10000001", 0) == [
+        (date(2025, 11, 24), 3250.0, 110.0),
+        (date(2025, 12, 24), 3380.0, 130.0),
+        (date(2026, 1, 24), 3500.0, 120.0),
+        (date(2026, 2, 24), 3600.0, None),
+    ]
+    assert [day for day, _, _ in loaded.get_readings("10000001", 1)] == [
+        date(2025, 11, 24),
+        date(2025, 12, 24),
+        date(2026, 1, 24),
+    ]
+
+
+async def test_store_range_queries(hass: HomeAssistant) -> None:
+    """Test range queries include both ends."""
+    store = ReadingsStore(hass, "test")
+    await store.async_update([_make_counter(MOCK_COUNTER_READINGS_HISTORY_RESPONSE)])
+
+    readings = store.get_readings(
+        "10000001", 0, date(2025, 12, 24), date(2026, 1, 24)
+    )
+    assert [value for _, value, _ in readings] == [3380.0, 3500.0]
+    assert store.get_readings("10000001", 0, date(2026, 1, 25)) == []
+    assert store.get_readings("99999999", 0) == []
+
+    series = store.get_series("10000001", 1)
+    assert series is not None
+    assert series.get_consumption(None, date(2025, 12, 31)) == 120.0
+
+
+async def test_store_truncates_incomplete_append(hass: HomeAssistant) -> None:
+    """Test columns are cut to the complete periods after an interrupted append."""
+    store = ReadingsStore(hass, "test")
+    await store.async_update([_make_counter(MOCK_COUNTER_READINGS_HISTORY_RESPONSE)])
+
+    path = store.directory / "10000001.t1.values"
+    size = path.stat().st_size
+    with path.open("ab") as file:
+        file.write(b"\x00" * 12)
+
+    loaded = ReadingsStore(hass, "test")
+    await loaded.async_load()
+
+    series = loaded.get_series("10000001", 0)
+    assert series is not None
+    assert len(series) == 3
+    assert len(series.values) == 3
+    assert path.stat().st_size == size
+
+
+async def test_store_rolls_back_failed_append(hass: HomeAssistant) -> None:
+    """Test a failed append truncates all columns to their previous size."""
+    store = ReadingsStore(hass, "test")
+    await store.async_update([_make_counter(MOCK_COUNTER_READINGS_HISTORY_RESPONSE)])
+    sizes = {path: path.stat().st_size for path in store.directory.iterdir()}
+
+    # The last column written cannot be opened
+    blocked = store.directory / "10000001.t2.consumption"
+    blocked.unlink()
+    blocked.mkdir()
+    del sizes[blocked]
+
+    counter = _make_counter(
+        [
+            {
+                "readings": [
+                    {"value": "3600", "date": "24.02.26", "consumption": "100"},
+                    {"value": "1520", "date": "24.02.26", "consumption": "20"},
+                ]
+            },
+            *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+        ]
+    )
+    with pytest.raises(OSError):
+        await store.async_update([counter])
+
+    assert {path: path.stat().st_size for path in sizes} == sizes
+    series = store.get_series("10000001", 0)
+    assert series is not None
+    assert len(series) == 3
+
+
+async def test_annual_consumption_sensor(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the 12-month consumption of all tariff zones."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, "10000001_annual_consumption"
+    )
+    assert entity_id is not None
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert float(state.state) == 540.0
+
+
+async def test_service_get_readings(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the readings history is returned by tariff zone."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "10000001")})
+    assert device is not None
+    events = async_capture_events(hass, f"{DOMAIN}_{SERVICE_GET_READINGS}_completed")
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_READINGS,
+        {ATTR_DEVICE_ID: device.id, ATTR_START_DATE: date(2025, 12, 1)},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        ATTR_START_DATE: date(2025, 12, 1),
+        ATTR_END_DATE: None,
+        "readings": {
+            "t1": [
+                {ATTR_DATE: date(2025, 12, 24), "value": 3380.0, "consumption": 130.0},
+                {ATTR_DATE: date(2026, 1, 24), "value": 3500.0, "consumption": 120.0},
+            ],
+            "t2": [
+                {ATTR_DATE: date(2025, 12, 24), "value": 1440.0, "consumption": 70.0},
+                {ATTR_DATE: date(2026, 1, 24), "value": 1500.0, "consumption": 60.0},
+            ],
+        },
+    }
+    assert events == []
+
+    # The query only returns a response
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_READINGS,
+            {ATTR_DEVICE_ID: device.id},
+            blocking=True,
+        )
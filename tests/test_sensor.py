@@ -1,19 +1,39 @@
 """Tests for TNS-Energo sensor entities."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+import time
+import tracemalloc
+from unittest.mock import AsyncMock, patch
 
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.tns_energo.const import DOMAIN
+from custom_components.tns_energo.const import (
+    CONF_LEAN_ATTRIBUTES,
+    CONF_REGION,
+    DOMAIN,
+)
+from custom_components.tns_energo.sensor import (
+    TARIFF_SENSOR_TYPES,
+    TNSECounterSensor,
+    TNSECounterTariffSensor,
+    TNSESensor,
+    get_tariff_description,
+)
 
 from .const import (
+    MOCK_BALANCE_RESPONSE,
     MOCK_COUNTER_READINGS_SINGLE_TARIFF_RESPONSE,
     MOCK_COUNTERS_MULTI,
     MOCK_COUNTERS_SINGLE_TARIFF,
+    MOCK_EMAIL,
     MOCK_HISTORY_EMPTY_RESPONSE,
+    MOCK_PASSWORD,
+    MOCK_REGION,
 )
 
 
@@ -800,3 +820,232 @@ async def test_sensor_billing_date_value(
     state = hass.states.get("sensor.ls_no610000000001_billing_date")
     assert state is not None
     assert state.state == "2026-02-01"
+
+
+async def test_sensor_unchanged_refresh_writes_nothing(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a refresh with identical data only writes the update timestamp."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    rows = dict(coordinator.rows)
+    timestamp_id = "610000000001_current_timestamp"
+
+    freezer.tick(60)
+    with (
+        patch.object(
+            TNSESensor,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=TNSESensor.async_write_ha_state,
+        ) as account_write,
+        patch.object(TNSECounterSensor, "async_write_ha_state") as counter_write,
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert account_write.call_count == 1
+    assert counter_write.call_count == 0
+    assert all(
+        coordinator.rows[uid] is row
+        for uid, row in rows.items()
+        if uid != timestamp_id
+    )
+
+    state = hass.states.get("sensor.ls_no610000000001_last_update")
+    assert state is not None
+    assert coordinator.last_update_time is not None
+    assert dt_util.parse_datetime(
+        state.state
+    ) == coordinator.last_update_time.replace(microsecond=0)
+
+
+async def test_sensor_changed_balance_writes_only_changed(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a balance change only writes the sensors whose row changed."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    mock_api.async_get_balance.return_value = {
+        **MOCK_BALANCE_RESPONSE,
+        "sumToPay": 2000.0,
+    }
+
+    with (
+        patch.object(
+            TNSESensor,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=TNSESensor.async_write_ha_state,
+        ) as account_write,
+        patch.object(TNSECounterSensor, "async_write_ha_state") as counter_write,
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    # Amount to be paid and last update timestamp
+    assert account_write.call_count == 2
+    assert counter_write.call_count == 0
+
+    state = hass.states.get("sensor.ls_no610000000001_amount_to_be_paid")
+    assert state is not None
+    assert float(state.state) == 2000.0
+
+
+async def test_sensor_unavailable_after_failed_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test unchanged rows are still written when the coordinator fails."""
+    from aiotnse.exceptions import TNSEApiError
+
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data
+    mock_api.async_get_accounts.side_effect = TNSEApiError("API error")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.ls_no610000000001_debt")
+    assert state is not None
+    assert state.state == "unavailable"
+
+    mock_api.async_get_accounts.side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.ls_no610000000001_debt")
+    assert state is not None
+    assert float(state.state) == 0
+
+
+async def test_sensor_lean_attributes(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the lean attribute profile drops static attributes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: MOCK_EMAIL,
+            CONF_PASSWORD: MOCK_PASSWORD,
+            CONF_REGION: MOCK_REGION,
+        },
+        options={CONF_LEAN_ATTRIBUTES: True},
+        unique_id=MOCK_EMAIL,
+        version=2,
+        minor_version=0,
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.ls_no610000000001_account")
+    assert state is not None
+    assert "Общая площадь" not in state.attributes
+    assert "Адрес" not in state.attributes
+
+    state = hass.states.get("sensor.ls_no610000000001_amount_to_be_paid")
+    assert state is not None
+    assert "Сумма без округления" not in state.attributes
+    assert state.attributes.get("Сумма с доп. начислениями") == 1500.5
+
+    meter = hass.states.get(_get_entity_id(hass, "10000001_meter"))
+    assert meter is not None
+    assert "Дата поверки" not in meter.attributes
+
+
+async def test_sensor_static_attributes_unrecorded(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test static attributes are kept in state but excluded from history."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.ls_no610000000001_account")
+    assert state is not None
+    assert state.attributes.get("Общая площадь") == 65
+
+    assert "Общая площадь" in TNSESensor._unrecorded_attributes
+    assert "Дата поверки" in TNSECounterSensor._unrecorded_attributes
+    assert "Сумма с доп. начислениями" not in TNSESensor._unrecorded_attributes
+
+
+async def test_sensor_tariff_descriptions_shared(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Benchmark setup time and memory of many counters sharing descriptions."""
+    from homeassistant.helpers.entity_platform import async_get_platforms
+
+    counter_count = 200
+    mock_api.async_get_counters.return_value = [
+        {**MOCK_COUNTERS_MULTI[0], "counterId": str(20000000 + i)}
+        for i in range(counter_count)
+    ]
+    mock_config_entry.add_to_hass(hass)
+
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    tariff_entities = [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        if platform.domain == "sensor"
+        for entity in platform.entities.values()
+        if isinstance(entity, TNSECounterTariffSensor)
+    ]
+    # Two tariffs, reading and consumption per tariff
+    assert len(tariff_entities) == counter_count * 4
+    # About 4 s and 40 KiB per tariff entity under tracemalloc
+    assert elapsed < 60
+    assert peak / len(tariff_entities) < 256 * 1024
+
+    descriptions = {id(entity.entity_description) for entity in tariff_entities}
+    assert len(descriptions) == 4
+    for entity in tariff_entities:
+        assert entity.entity_description in TARIFF_SENSOR_TYPES.values()
+
+    assert get_tariff_description(2, 0, "reading").key == "t1_reading"
+    assert get_tariff_description(1, 0, "consumption").key == "consumption"
+    # Counters with more tariffs than the table covers share descriptions too
+    description = get_tariff_description(4, 3, "reading")
+    assert description.key == "t4_reading"
+    assert get_tariff_description(4, 3, "reading") is description
+    assert (4, 3, "reading") not in TARIFF_SENSOR_TYPES
@@ -1,26 +1,47 @@
 """Tests for TNS-Energo services."""
 from __future__ import annotations
 
+import hashlib
+from datetime import date
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
 from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
 
 from custom_components.tns_energo.const import (
+    ATTR_CACHED,
+    ATTR_END_DATE,
+    ATTR_FIRE_EVENT,
+    ATTR_FORCE,
+    ATTR_ITEMS,
+    ATTR_START_DATE,
     ATTR_T1,
     ATTR_T2,
+    BILL_STORAGE_KEY,
     DOMAIN,
 )
 from custom_components.tns_energo.services import (
+    SERVICE_BACKFILL_BILLS,
     SERVICE_GET_BILL,
+    SERVICE_GET_PAYMENTS,
     SERVICE_REFRESH,
     SERVICE_SEND_READINGS,
+    SERVICE_SEND_READINGS_BATCH,
 )
 
-from .const import MOCK_COUNTERS_MULTI, MOCK_INVOICE_FILE_RESPONSE, MOCK_SEND_READINGS_RESPONSE
+from .const import (
+    MOCK_COUNTERS_MULTI,
+    MOCK_HISTORY_RESPONSE,
+    MOCK_INVOICE_FILE_RESPONSE,
+    MOCK_SEND_READINGS_RESPONSE,
+)
 
 
 async def _get_account_device_id(
@@ -200,8 +221,8 @@ async def test_service_get_bill_saves_pdf(
     event_data = events[0].data
     assert "file_path" in event_data
     assert "url" in event_data
-    assert "/local/tns_energo/" in event_data["url"]
-    assert event_data["url"].endswith(".pdf")
+    assert event_data["url"].startswith("/api/tns_energo/bills/610000000001/")
+    assert "authSig=" in event_data["url"]
 
     # Verify file exists on disk
     saved_path = Path(event_data["file_path"])
@@ -373,16 +394,35 @@ async def test_service_send_readings_invalid_state(
 
 async def test_service_send_readings_api_error(
     hass: HomeAssistant,
-    mock_config_entry: MockConfigEntry,
     mock_auth: AsyncMock,
     mock_api: AsyncMock,
 ) -> None:
-    """Test send_readings wraps API errors in HomeAssistantError."""
+    """Test send_readings wraps API errors if the queue is disabled."""
     from aiotnse.exceptions import TNSEApiError
+    from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+
+    from custom_components.tns_energo.const import (
+        CONF_QUEUE_DEADLINE,
+        CONF_REGION,
+    )
+
+    from .const import MOCK_EMAIL, MOCK_PASSWORD, MOCK_REGION
 
     mock_api.async_send_readings = AsyncMock(
         side_effect=TNSEApiError("Server error")
     )
+    mock_config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: MOCK_EMAIL,
+            CONF_PASSWORD: MOCK_PASSWORD,
+            CONF_REGION: MOCK_REGION,
+        },
+        options={CONF_QUEUE_DEADLINE: 0},
+        unique_id=MOCK_EMAIL,
+        version=2,
+        minor_version=0,
+    )
     mock_config_entry.add_to_hass(hass)
 
     await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -439,3 +479,626 @@ async def test_service_send_readings_unexpected_error(
             blocking=True,
         )
     assert exc_info.value.translation_key == "service_failed"
+
+
+async def test_service_send_readings_batch(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test send_readings_batch sends all items and returns per-item results."""
+    mock_api.async_get_counters.return_value = MOCK_COUNTERS_MULTI
+    mock_api.async_send_readings = AsyncMock(
+        return_value=MOCK_SEND_READINGS_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    counter1_device_id = await _get_counter_device_id(hass, "10000001")
+    counter2_device_id = await _get_counter_device_id(hass, "10000002")
+
+    hass.states.async_set("sensor.t1_meter", "3600")
+    hass.states.async_set("sensor.t2_meter", "1600")
+    hass.states.async_set("sensor.t1_meter_2", "8100")
+
+    events = async_capture_events(hass, f"{DOMAIN}_send_readings_batch_completed")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SEND_READINGS_BATCH,
+        {
+            ATTR_ITEMS: [
+                {
+                    ATTR_DEVICE_ID: counter1_device_id,
+                    ATTR_T1: "sensor.t1_meter",
+                    ATTR_T2: "sensor.t2_meter",
+                },
+                {
+                    ATTR_DEVICE_ID: counter2_device_id,
+                    ATTR_T1: "sensor.t1_meter_2",
+                },
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert mock_api.async_send_readings.await_count == 2
+    mock_api.async_send_readings.assert_any_await(
+        "610000000001", "2000001", ["3600", "1600"]
+    )
+    mock_api.async_send_readings.assert_any_await(
+        "610000000001", "2000002", ["8100"]
+    )
+    assert response == {
+        ATTR_ITEMS: [
+            {
+                ATTR_DEVICE_ID: counter1_device_id,
+                "readings": ["3600", "1600"],
+                "balance": MOCK_SEND_READINGS_RESPONSE,
+            },
+            {
+                ATTR_DEVICE_ID: counter2_device_id,
+                "readings": ["8100"],
+                "balance": MOCK_SEND_READINGS_RESPONSE,
+            },
+        ]
+    }
+    assert len(events) == 1
+    assert events[0].data[ATTR_ITEMS] == response[ATTR_ITEMS]
+
+
+async def test_service_send_readings_batch_invalid_item(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test send_readings_batch sends nothing if any item is invalid."""
+    mock_api.async_get_counters.return_value = MOCK_COUNTERS_MULTI
+    mock_api.async_send_readings = AsyncMock(
+        return_value=MOCK_SEND_READINGS_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    counter1_device_id = await _get_counter_device_id(hass, "10000001")
+    counter2_device_id = await _get_counter_device_id(hass, "10000002")
+
+    hass.states.async_set("sensor.t1_meter", "3600")
+    hass.states.async_set("sensor.t2_meter", "1600")
+
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEND_READINGS_BATCH,
+            {
+                ATTR_ITEMS: [
+                    {
+                        ATTR_DEVICE_ID: counter1_device_id,
+                        ATTR_T1: "sensor.t1_meter",
+                        ATTR_T2: "sensor.t2_meter",
+                    },
+                    {
+                        # Single-tariff counter with an extra tariff
+                        ATTR_DEVICE_ID: counter2_device_id,
+                        ATTR_T1: "sensor.t1_meter",
+                        ATTR_T2: "sensor.t2_meter",
+                    },
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+    assert exc_info.value.translation_key == "batch_item_invalid"
+    assert exc_info.value.translation_placeholders["index"] == "2"
+    mock_api.async_send_readings.assert_not_awaited()
+
+
+async def test_service_send_readings_batch_partial_failure(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test an API error of one item is reported in its result only."""
+    from aiotnse.exceptions import TNSEApiError
+
+    async def _send_readings(
+        account_number: str, row_id: str, readings: list[str]
+    ) -> dict:
+        if row_id == "2000002":
+            raise TNSEApiError("Server error")
+        return MOCK_SEND_READINGS_RESPONSE
+
+    mock_api.async_get_counters.return_value = MOCK_COUNTERS_MULTI
+    mock_api.async_send_readings = AsyncMock(side_effect=_send_readings)
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    counter1_device_id = await _get_counter_device_id(hass, "10000001")
+    counter2_device_id = await _get_counter_device_id(hass, "10000002")
+
+    hass.states.async_set("sensor.t1_meter", "3600")
+    hass.states.async_set("sensor.t2_meter", "1600")
+    hass.states.async_set("sensor.t1_meter_2", "8100")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SEND_READINGS_BATCH,
+        {
+            ATTR_ITEMS: [
+                {
+                    ATTR_DEVICE_ID: counter1_device_id,
+                    ATTR_T1: "sensor.t1_meter",
+                    ATTR_T2: "sensor.t2_meter",
+                },
+                {
+                    ATTR_DEVICE_ID: counter2_device_id,
+                    ATTR_T1: "sensor.t1_meter_2",
+                },
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    first, second = response[ATTR_ITEMS]
+    assert first["balance"] == MOCK_SEND_READINGS_RESPONSE
+    assert "error" not in first
+    assert "balance" not in second
+    assert second["error"]
+
+
+@pytest.mark.parametrize(
+    ("t1_value", "translation_key"),
+    [
+        ("3400", "reading_decreased"),
+        ("999999", "reading_implausible"),
+    ],
+)
+async def test_service_send_readings_local_validation(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+    t1_value: str,
+    translation_key: str,
+) -> None:
+    """Test implausible readings fail without calling the API."""
+    mock_api.async_send_readings = AsyncMock(
+        return_value=MOCK_SEND_READINGS_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    counter_device_id = await _get_counter_device_id(hass, "10000001")
+
+    hass.states.async_set("sensor.t1_meter", t1_value)
+    hass.states.async_set("sensor.t2_meter", "1600")
+
+    with pytest.raises(HomeAssistantError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SEND_READINGS,
+            {
+                ATTR_DEVICE_ID: counter_device_id,
+                ATTR_T1: "sensor.t1_meter",
+                ATTR_T2: "sensor.t2_meter",
+            },
+            blocking=True,
+        )
+    assert exc_info.value.translation_key == translation_key
+    assert exc_info.value.translation_placeholders["tariff"] == "T1"
+    mock_api.async_send_readings.assert_not_awaited()
+
+
+async def test_service_get_bill_response_without_event(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test get_bill returns its result and can skip the completed event."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    events = async_capture_events(hass, f"{DOMAIN}_get_bill_completed")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device_id, ATTR_FIRE_EVENT: False},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response is not None
+    assert response["url"].startswith("/api/tns_energo/bills/")
+    assert "file_path" in response
+    assert not events
+
+    # Events are still fired by default
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device_id},
+        blocking=True,
+    )
+    assert len(events) == 1
+
+
+async def test_service_get_bill_failed_without_event(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test failed event is skipped when fire_event is false."""
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    events = async_capture_events(hass, f"{DOMAIN}_get_bill_failed")
+    mock_api.async_get_invoice_file = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_BILL,
+            {ATTR_DEVICE_ID: device_id, ATTR_FIRE_EVENT: False},
+            blocking=True,
+        )
+    assert not events
+
+
+async def test_service_get_bill_closed_month_cached(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a bill of a closed month is served from the cache."""
+    from pathlib import Path
+
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    # The mocked balance closes February 2026
+    service_data = {ATTR_DEVICE_ID: device_id, ATTR_DATE: date(2026, 1, 1)}
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_BILL, service_data, blocking=True, return_response=True
+    )
+    assert response[ATTR_CACHED] is False
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_BILL, service_data, blocking=True, return_response=True
+    )
+    assert response[ATTR_CACHED] is True
+    assert Path(response["file_path"]).read_bytes() == b"test pdf data"
+    mock_api.async_get_invoice_file.assert_awaited_once()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {**service_data, ATTR_FORCE: True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response[ATTR_CACHED] is False
+    assert mock_api.async_get_invoice_file.await_count == 2
+
+    # A removed file is downloaded again
+    Path(response["file_path"]).unlink()
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_BILL, service_data, blocking=True, return_response=True
+    )
+    assert response[ATTR_CACHED] is False
+    assert mock_api.async_get_invoice_file.await_count == 3
+
+
+async def test_service_get_bill_open_month_not_cached(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a bill of a month that is not closed yet is always downloaded."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    service_data = {ATTR_DEVICE_ID: device_id, ATTR_DATE: date(2026, 3, 1)}
+
+    for _ in range(2):
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_GET_BILL, service_data, blocking=True, return_response=True
+        )
+        assert response[ATTR_CACHED] is False
+    assert mock_api.async_get_invoice_file.await_count == 2
+
+
+async def test_service_get_bill_manifest_persisted(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test downloaded bills are recorded with their size and hash."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device_id, ATTR_DATE: date(2026, 1, 1)},
+        blocking=True,
+    )
+
+    (bill,) = hass_storage[BILL_STORAGE_KEY]["data"]["bills"]
+    assert bill["account_number"] == "610000000001"
+    assert bill["month"] == "2026-01"
+    assert bill["size"] == len(b"test pdf data")
+    assert bill["sha256"] == hashlib.sha256(b"test pdf data").hexdigest()
+
+
+async def test_service_backfill_bills(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test backfill downloads closed months once and reports progress."""
+    from aiotnse.exceptions import TNSEApiError
+
+    async def _get_invoice_file(account: str, date_str: str) -> dict[str, Any]:
+        if date_str == "01.12.2025":
+            return {}
+        if date_str == "01.01.2026":
+            raise TNSEApiError("Server error")
+        return MOCK_INVOICE_FILE_RESPONSE
+
+    mock_api.async_get_invoice_file = AsyncMock(side_effect=_get_invoice_file)
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    progress = async_capture_events(hass, f"{DOMAIN}_{SERVICE_BACKFILL_BILLS}_progress")
+
+    # The mocked balance closes February 2026, later months are not requested
+    service_data = {
+        ATTR_DEVICE_ID: device_id,
+        ATTR_START_DATE: date(2025, 11, 1),
+        ATTR_END_DATE: date(2026, 5, 1),
+    }
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL_BILLS,
+        service_data,
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "total": 4,
+        "downloaded": 2,
+        "cached": 0,
+        "missing": 1,
+        "failed": 1,
+        "failed_months": ["2026-01"],
+    }
+    assert len(progress) == 4
+    assert sorted(event.data["done"] for event in progress) == [1, 2, 3, 4]
+    assert hass_storage[BILL_STORAGE_KEY]["data"]["missing"] == {
+        "610000000001": ["2025-12"]
+    }
+
+    # A repeated call only requests the failed month
+    mock_api.async_get_invoice_file.reset_mock()
+    mock_api.async_get_invoice_file.side_effect = None
+    mock_api.async_get_invoice_file.return_value = MOCK_INVOICE_FILE_RESPONSE
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL_BILLS,
+        service_data,
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["downloaded"] == 1
+    assert response["cached"] == 2
+    assert response["missing"] == 1
+    mock_api.async_get_invoice_file.assert_awaited_once_with(
+        "610000000001", "01.01.2026"
+    )
+
+
+async def test_service_backfill_bills_default_range(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test backfill starts in January of the account initial year."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL_BILLS,
+        {ATTR_DEVICE_ID: device_id, ATTR_FIRE_EVENT: False},
+        blocking=True,
+        return_response=True,
+    )
+
+    # January 2020 to February 2026
+    assert response["total"] == 74
+    assert response["downloaded"] == 74
+    assert mock_api.async_get_invoice_file.await_count == 74
+
+
+async def test_service_get_bill_retention(
+    hass: HomeAssistant,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test stored bills over the per-account limit are removed after a download."""
+    from pathlib import Path
+
+    from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+
+    from custom_components.tns_energo.const import (
+        CONF_BILLS_MAX_FILES,
+        CONF_REGION,
+    )
+
+    from .const import MOCK_EMAIL, MOCK_PASSWORD, MOCK_REGION
+
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: MOCK_EMAIL,
+            CONF_PASSWORD: MOCK_PASSWORD,
+            CONF_REGION: MOCK_REGION,
+        },
+        options={CONF_BILLS_MAX_FILES: 1},
+        unique_id=MOCK_EMAIL,
+        version=2,
+        minor_version=0,
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_id = await _get_account_device_id(hass)
+    first = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device_id, ATTR_DATE: date(2025, 12, 1)},
+        blocking=True,
+        return_response=True,
+    )
+    second = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device_id, ATTR_DATE: date(2026, 1, 1)},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    assert not Path(first["file_path"]).exists()
+    assert Path(second["file_path"]).exists()
+
+    state = hass.states.get("sensor.ls_no610000000001_stored_bills_size")
+    assert state is not None
+    assert float(state.state) * 1024 * 1024 == pytest.approx(
+        len(b"test pdf data"), abs=0.01
+    )
+
+
+@pytest.mark.freeze_time("2026-03-10 12:00:00+03:00")
+async def test_service_get_payments(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test payments are returned from the ledger by date range."""
+
+    async def _get_history(account: str, year: int, month: int) -> dict[str, Any]:
+        if (year, month) == (2026, 1):
+            return MOCK_HISTORY_RESPONSE
+        return {"items": []}
+
+    mock_api.async_get_history.side_effect = _get_history
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    await_count = mock_api.async_get_history.await_count
+    events = async_capture_events(hass, f"{DOMAIN}_{SERVICE_GET_PAYMENTS}_completed")
+
+    device_id = await _get_account_device_id(hass)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_PAYMENTS,
+        {ATTR_DEVICE_ID: device_id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        ATTR_START_DATE: date(2026, 1, 1),
+        ATTR_END_DATE: date(2026, 3, 10),
+        "payments": [{ATTR_DATE: date(2026, 1, 15), "amount": 1200.0}],
+        "count": 1,
+        "total": 1200.0,
+    }
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_PAYMENTS,
+        {
+            ATTR_DEVICE_ID: device_id,
+            ATTR_START_DATE: date(2026, 1, 16),
+            ATTR_END_DATE: date(2026, 2, 28),
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["payments"] == []
+    assert response["total"] == 0
+    # Queries never reach the API and only return a response
+    assert mock_api.async_get_history.await_count == await_count
+    assert events == []
@@ -0,0 +1,151 @@
+"""Tests for the TNS-Energo readings statistics import."""
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+from pytest_homeassistant_custom_component.typing import (
+    RecorderInstanceContextManager,
+)
+
+from custom_components.tns_energo.statistics import get_statistic_id
+
+from .const import MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+
+T1_STATISTIC_ID = "tns_energo:10000001_t1_consumption"
+T2_STATISTIC_ID = "tns_energo:10000001_t2_consumption"
+
+
+@pytest.fixture
+def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Prepare the recorder database before hass is set up."""
+
+
+async def _async_get_statistics(
+    hass: HomeAssistant, statistic_id: str
+) -> list[dict[str, Any]]:
+    """Return all imported rows of a statistic."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await async_wait_recording_done(hass)
+    result = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utc_from_timestamp(0),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+    return result.get(statistic_id, [])
+
+
+def test_statistic_id() -> None:
+    """Test statistic IDs follow the tariff sensor keys."""
+    assert get_statistic_id("10000001", 1, 0) == "tns_energo:10000001_consumption"
+    assert get_statistic_id("10000001", 3, 2) == "tns_energo:10000001_t3_consumption"
+
+
+async def test_statistics_import(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test the readings history is imported oldest first with running sums."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    rows = await _async_get_statistics(hass, T1_STATISTIC_ID)
+    assert [(row["state"], row["sum"]) for row in rows] == [
+        (3250.0, 110.0),
+        (3380.0, 240.0),
+        (3500.0, 360.0),
+    ]
+    assert rows[0]["start"] == dt_util.as_timestamp(
+        dt_util.start_of_local_day(dt_util.parse_date("2025-11-24"))
+    )
+
+    rows = await _async_get_statistics(hass, T2_STATISTIC_ID)
+    assert [row["sum"] for row in rows] == [50.0, 120.0, 180.0]
+
+
+async def test_statistics_import_incremental(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test only periods newer than the last imported one are added."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await _async_get_statistics(hass, T1_STATISTIC_ID)
+
+    mock_api.async_get_counter_readings.return_value = [
+        {
+            "readings": [
+                {"name": "День", "value": "3600", "date": "24.02.26"},
+                {"name": "Ночь", "value": "1555", "date": "24.02.26"},
+            ]
+        },
+        *MOCK_COUNTER_READINGS_HISTORY_RESPONSE,
+    ]
+    await mock_config_entry.runtime_data.async_refresh()
+
+    # Without a reported consumption the reading difference is used
+    rows = await _async_get_statistics(hass, T1_STATISTIC_ID)
+    assert [(row["state"], row["sum"]) for row in rows] == [
+        (3250.0, 110.0),
+        (3380.0, 240.0),
+        (3500.0, 360.0),
+        (3600.0, 460.0),
+    ]
+
+    rows = await _async_get_statistics(hass, T2_STATISTIC_ID)
+    assert [row["sum"] for row in rows] == [50.0, 120.0, 180.0, 235.0]
+
+
+async def test_statistics_import_resumes_after_restart(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a reload continues from the statistics stored in the recorder."""
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE[1:]
+    )
+    mock_config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await _async_get_statistics(hass, T1_STATISTIC_ID)
+
+    mock_api.async_get_counter_readings.return_value = (
+        MOCK_COUNTER_READINGS_HISTORY_RESPONSE
+    )
+    await hass.config_entries.async_reload(mock_config_entry.entry_id)
+
+    rows = await _async_get_statistics(hass, T1_STATISTIC_ID)
+    assert [row["sum"] for row in rows] == [110.0, 240.0, 360.0]
@@ -0,0 +1,153 @@
+"""Tests for TNS-Energo HTTP views."""
+from __future__ import annotations
+
+from datetime import date
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+
+from homeassistant.const import ATTR_DATE, ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.tns_energo.const import DOMAIN
+from custom_components.tns_energo.services import SERVICE_GET_BILL
+
+from .const import MOCK_INVOICE_FILE_RESPONSE
+
+BILL_PATH = "/api/tns_energo/bills/610000000001/2026-01"
+
+
+async def _async_setup(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, mock_api: AsyncMock
+) -> None:
+    """Set up the integration with an invoice file response."""
+    mock_api.async_get_invoice_file = AsyncMock(
+        return_value=MOCK_INVOICE_FILE_RESPONSE
+    )
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_bill_view_serves_cached_bill(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    hass_client_no_auth: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a bill returned by get_bill is served from the cache."""
+    await _async_setup(hass, mock_config_entry, mock_api)
+
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, "610000000001")}
+    )
+    assert device is not None
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_BILL,
+        {ATTR_DEVICE_ID: device.id, ATTR_DATE: date(2026, 1, 1)},
+        blocking=True,
+        return_response=True,
+    )
+
+    client = await hass_client()
+    resp = await client.get(BILL_PATH)
+    assert resp.status == HTTPStatus.OK
+    assert resp.headers["Content-Type"] == "application/pdf"
+    assert await resp.read() == b"test pdf data"
+
+    # The signed URL from the response works without a login
+    client = await hass_client_no_auth()
+    resp = await client.get(response["url"])
+    assert resp.status == HTTPStatus.OK
+
+    mock_api.async_get_invoice_file.assert_awaited_once()
+
+
+async def test_bill_view_fetches_on_demand(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test a bill missing from the cache is downloaded when requested."""
+    await _async_setup(hass, mock_config_entry, mock_api)
+
+    client = await hass_client()
+    resp = await client.get(BILL_PATH)
+
+    assert resp.status == HTTPStatus.OK
+    assert await resp.read() == b"test pdf data"
+    mock_api.async_get_invoice_file.assert_awaited_once_with(
+        "610000000001", "01.01.2026"
+    )
+
+
+async def test_bill_view_requires_auth(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test bills are not served to anonymous users."""
+    await _async_setup(hass, mock_config_entry, mock_api)
+
+    client = await hass_client_no_auth()
+    resp = await client.get(BILL_PATH)
+
+    assert resp.status == HTTPStatus.UNAUTHORIZED
+    mock_api.async_get_invoice_file.assert_not_awaited()
+
+
+async def test_bill_view_not_found(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test unknown accounts, invalid months and missing bills."""
+    await _async_setup(hass, mock_config_entry, mock_api)
+    client = await hass_client()
+
+    resp = await client.get("/api/tns_energo/bills/999/2026-01")
+    assert resp.status == HTTPStatus.NOT_FOUND
+
+    resp = await client.get("/api/tns_energo/bills/610000000001/january")
+    assert resp.status == HTTPStatus.NOT_FOUND
+
+    mock_api.async_get_invoice_file.return_value = {}
+    resp = await client.get(BILL_PATH)
+    assert resp.status == HTTPStatus.NOT_FOUND
+    mock_api.async_get_invoice_file.assert_awaited_once()
+
+
+async def test_bill_view_does_not_refetch(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_auth: AsyncMock,
+    mock_api: AsyncMock,
+) -> None:
+    """Test missing bills and open months are not requested from the API."""
+    await _async_setup(hass, mock_config_entry, mock_api)
+    mock_api.async_get_invoice_file.return_value = {}
+    client = await hass_client()
+
+    # A month without an invoice is remembered
+    for _ in range(2):
+        resp = await client.get(BILL_PATH)
+        assert resp.status == HTTPStatus.NOT_FOUND
+    mock_api.async_get_invoice_file.assert_awaited_once()
+
+    # Months after the last closed month have no final bill yet
+    for month in ("2026-03", "2099-12"):
+        resp = await client.get(f"/api/tns_energo/bills/610000000001/{month}")
+        assert resp.status == HTTPStatus.NOT_FOUND
+    mock_api.async_get_invoice_file.assert_awaited_once()